@@ -1,22 +1,475 @@
 import datetime as dt
 import re
 
+import numpy as np
 import pandas as pd
 
+import modules.helper as helper
 import modules.translator as trans
 
-ERR_MSG = "Something stinks. This should have been overwritten!"
 UNKNOWN_STRING = "UNKNOWN"
 UNKNOWN_FLOAT = -1.0
 HASH_VALUE_1 = "4309875807432890756789243502387469874968743290743632460987890643"
 HASH_VALUE_2 = "2987498579844444987237987888898234759237495087234095723498572345"
 
+# patterns are compiled once at import time and shared by all kernels
+REGEX_KICK_OFF = re.compile(r"^\d{2}:\d{2}$")  # hh:mm
+REGEX_PENALTIES = re.compile(r"^\d{0,2} \((\d{1,2})\)$")  # e.g. "0 (5)"
+REGEX_GOALS = re.compile(r"^\d{1,2}(?:\.\d)?$")
+REGEX_MATCHWEEK = re.compile(r"^Spielwoche [1-9]{1}\d{0,1}$")
+REGEX_SEASON = re.compile(r"^(\d{4})-(\d{4})$")  # yyyy-yyyy
+
+# date formats are dispatched by length and the separator at position 2
+DATE_FORMATS = {
+    (10, "."): (re.compile(r"^\d{2}\.\d{2}\.\d{4}$"), "%d.%m.%Y"),  # dd.mm.yyyy
+    (10, "/"): (re.compile(r"^\d{2}\/\d{2}\/\d{4}$"), "%d/%m/%Y"),  # dd/mm/yyyy
+    (8, "/"): (re.compile(r"^\d{2}\/\d{2}\/\d{2}$"), "%d/%m/%y"),  # dd/mm/yy
+}
+
+# columns of the report of validate_fbref_frame() and errors="collect"
+REPORT_COLUMNS = ["Row", "Column", "Value", "Reason"]
+
+# columns of stored games, which are compared with a raw scrape (see
+# select_new_fbref_rows())
+SETTLED_COLUMNS = [
+    "Primary Key",
+    "Result",
+    "Home Goals",
+    "Away Goals",
+    "Home xG",
+    "Away xG",
+]
+
+
+def _split_venue(venue):
+    """
+    Splits "Spielort" into a boolean mask, which is True for "Heim" and
+    "Neutral" and False for "Auswärts".
+
+    Parameters
+    ----------
+    venue : pandas.core.series.Series
+
+    Returns
+    -------
+    home : pandas.core.series.Series
+
+    Raises
+    ------
+    ValueError
+        when venue is not in ["Heim", "Neutral", "Auswärts"]
+    """
+    if _check_Venue(venue).any():
+        raise ValueError
+    return venue.isin(["Heim", "Neutral"])
+
+
+def _is_number(series):
+    """
+    Checks element-wise, if values of a given series are type int or float.
+
+    Parameters
+    ----------
+    series : pandas.core.series.Series
+
+    Returns
+    -------
+    result : pandas.core.series.Series
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.Series(True, index=series.index)
+    return series.map(lambda x: isinstance(x, (int, float, np.number)))
+
+
+def _check_Venue(venue):
+    """
+    Returns a boolean mask, which is True for invalid values of "Spielort".
+    """
+    return ~venue.isin(["Heim", "Neutral", "Auswärts"])
+
+
+def _check_Kick_Off(time):
+    """
+    Returns a boolean mask, which is True for invalid values of "Uhrzeit".
+    """
+    invalid = ~time.astype(str).str[:5].str.match(REGEX_KICK_OFF)
+    return time.notnull() & invalid
+
+
+def _check_Result(result):
+    """
+    Returns a boolean mask, which is True for invalid values of "Ergebnis".
+    """
+    return result.notnull() & ~result.isin(["S", "U", "N"])
+
+
+def _check_Number(value):
+    """
+    Returns a boolean mask, which is True for values, which are neither null
+    nor type int or float, e.g. of "Besitz", "xG" and "xGA".
+    """
+    return value.notnull() & ~_is_number(value)
+
+
+def _check_Goals(goals):
+    """
+    Returns a boolean mask, which is True for invalid values of "Tf" and "Tk".
+    """
+    goals = goals.astype(str)
+    goals = goals.str.extract(REGEX_PENALTIES, expand=False).fillna(goals)
+    return (goals != "nan") & ~goals.str.match(REGEX_GOALS)
+
+
+def _parse_Date(date):
+    """
+    Parses date block by block of DATE_FORMATS. Returns datetimes, which are
+    NaT for null and invalid values.
+    """
+    dates = date.astype(str)
+    length = dates.str.len().to_numpy()
+    separator = dates.str[2].to_numpy()
+    known = date.notnull().to_numpy()
+
+    # values are written by position, so any index (e.g. duplicated) works
+    result = np.full(len(date), np.datetime64("NaT"), dtype="datetime64[ns]")
+    for (date_length, date_separator), (regex, date_format) in DATE_FORMATS.items():
+        mask = known & (length == date_length) & (separator == date_separator)
+        if not mask.any():
+            continue
+        block = dates[mask]
+        mask[mask] = block.str.match(regex).to_numpy()
+        result[mask] = pd.to_datetime(
+            dates[mask], format=date_format, errors="coerce"
+        ).to_numpy()
+    return pd.Series(result, index=date.index)
+
+
+def _check_Date(date):
+    """
+    Returns a boolean mask, which is True for invalid values of "Datum".
+    """
+    return date.notnull() & _parse_Date(date).isnull()
+
+
+def _check_Date_Known(date):
+    """
+    Returns a boolean mask, which is True for invalid and null values of
+    "Datum". Unlike prepare_Date() a game needs a date for "Primary Key".
+    """
+    return date.isnull() | _check_Date(date)
+
+
+def _check_Matchweek(matchweek, competition):
+    """
+    Returns a boolean mask, which is True for invalid values of "Runde".
+    """
+    relevant = competition.isin(trans.competitions())
+    return relevant & ~matchweek.astype(str).str.match(REGEX_MATCHWEEK)
+
+
+def _check_Day(day):
+    """
+    Returns a boolean mask, which is True for invalid values of "Tag".
+    """
+    return day.notnull() & ~day.isin(trans.day_ger_str_to_eng_str().keys())
+
+
+def _check_Season(season):
+    """
+    Returns a boolean mask, which is True for invalid values of "Saison".
+    """
+    years = season.astype(str).str.extract(REGEX_SEASON)
+    consecutive = pd.to_numeric(years[0]) == pd.to_numeric(years[1]) - 1
+    return season.notnull() & ~consecutive
+
+
+_REASONS = {
+    _check_Venue: "not in ['Heim', 'Neutral', 'Auswärts']",
+    _check_Kick_Off: r"does not match ^\d{2}:\d{2}$",
+    _check_Result: "not in ['S', 'U', 'N']",
+    _check_Number: "not type int or float",
+    _check_Goals: r"does not match ^\d{1,2}(\.\d)?$ or ^\d{0,2} \(\d{1,2}\)$",
+    _check_Date: "can not be parsed from %d.%m.%Y, %d/%m/%Y or %d/%m/%y",
+    _check_Date_Known: "null or can not be parsed from %d.%m.%Y, %d/%m/%Y or %d/%m/%y",
+    _check_Matchweek: r"does not match ^Spielwoche [1-9]{1}\d{0,1}$",
+    _check_Day: "not in modules.translator.day_ger_str_to_eng_str()",
+    _check_Season: "can not be parsed from yyyy-yyyy",
+}
+
+
+def _report(value, invalid, reason):
+    """
+    Returns the invalid values of a series as report, see REPORT_COLUMNS.
+    """
+    return pd.DataFrame(
+        data={
+            "Row": value.index[invalid],
+            "Column": value.name,
+            "Value": value[invalid].values,
+            "Reason": reason,
+        },
+        columns=REPORT_COLUMNS,
+    )
+
+
+def _collect(df, checks):
+    """
+    Runs checks on df and reports every invalid value. A check is a tuple of
+    column, check function and further columns passed to the check function.
+    Returns a copy of df, in which invalid values (including the
+    further columns) are set to null, and the report. If "Spielort" is
+    invalid, the whole row is set to null and "Spielort" to "Heim".
+    """
+    masks = []
+    reports = []
+    for col, check, args in checks:
+        masks.append(check(df[col], *[df[x] for x in args]))
+        reports.append(_report(df[col], masks[-1], _REASONS[check]))
+
+    df = df.copy()
+    for (col, _, args), invalid in zip(checks, masks):
+        if col == "Spielort":
+            df.loc[invalid, :] = np.nan
+            df.loc[invalid, col] = "Heim"
+        else:
+            df.loc[invalid, [col] + args] = np.nan
+    return df, pd.concat(reports, ignore_index=True)
+
+
+def _check_errors(errors):
+    """
+    Raises ValueError, when errors is not in ["raise", "collect"].
+    """
+    if errors not in ["raise", "collect"]:
+        raise ValueError
+
+
+def _Kick_Off(time):
+    """
+    Kernel of prepare_Kick_Off().
+    """
+    if _check_Kick_Off(time).any():
+        raise ValueError
+
+    # e.g. "18:30 (19:30)" -> "18:30"
+    null = time.isnull()
+    result = pd.Series(UNKNOWN_STRING, index=time.index, dtype=object)
+    result[~null] = time[~null].astype(str).str[:5]
+    return result
+
+
+def mirror_venue(df, home, pairs):
+    """
+    Mirrors pairs of columns from the perspective of a team ("for" and
+    "against") to the perspective of the venue ("Home" and "Away"). Where
+    home is True, "for" becomes "Home" and "against" becomes "Away", else
+    vice versa. All pairs are mirrored in one operation, e.g.:
+
+    >>> df = pd.DataFrame(data={"Tf": [1, 2], "Tk": [0, 3]})
+    >>> home = pd.Series([True, False])
+    >>> coll.mirror_venue(df, home, {"Goals": ("Tf", "Tk")})
+       Home Goals  Away Goals
+    0           1           0
+    1           3           2
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+    home : pandas.core.series.Series
+        boolean mask, e. g. from "Spielort" in ["Heim", "Neutral"]
+    pairs : dict
+        feature to tuple of column "for" and column "against"
+
+    Returns
+    -------
+    result : pandas.core.frame.DataFrame
+        with columns "Home {feature}" and "Away {feature}" for each feature
+
+    Raises
+    ------
+    KeyError
+        when a column of pairs is not present
+    """
+    features = list(pairs.keys())
+    cols_for = [col_for for col_for, _ in pairs.values()]
+    cols_against = [col_against for _, col_against in pairs.values()]
+    if not set(cols_for + cols_against).issubset(df.columns):
+        raise KeyError
+
+    values_for = df[cols_for].set_axis(features, axis=1)
+    values_against = df[cols_against].set_axis(features, axis=1)
+
+    mask = np.broadcast_to(np.asarray(home, dtype=bool)[:, None], values_for.shape)
+    home_values = values_for.where(mask, values_against).add_prefix("Home ")
+    away_values = values_against.where(mask, values_for).add_prefix("Away ")
+
+    cols = [f"{side} {feature}" for feature in features for side in ["Home", "Away"]]
+    return pd.concat([home_values, away_values], axis=1)[cols]
+
+
+def _Result(result):
+    """
+    Kernel of prepare_Result(). Returns result for and against.
+    """
+    if _check_Result(result).any():
+        raise ValueError
+
+    null = result.isnull()
+    result_for = result.map({"S": "H", "U": "D", "N": "A"})
+    result_against = result.map({"S": "A", "U": "D", "N": "H"})
+    result_for[null] = UNKNOWN_STRING
+    result_against[null] = UNKNOWN_STRING
+    return result_for, result_against
+
+
+def _Teams(team, opponent):
+    """
+    Kernel of prepare_Teams(). Returns team for and against.
+    """
+    return team.fillna(UNKNOWN_STRING), opponent.fillna(UNKNOWN_STRING)
+
+
+def _Possesions(possesion):
+    """
+    Kernel of prepare_Possesions(). Returns possesion for and against.
+    """
+    if _check_Number(possesion).any():
+        raise ValueError
+
+    null = possesion.isnull()
+    possesion = possesion.astype(float)
+    # the opponent gets the remainder of the truncated possesion
+    remainder = 100 - np.trunc(possesion)
+    return possesion.where(~null, UNKNOWN_FLOAT), remainder.where(~null, UNKNOWN_FLOAT)
+
+
+def _xGs(xG, xGA):
+    """
+    Kernel of prepare_xGs(). Returns xG for and against.
+    """
+    values = []
+    for value in [xG, xGA]:
+        if _check_Number(value).any():
+            raise ValueError
+        values.append(value.astype(float).where(value.notnull(), UNKNOWN_FLOAT))
+    return tuple(values)
+
+
+def _Goals(tF, tK):
+    """
+    Kernel of prepare_Goals(). Returns goals for and against.
+    """
+    values = []
+    for value in [tF, tK]:
+        if _check_Goals(value).any():
+            raise ValueError
+
+        # fix penalties, e.g format "0 (5)"
+        goals = value.astype(str)
+        goals = goals.str.extract(REGEX_PENALTIES, expand=False).fillna(goals)
+
+        null = goals == "nan"
+        value = pd.Series(UNKNOWN_FLOAT, index=goals.index)
+        value[~null] = goals[~null].astype(float)
+        values.append(value)
+    return tuple(values)
+
+
+def _Date(date):
+    """
+    Kernel of prepare_Date(). Each block of dates sharing a format is parsed
+    by a single call of pd.to_datetime().
+    """
+    null = date.isnull()
+    parsed = _parse_Date(date)
+    if (~null & parsed.isnull()).any():
+        raise ValueError
+
+    if not null.any():
+        return parsed
+
+    result = pd.Series(UNKNOWN_STRING, index=date.index, dtype=object)
+    result[~null] = parsed[~null]
+    return result
+
+
+def _Matchweek(matchweek, competition):
+    """
+    Kernel of prepare_Matchweek().
+    """
+    prefix = "Spielwoche "
+
+    if _check_Matchweek(matchweek, competition).any():
+        raise ValueError
+
+    relevant = competition.isin(trans.competitions())
+    result = pd.Series(UNKNOWN_FLOAT, index=competition.index)
+    result[relevant] = matchweek[relevant].astype(str).str[len(prefix) :].astype(float)
+    return result
+
+
+def _Day(day):
+    """
+    Kernel of prepare_Day().
+    """
+    if _check_Day(day).any():
+        raise ValueError
+
+    result = day.map(trans.day_ger_str_to_eng_str())
+    result[day.isnull()] = UNKNOWN_STRING
+    return result
+
+
+def _Season(season):
+    """
+    Kernel of prepare_Season().
+    """
+    if _check_Season(season).any():
+        raise ValueError
+
+    return season.where(season.notnull(), UNKNOWN_STRING)
+
+
+def _Competition(competition):
+    """
+    Kernel of prepare_Competition().
+    """
+    relevant = competition.isin(trans.competitions())
+    return competition.where(relevant, UNKNOWN_STRING)
+
+
+def _Notes(notes):
+    """
+    Kernel of prepare_Notes().
+    """
+    notes = notes.astype(object)
+    return notes.where(notes.notnull(), UNKNOWN_STRING)
+
+
+def _translate_Teams(home, away):
+    """
+    Translates teams from www.fbref.com to official team names. Teams without
+    translation stay untouched.
+    """
+    translations = helper.invert_dictionary(trans.fbref_com_translations())
+    return tuple(x.map(translations).fillna(x) for x in [home, away])
+
+
+def _Primary_Key(date, home, away):
+    """
+    Kernel of introduce_Primary_Key().
+    """
+    if not pd.api.types.is_datetime64_any_dtype(date):
+        if not date.map(lambda x: isinstance(x, dt.datetime)).all():
+            raise ValueError
+        date = pd.to_datetime(date)
 
-class BrokenAlgorithmException(Exception):
-    pass
+    home = home.astype(object).where(home.notnull(), UNKNOWN_STRING).astype(str)
+    away = away.astype(object).where(away.notnull(), UNKNOWN_STRING).astype(str)
+    return date.dt.strftime("%Y-%m-%d") + home + away
 
 
-def prepare_Kick_Off(df):
+def prepare_Kick_Off(df, errors="raise"):
     r"""
     Sets feature "Kick Off" based on "Uhrzeit" of a given dataframe. New
     values of feature is string in format ^\d{2}:\d{2}$. If "Uhrzeit" is null,
@@ -25,15 +478,22 @@ def prepare_Kick_Off(df):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when "Uhrzeit" is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when "Uhrzeit" can not be repaired
     """
@@ -44,31 +504,20 @@ def prepare_Kick_Off(df):
     if not set([col_old]).issubset(df.columns):
         raise KeyError
 
-    df[col_new] = ERR_MSG
+    _check_errors(errors)
 
-    for index, row in df.iterrows():
-        time = row[col_old]
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(df[["Uhrzeit"]], [("Uhrzeit", _check_Kick_Off, [])])
 
-        if pd.isnull(time):
-            df.at[index, col_new] = UNKNOWN_STRING
-            continue
-
-        if re.compile("^\d{2}:\d{2}$").match(time):
-            df.at[index, col_new] = time
-            continue
-
-        new_time = time[:5]
-        if not re.compile("^\d{2}:\d{2}$").match(new_time):
-            raise ValueError
-        df.at[index, col_new] = time[:5]
+    result = _Kick_Off(raw[col_old])
 
     df.drop(columns=[col_old], inplace=True)
-    if (df[col_new] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df[col_new] = result
+    return df if report is None else (df, report)
 
 
-def prepare_Result(df):
+def prepare_Result(df, errors="raise"):
     r"""
     Sets feature "Result" based on "Ergebnis" and "Spielort" of a given
     dataframe. New values of feature is in ["H", "D", "A"]. If "Ergebnis" is
@@ -77,15 +526,22 @@ def prepare_Result(df):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when "Ergebnis" or "Spielort is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when "Ergebnis" is not in ["S", "U", "N"]
     ValueError
@@ -98,46 +554,29 @@ def prepare_Result(df):
     if not set(["Ergebnis", "Spielort"]).issubset(df.columns):
         raise KeyError
 
-    df[col_new] = ERR_MSG
-
-    for index, row in df.iterrows():
-        venue = row["Spielort"]
-        result = row[col_old]
-
-        if venue == "Heim" or venue == "Neutral":
-            if pd.isnull(result):
-                result = UNKNOWN_STRING
-            elif result == "S":
-                result = "H"
-            elif result == "U":
-                result = "D"
-            elif result == "N":
-                result = "A"
-            else:
-                raise ValueError
-        elif venue == "Auswärts":
-            if pd.isnull(result):
-                result = UNKNOWN_STRING
-            elif result == "S":
-                result = "A"
-            elif result == "U":
-                result = "D"
-            elif result == "N":
-                result = "H"
-            else:
-                ValueError
-        else:
-            raise ValueError
+    _check_errors(errors)
 
-        df.at[index, col_new] = result
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(
+            df[["Ergebnis", "Spielort"]],
+            [
+                ("Spielort", _check_Venue, []),
+                ("Ergebnis", _check_Result, []),
+            ],
+        )
+
+    home = _split_venue(raw["Spielort"])
+    result_for, result_against = _Result(raw[col_old])
+    values = pd.DataFrame(data={"for": result_for, "against": result_against})
+    result = mirror_venue(values, home, {col_new: ("for", "against")})
 
     df.drop(columns=[col_old], inplace=True)
-    if (df[col_new] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df[col_new] = result[f"Home {col_new}"]
+    return df if report is None else (df, report)
 
 
-def prepare_Teams(df):
+def prepare_Teams(df, errors="raise"):
     """
     Sets features "Home Team" and "Away Team" based on "Mannschaft", "Gegner"
     and "Spielort" of a given dataframe. New values of features are strings.
@@ -147,15 +586,22 @@ def prepare_Teams(df):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when "Mannschaft", "Gegner" or "Spielort" is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when "Spielort" is not in ["Heim", "Neutral", "Auswärts"]
     """
@@ -166,45 +612,26 @@ def prepare_Teams(df):
     if not set(["Mannschaft", "Gegner", "Spielort"]).issubset(df.columns):
         raise KeyError
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    home_team = ""
-    away_team = ""
-    for index, row in df.iterrows():
-        venue = row["Spielort"]
-
-        if venue == "Heim" or venue == "Neutral":
-            if pd.isnull(row["Mannschaft"]):
-                home_team = UNKNOWN_STRING
-            else:
-                home_team = row["Mannschaft"]
-            if pd.isnull(row["Gegner"]):
-                away_team = UNKNOWN_STRING
-            else:
-                away_team = row["Gegner"]
-        elif venue == "Auswärts":
-            if pd.isnull(row["Gegner"]):
-                home_team = UNKNOWN_STRING
-            else:
-                home_team = row["Gegner"]
-            if pd.isnull(row["Mannschaft"]):
-                away_team = UNKNOWN_STRING
-            else:
-                away_team = row["Mannschaft"]
-        else:
-            raise ValueError
+    _check_errors(errors)
 
-        df.at[index, col_home] = home_team
-        df.at[index, col_away] = away_team
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(
+            df[["Mannschaft", "Gegner", "Spielort"]], [("Spielort", _check_Venue, [])]
+        )
+
+    home = _split_venue(raw["Spielort"])
+    value_for, value_against = _Teams(raw["Mannschaft"], raw["Gegner"])
+    values = pd.DataFrame(data={"for": value_for, "against": value_against})
+    result = mirror_venue(values, home, {"Team": ("for", "against")})
 
     df.drop(columns=["Mannschaft", "Gegner"], inplace=True)
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df[col_home] = result[col_home]
+    df[col_away] = result[col_away]
+    return df if report is None else (df, report)
 
 
-def prepare_Possesions(df):
+def prepare_Possesions(df, errors="raise"):
     """
     Sets features "Home Possesion" and "Away Possesion" based on "Besitz" and
     "Spielort" of a given dataframe. New values of features are floats. If
@@ -213,15 +640,22 @@ def prepare_Possesions(df):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when "Besitz" or "Spielort" is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when "Besitz" is not type int or float
     ValueError
@@ -234,47 +668,30 @@ def prepare_Possesions(df):
     if not set(["Besitz", "Spielort"]).issubset(df.columns):
         raise KeyError
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    home_possesion = ""
-    away_possesion = ""
-    for index, row in df.iterrows():
-        venue = row["Spielort"]
-
-        possesion = row["Besitz"]
-
-        if venue == "Heim" or venue == "Neutral":
-            if pd.isnull(possesion):
-                home_possesion = UNKNOWN_FLOAT
-                away_possesion = UNKNOWN_FLOAT
-            elif not isinstance(possesion, (int, float)):
-                raise ValueError
-            else:
-                home_possesion = possesion
-                away_possesion = 100 - int(possesion)
-        elif venue == "Auswärts":
-            if pd.isnull(possesion):
-                home_possesion = UNKNOWN_FLOAT
-                away_possesion = UNKNOWN_FLOAT
-            elif not isinstance(possesion, (int, float)):
-                raise ValueError
-            else:
-                home_possesion = 100 - int(possesion)
-                away_possesion = possesion
-        else:
-            raise ValueError
+    _check_errors(errors)
 
-        df.at[index, col_home] = home_possesion
-        df.at[index, col_away] = away_possesion
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(
+            df[["Besitz", "Spielort"]],
+            [
+                ("Spielort", _check_Venue, []),
+                ("Besitz", _check_Number, []),
+            ],
+        )
+
+    home = _split_venue(raw["Spielort"])
+    value_for, value_against = _Possesions(raw["Besitz"])
+    values = pd.DataFrame(data={"for": value_for, "against": value_against})
+    result = mirror_venue(values, home, {"Possesion": ("for", "against")})
 
     df.drop(columns=["Besitz"], inplace=True)
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df[col_home] = result[col_home]
+    df[col_away] = result[col_away]
+    return df if report is None else (df, report)
 
 
-def prepare_xGs(df):
+def prepare_xGs(df, errors="raise"):
     """
     Sets features "Home xG" and "Away xG" based on "xG" and "xGA" and
     "Spielort" of a given dataframe. New values of features are floats. If
@@ -284,15 +701,22 @@ def prepare_xGs(df):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when "xG", "xGA" or "Spielort" is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when "xG" or "xGA" are not type int or float
     ValueError
@@ -305,56 +729,31 @@ def prepare_xGs(df):
     if not set(["xG", "xGA", "Spielort"]).issubset(df.columns):
         raise KeyError
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    home_xG = ""
-    away_xG = ""
-    for index, row in df.iterrows():
-        venue = row["Spielort"]
-
-        xG = row["xG"]
-        xGA = row["xGA"]
-
-        if venue == "Heim" or venue == "Neutral":
-            if pd.isnull(xG):
-                home_xG = UNKNOWN_FLOAT
-            elif not isinstance(xG, (int, float)):
-                raise ValueError
-            else:
-                home_xG = xG
-            if pd.isnull(xGA):
-                away_xG = UNKNOWN_FLOAT
-            elif not isinstance(xGA, (int, float)):
-                raise ValueError
-            else:
-                away_xG = xGA
-        elif venue == "Auswärts":
-            if pd.isnull(xGA):
-                home_xG = UNKNOWN_FLOAT
-            elif not isinstance(xGA, (int, float)):
-                raise ValueError
-            else:
-                home_xG = xGA
-            if pd.isnull(xG):
-                away_xG = UNKNOWN_FLOAT
-            elif not isinstance(xG, (int, float)):
-                raise ValueError
-            else:
-                away_xG = xG
-        else:
-            raise ValueError
+    _check_errors(errors)
 
-        df.at[index, col_home] = home_xG
-        df.at[index, col_away] = away_xG
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(
+            df[["xG", "xGA", "Spielort"]],
+            [
+                ("Spielort", _check_Venue, []),
+                ("xG", _check_Number, []),
+                ("xGA", _check_Number, []),
+            ],
+        )
+
+    home = _split_venue(raw["Spielort"])
+    value_for, value_against = _xGs(raw["xG"], raw["xGA"])
+    values = pd.DataFrame(data={"for": value_for, "against": value_against})
+    result = mirror_venue(values, home, {"xG": ("for", "against")})
 
     df.drop(columns=["xG", "xGA"], inplace=True)
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df[col_home] = result[col_home]
+    df[col_away] = result[col_away]
+    return df if report is None else (df, report)
 
 
-def prepare_Goals(df):
+def prepare_Goals(df, errors="raise"):
     """
     Sets features "Home Goals" and "Away Goals" based on "Tf" and "Tk" and
     "Spielort" of a given dataframe. New values of features are floats. If
@@ -364,15 +763,22 @@ def prepare_Goals(df):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when "Tf", Tk or "Spielort" is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when "xG" or "xGA" are not type int or float
     ValueError
@@ -385,64 +791,31 @@ def prepare_Goals(df):
     if not set(["Tf", "Tk", "Spielort"]).issubset(df.columns):
         raise KeyError
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
+    _check_errors(errors)
 
-    home_goals = ""
-    away_goals = ""
-    for index, row in df.iterrows():
-        regex_penalties = "^(\d{0,2} \(\d{1,2}\))$"
-        regex_numeric = "^\d{1,2}(\.\d)?$"
-        venue = row["Spielort"]
-
-        # fix penalties, e.g format "0 (5)"
-        tF = str(row["Tf"])
-        if re.compile(regex_penalties).match(tF):
-            tF = tF[tF.find("(") + 1 : tF.find(")")]
-        tK = str(row["Tk"])
-        if re.compile(regex_penalties).match(tK):
-            tK = tK[tK.find("(") + 1 : tK.find(")")]
-
-        if venue == "Heim" or venue == "Neutral":
-            if tF == "nan":
-                home_goals = UNKNOWN_FLOAT
-            elif not re.compile(regex_numeric).match(tF):
-                raise ValueError
-            else:
-                home_goals = float(tF)
-            if tK == "nan":
-                away_goals = UNKNOWN_FLOAT
-            elif not re.compile(regex_numeric).match(tK):
-                raise ValueError
-            else:
-                away_goals = float(tK)
-
-        elif venue == "Auswärts":
-            if tF == "nan":
-                away_goals = UNKNOWN_FLOAT
-            elif not re.compile(regex_numeric).match(tF):
-                raise ValueError
-            else:
-                away_goals = float(tF)
-            if tK == "nan":
-                home_goals = UNKNOWN_FLOAT
-            elif not re.compile(regex_numeric).match(tK):
-                raise ValueError
-            else:
-                home_goals = float(tK)
-        else:
-            raise ValueError
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(
+            df[["Tf", "Tk", "Spielort"]],
+            [
+                ("Spielort", _check_Venue, []),
+                ("Tf", _check_Goals, []),
+                ("Tk", _check_Goals, []),
+            ],
+        )
 
-        df.at[index, col_home] = home_goals
-        df.at[index, col_away] = away_goals
+    home = _split_venue(raw["Spielort"])
+    value_for, value_against = _Goals(raw["Tf"], raw["Tk"])
+    values = pd.DataFrame(data={"for": value_for, "against": value_against})
+    result = mirror_venue(values, home, {"Goals": ("for", "against")})
 
     df.drop(columns=["Tf", "Tk"], inplace=True)
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df[col_home] = result[col_home]
+    df[col_away] = result[col_away]
+    return df if report is None else (df, report)
 
 
-def prepare_Date(df, col_date):
+def prepare_Date(df, col_date, errors="raise"):
     """
     Sets feature "Date" based on col_date (formatted as dd.mm.yyyy, dd/mm/yyyy
     or dd/mm/yy) of a given dataframe. New values of feature are type
@@ -453,55 +826,44 @@ def prepare_Date(df, col_date):
     ----------
     df : pandas.core.frame.DataFrame
     col_date : string
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when col_date is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when col_date can not be parsed from %d.%m.%Y, "%d/%m/%Y" or
         "%d/%m/%y"
     """
 
-    helper = HASH_VALUE_1
-
     if not set([col_date]).issubset(df.columns):
         raise KeyError
 
-    df[helper] = ERR_MSG
+    _check_errors(errors)
 
-    d_m_Y_dotted = "^\d{2}\.\d{2}\.\d{4}$"  # dd.mm.yyyy
-    d_m_Y_slashed = "^\d{2}\/\d{2}\/\d{4}$"  # dd/mm/yyyy
-    d_m_y_slashed = "^\d{2}\/\d{2}\/\d{2}$"  # dd/mm/yy
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(df[[col_date]], [(col_date, _check_Date, [])])
 
-    for index, row in df.iterrows():
-        date = row[col_date]
-
-        if pd.isnull(date):
-            date = UNKNOWN_STRING
-        elif re.compile(d_m_Y_dotted).search(date):
-            date = dt.datetime.strptime(date, "%d.%m.%Y")
-        elif re.compile(d_m_Y_slashed).search(date):
-            date = dt.datetime.strptime(date, "%d/%m/%Y")
-        elif re.compile(d_m_y_slashed).search(date):
-            date = dt.datetime.strptime(date, "%d/%m/%y")
-        else:
-            raise ValueError
-
-        df.at[index, helper] = date
+    result = _Date(raw[col_date])
 
     df.drop(columns=[col_date], inplace=True)
-    df.rename(columns={helper: "Date"}, inplace=True)
-    if (df["Date"] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df["Date"] = result
+    return df if report is None else (df, report)
 
 
-def prepare_Matchweek(df, col_round, col_competition):
+def prepare_Matchweek(df, col_round, col_competition, errors="raise"):
     r"""
     Sets feature "Matchweek" based on col_round and col_competition of a given
     dataframe. It cuts prefix "Spielwoche " from col_round, if col_competition
@@ -512,16 +874,23 @@ def prepare_Matchweek(df, col_round, col_competition):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when col_round or col_competition is not present
 
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when col_competition is in modules.translator.competitions() and
         col_round does not match regex ^Spielwoche [1-9]{1}\d{0,1}$
@@ -530,31 +899,23 @@ def prepare_Matchweek(df, col_round, col_competition):
     if not set([col_round, col_competition]).issubset(df.columns):
         raise KeyError
 
-    df[HASH_VALUE_1] = ERR_MSG
-
-    prefix = "Spielwoche "
-    regex = r"^Spielwoche [1-9]{1}\d{0,1}$"
+    _check_errors(errors)
 
-    for index, row in df.iterrows():
-        matchweek = row[col_round]
-        competition = row[col_competition]
-
-        if competition not in trans.competitions():
-            df.at[index, HASH_VALUE_1] = UNKNOWN_FLOAT
-            continue
-        if not re.compile(regex).search(str(matchweek)):
-            raise ValueError
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(
+            df[[col_round, col_competition]],
+            [(col_round, _check_Matchweek, [col_competition])],
+        )
 
-        df.at[index, HASH_VALUE_1] = float(matchweek[len(prefix) :])
+    result = _Matchweek(raw[col_round], raw[col_competition])
 
     df.drop(columns=[col_round], inplace=True)
-    df.rename(columns={HASH_VALUE_1: "Matchweek"}, inplace=True)
-    if (df["Matchweek"] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df["Matchweek"] = result
+    return df if report is None else (df, report)
 
 
-def prepare_Day(df, col_day):
+def prepare_Day(df, col_day, errors="raise"):
     r"""
     Sets feature "Day" based on col_day of a given dataframe. New values of
     feature are strings in ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]. If
@@ -564,16 +925,23 @@ def prepare_Day(df, col_day):
     Parameters
     ----------
     df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when col_day is not present
 
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when col_day is not in modules.translator.competitions()
     """
@@ -581,30 +949,20 @@ def prepare_Day(df, col_day):
     if not set([col_day]).issubset(df.columns):
         raise KeyError
 
-    df[HASH_VALUE_1] = ERR_MSG
-
-    for index, row in df.iterrows():
-        day = row[col_day]
-
-        if pd.isnull(day):
-            df.at[index, HASH_VALUE_1] = UNKNOWN_STRING
-            continue
+    _check_errors(errors)
 
-        result = trans.day_ger_str_to_eng_str().get(day)
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(df[[col_day]], [(col_day, _check_Day, [])])
 
-        if result is None:
-            raise ValueError
-        else:
-            df.at[index, HASH_VALUE_1] = result
+    result = _Day(raw[col_day])
 
     df.drop(columns=[col_day], inplace=True)
-    df.rename(columns={HASH_VALUE_1: "Day"}, inplace=True)
-    if (df["Day"] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df["Day"] = result
+    return df if report is None else (df, report)
 
 
-def prepare_Season(df, col_season):
+def prepare_Season(df, col_season, errors="raise"):
     """
     Sets feature "Season" based on col_season (formatted as yyyy-yyyy) of a
     given dataframe. New values of feature are strings. If col_season is null,
@@ -614,48 +972,40 @@ def prepare_Season(df, col_season):
     ----------
     df : pandas.core.frame.DataFrame
     col_season : string
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" treats invalid
+        values like null values and additionally returns a report of them
 
     Returns
     -------
     df : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
 
     Raises
     ------
     KeyError
         when col_season is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
     ValueError
         when col_season can not be parsed from yyyy-yyyyy
     """
 
-    helper = HASH_VALUE_1
-
     if not set([col_season]).issubset(df.columns):
         raise KeyError
 
-    df[helper] = ERR_MSG
-
-    regex = "^\d{4}-\d{4}$"  # yyyy-yyyy
-
-    for index, row in df.iterrows():
-        season = row[col_season]
+    _check_errors(errors)
 
-        if pd.isnull(season):
-            season = UNKNOWN_STRING
-        elif re.compile(regex).search(season):
-            start = season[:4]
-            end = season[5:]
-            if not int(start) == int(end) - 1:
-                raise ValueError
-        else:
-            raise ValueError
+    raw, report = df, None
+    if errors == "collect":
+        raw, report = _collect(df[[col_season]], [(col_season, _check_Season, [])])
 
-        df.at[index, helper] = season
+    result = _Season(raw[col_season])
 
     df.drop(columns=[col_season], inplace=True)
-    df.rename(columns={helper: "Season"}, inplace=True)
-    if (df["Season"] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    df["Season"] = result
+    return df if report is None else (df, report)
 
 
 def prepare_Competition(df, col_competition):
@@ -680,27 +1030,13 @@ def prepare_Competition(df, col_competition):
         when col_competition is not present
     """
 
-    helper = HASH_VALUE_1
-
     if not set([col_competition]).issubset(df.columns):
         raise KeyError
 
-    df[helper] = ERR_MSG
-
-    for index, row in df.iterrows():
-        competition = row[col_competition]
-
-        if pd.isnull(competition):
-            competition = UNKNOWN_STRING
-        elif not competition in trans.competitions():
-            competition = UNKNOWN_STRING
-
-        df.at[index, helper] = competition
+    result = _Competition(df[col_competition])
 
     df.drop(columns=[col_competition], inplace=True)
-    df.rename(columns={helper: "Competition"}, inplace=True)
-    if (df["Competition"] == ERR_MSG).any():
-        raise BrokenAlgorithmException
+    df["Competition"] = result
     return df
 
 
@@ -725,25 +1061,13 @@ def prepare_Notes(df, col_notes):
         when col_notes is not present
     """
 
-    helper = HASH_VALUE_1
-
     if not set([col_notes]).issubset(df.columns):
         raise KeyError
 
-    df[helper] = ERR_MSG
-
-    for index, row in df.iterrows():
-        competition = row[col_notes]
-
-        if pd.isnull(competition):
-            competition = UNKNOWN_STRING
-
-        df.at[index, helper] = competition
+    result = _Notes(df[col_notes])
 
     df.drop(columns=[col_notes], inplace=True)
-    df.rename(columns={helper: "Notes"}, inplace=True)
-    if (df["Notes"] == ERR_MSG).any():
-        raise BrokenAlgorithmException
+    df["Notes"] = result
     return df
 
 
@@ -773,31 +1097,315 @@ def introduce_Primary_Key(df, col_date, col_home, col_away):
         when col_date is not type datetime
     """
 
-    helper = HASH_VALUE_1
-
     if not set([col_date, col_home, col_away]).issubset(df.columns):
         raise KeyError
 
-    df[helper] = ERR_MSG
+    df["Primary Key"] = _Primary_Key(df[col_date], df[col_home], df[col_away])
+    return df
 
-    for index, row in df.iterrows():
-        date = row[col_date]
 
-        if not isinstance(date, dt.datetime):
-            raise ValueError
-        else:
-            date = date.strftime("%Y-%m-%d")
+def fbref_primary_keys(df):
+    """
+    Computes "Primary Key" of each row of a raw match log from www.fbref.com
+    based on "Spielort", "Mannschaft", "Gegner" and "Datum" only, like
+    normalize_fbref_frame() does. This is cheap compared to a full
+    normalization and allows to compare a raw scrape with stored games.
 
-        home = row[col_home]
-        if pd.isnull(home):
-            home = UNKNOWN_STRING
-        away = row[col_away]
-        if pd.isnull(away):
-            away = UNKNOWN_STRING
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
 
-        df.at[index, helper] = f"{date}{home}{away}"
+    Returns
+    -------
+    result : pandas.core.series.Series
 
-    df.rename(columns={helper: "Primary Key"}, inplace=True)
-    if (df["Primary Key"] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    Raises
+    ------
+    KeyError
+        when "Spielort", "Mannschaft", "Gegner" or "Datum" is not present
+    ValueError
+        when "Spielort" or "Datum" contains an invalid value
+    """
+    if not set(["Spielort", "Mannschaft", "Gegner", "Datum"]).issubset(df.columns):
+        raise KeyError
+
+    home = _split_venue(df["Spielort"])
+    value_for, value_against = _Teams(df["Mannschaft"], df["Gegner"])
+    values = pd.DataFrame(data={"for": value_for, "against": value_against})
+    teams = mirror_venue(values, home, {"Team": ("for", "against")})
+    home_team, away_team = _translate_Teams(teams["Home Team"], teams["Away Team"])
+
+    return _Primary_Key(_Date(df["Datum"]), home_team, away_team)
+
+
+def select_new_fbref_rows(df, settled):
+    """
+    Selects the rows of a raw match log from www.fbref.com, which still have
+    to be normalized: rows of games, whose "Primary Key" is not in settled
+    (e.g. stored games with known result), and rows of settled games, whose
+    "Result", goals or xG changed since. Values are compared like
+    normalize_fbref_frame() translates them, rows with invalid values are
+    selected, so they are reported by the normalization.
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+    settled : pandas.core.frame.DataFrame
+        with columns SETTLED_COLUMNS
+
+    Returns
+    -------
+    result : pandas.core.frame.DataFrame
+
+    Raises
+    ------
+    KeyError
+        when "Spielort", "Mannschaft", "Gegner", "Datum", "Ergebnis", "Tf",
+        "Tk", "xG" or "xGA" is not present or one of SETTLED_COLUMNS is not
+        present in settled
+    ValueError
+        when "Spielort" or "Datum" contains an invalid value
+    """
+    if not set(["Ergebnis", "Tf", "Tk", "xG", "xGA"]).issubset(df.columns):
+        raise KeyError
+    if not set(SETTLED_COLUMNS).issubset(settled.columns):
+        raise KeyError
+
+    keys = fbref_primary_keys(df)
+    stored = settled.drop_duplicates(subset=["Primary Key"], keep="last")
+    stored = stored.set_index("Primary Key")[SETTLED_COLUMNS[1:]]
+
+    # by position, rows may share labels of the index
+    selected = ~keys.isin(stored.index).to_numpy()
+    invalid = (
+        _check_Result(df["Ergebnis"])
+        | _check_Goals(df["Tf"])
+        | _check_Goals(df["Tk"])
+        | _check_Number(df["xG"])
+        | _check_Number(df["xGA"])
+    ).to_numpy()
+    compared = ~selected & ~invalid
+    selected |= invalid
+
+    rows = df.loc[compared]
+    values = {}
+    values["Goals For"], values["Goals Against"] = _Goals(rows["Tf"], rows["Tk"])
+    values["xG For"], values["xG Against"] = _xGs(rows["xG"], rows["xGA"])
+    values["Result For"], values["Result Against"] = _Result(rows["Ergebnis"])
+    values = {col: value.to_numpy() for col, value in values.items()}
+    pairs = {x: (f"{x} For", f"{x} Against") for x in ["Goals", "xG", "Result"]}
+    mirrored = mirror_venue(
+        pd.DataFrame(data=values), _split_venue(rows["Spielort"]), pairs
+    )
+    mirrored["Result"] = mirrored["Home Result"]
+
+    expected = stored.loc[keys.loc[compared]]
+    changed = np.zeros(len(expected), dtype=bool)
+    for col in SETTLED_COLUMNS[1:]:
+        dtype = object if col == "Result" else float
+        changed |= mirrored[col].to_numpy() != expected[col].to_numpy(dtype=dtype)
+    selected[compared] = changed
+
+    return df.loc[selected]
+
+
+def validate_fbref_frame(df):
+    """
+    Validates a raw match log from www.fbref.com without raising. Every row of
+    "Spielort", "Uhrzeit", "Ergebnis", "Besitz", "xG", "xGA", "Tf", "Tk",
+    "Datum", "Runde" (in relation to "Wett"), "Tag" and "Saison" is checked
+    like in the corresponding prepare_* function. All invalid values are
+    returned in one report with columns REPORT_COLUMNS: "Row" (index of df),
+    "Column", "Value" and "Reason". An empty report means, that
+    normalize_fbref_frame() will not raise ValueError.
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+
+    Returns
+    -------
+    report : pandas.core.frame.DataFrame
+
+    Raises
+    ------
+    KeyError
+        when one of the checked columns is not present
+    """
+    _, report = _validate_fbref_frame(df)
+    return report
+
+
+def _validate_fbref_frame(df):
+    # returns a positional mask of rows with invalid values and the report of
+    # validate_fbref_frame()
+    checks = [
+        ("Spielort", _check_Venue, []),
+        ("Uhrzeit", _check_Kick_Off, []),
+        ("Ergebnis", _check_Result, []),
+        ("Besitz", _check_Number, []),
+        ("xG", _check_Number, []),
+        ("xGA", _check_Number, []),
+        ("Tf", _check_Goals, []),
+        ("Tk", _check_Goals, []),
+        ("Datum", _check_Date_Known, []),
+        ("Runde", _check_Matchweek, ["Wett"]),
+        ("Tag", _check_Day, []),
+        ("Saison", _check_Season, []),
+    ]
+    cols = [col for col, _, args in checks] + ["Wett"]
+    if not set(cols).issubset(df.columns):
+        raise KeyError
+
+    invalid = np.zeros(len(df), dtype=bool)
+    reports = []
+    for col, check, args in checks:
+        mask = check(df[col], *[df[x] for x in args])
+        invalid |= mask.to_numpy()
+        reports.append(_report(df[col], mask, _REASONS[check]))
+    return invalid, pd.concat(reports, ignore_index=True)
+
+
+def normalize_fbref_frame(df, errors="raise"):
+    """
+    Normalizes a raw match log from www.fbref.com in one pass. Each raw
+    column ("Spielort", "Ergebnis", "Mannschaft", "Gegner", "Uhrzeit",
+    "Besitz", "xG", "xGA", "Tf", "Tk", "Datum", "Runde", "Wett", "Tag",
+    "Saison", "Hinweise") is read once and translated by the same kernels as
+    the corresponding prepare_* function. Team names are translated by
+    modules.translator.fbref_com_translations() and "Primary Key" is
+    introduced. Duplicates (each game is scraped from both teams) are
+    dropped, rows are sorted by "Date". The result is a new dataframe with
+    columns of modules.translator.fbref_com_features() and the schema of
+    modules.helper.apply_schema(), the given dataframe stays untouched.
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        "raise" raises ValueError on invalid values, "collect" skips rows
+        with invalid values and additionally returns a report of them
+
+    Returns
+    -------
+    result : pandas.core.frame.DataFrame
+    report : pandas.core.frame.DataFrame
+        only if errors is "collect", see validate_fbref_frame()
+
+    Raises
+    ------
+    KeyError
+        when one of the raw columns is not present
+    ValueError
+        when errors is not in ["raise", "collect"]
+    ValueError
+        when one of the raw columns contains an invalid value (see
+        prepare_* functions)
+    """
+    cols = [
+        "Spielort",
+        "Ergebnis",
+        "Mannschaft",
+        "Gegner",
+        "Uhrzeit",
+        "Besitz",
+        "xG",
+        "xGA",
+        "Tf",
+        "Tk",
+        "Datum",
+        "Runde",
+        "Wett",
+        "Tag",
+        "Saison",
+        "Hinweise",
+    ]
+    if not set(cols).issubset(df.columns):
+        raise KeyError
+
+    _check_errors(errors)
+
+    report = None
+    if errors == "collect":
+        invalid, report = _validate_fbref_frame(df)
+        # by position, rows may share labels of the index
+        df = df.loc[~invalid]
+
+    home = _split_venue(df["Spielort"])
+
+    values = {}
+    values["Team For"], values["Team Against"] = _Teams(df["Mannschaft"], df["Gegner"])
+    values["xG For"], values["xG Against"] = _xGs(df["xG"], df["xGA"])
+    values["Possesion For"], values["Possesion Against"] = _Possesions(df["Besitz"])
+    values["Goals For"], values["Goals Against"] = _Goals(df["Tf"], df["Tk"])
+    values["Result For"], values["Result Against"] = _Result(df["Ergebnis"])
+    pairs = {
+        x: (f"{x} For", f"{x} Against")
+        for x in ["Team", "xG", "Possesion", "Goals", "Result"]
+    }
+    mirrored = mirror_venue(pd.DataFrame(data=values), home, pairs)
+
+    columns = {}
+    for col in ["Team", "xG", "Possesion", "Goals"]:
+        columns[f"Home {col}"] = mirrored[f"Home {col}"]
+        columns[f"Away {col}"] = mirrored[f"Away {col}"]
+    columns["Result"] = mirrored["Home Result"]
+    columns["Day"] = _Day(df["Tag"])
+    columns["Kick Off"] = _Kick_Off(df["Uhrzeit"])
+    columns["Matchweek"] = _Matchweek(df["Runde"], df["Wett"])
+    columns["Competition"] = _Competition(df["Wett"])
+    columns["Date"] = _Date(df["Datum"])
+    columns["Season"] = _Season(df["Saison"])
+    columns["Notes"] = _Notes(df["Hinweise"])
+
+    columns["Home Team"], columns["Away Team"] = _translate_Teams(
+        columns["Home Team"], columns["Away Team"]
+    )
+
+    columns["Primary Key"] = _Primary_Key(
+        columns["Date"], columns["Home Team"], columns["Away Team"]
+    )
+
+    result = pd.DataFrame(data=columns, index=df.index)
+    result = result[trans.fbref_com_features().keys()]
+
+    result.drop_duplicates(subset=["Primary Key"], inplace=True)
+    result.sort_values(by=["Date"], inplace=True)
+    result.reset_index(inplace=True, drop=True)
+    helper.apply_schema(result)
+    return result if report is None else (result, report)
+
+
+def normalize_fbref_chunks(chunks, errors="raise"):
+    """
+    Normalizes raw match logs from www.fbref.com chunk by chunk, e.g. one
+    chunk per team and season or the chunks of pd.read_csv(..., chunksize=n).
+    Each chunk is normalized independently by normalize_fbref_frame() and
+    yielded, so peak memory is bounded by the chunk size instead of the whole
+    history. Empty chunks are skipped. Duplicates across chunks are not
+    dropped, see modules.secretary.save_base_update_chunks().
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.core.frame.DataFrame
+    errors : string, default "raise"
+        see normalize_fbref_frame()
+
+    Yields
+    ------
+    result : pandas.core.frame.DataFrame
+        or tuple of result and report, if errors is "collect"
+
+    Raises
+    ------
+    KeyError
+        when one of the raw columns is not present in a chunk
+    ValueError
+        when a chunk contains an invalid value and errors is "raise"
+    """
+    _check_errors(errors)
+
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        yield normalize_fbref_frame(chunk, errors=errors)
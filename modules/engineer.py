@@ -1,35 +1,145 @@
-import datetime as dt
+import concurrent.futures
+import hashlib
+import tempfile
 
 import numpy as np
 import pandas as pd
 
 import modules.helper as helper
 import modules.features as feat
+import modules.profiler as prof
+import modules.storekeeper as store
 
-ERR_MSG = "Something stinks. This should have been overwritten!"
+DAY_IN_NS = 1 * 24 * 60 * 60 * 1e9
+# part of the keys of stored features (see modules.storekeeper) and of the
+# saved FeatureState (see modules.secretary), has to be increased whenever the
+# computation of features changes
+VERSION = 2
 
 
-class BrokenAlgorithmException(Exception):
-    pass
-
-
-def report_execution_time(func):
+class TeamGameView:
     """
-    Decorator that reports the execution time.
-    """
-
-    def wrap(*args, **kwargs):
-        start = dt.datetime.now()
-        result = func(*args, **kwargs)
-        end = dt.datetime.now()
+    Long format of games with one row per game and team, built once and
+    shared by the engineer functions instead of filtering the frame per team.
+    Row 2 * i holds the home team, row 2 * i + 1 the away team of the i-th
+    (positional) game of the frame, so rows keep the order of games.
 
-        print(f"{func.__name__: <60} -> {end - start}")
-        return result
+    Attributes
+    ----------
+    games : pandas.core.frame.DataFrame
+        "Game" (position of the game in the frame), "Venue" ("Home" or
+        "Away"), "Team", "Opponent" and "Season" (if present)
+    fingerprint : string
+        see TeamGameView.get_fingerprint()
+
+    Use TeamGameView.of() to get a cached view, which is only rebuilt when
+    the underlying frame changed.
+    """
 
-    return wrap
+    KEYS = ["Home Team", "Away Team", "Season"]
+
+    _last = None
+
+    def __init__(self, df):
+        if not set(["Home Team", "Away Team"]).issubset(df.columns):
+            raise KeyError
+
+        self.fingerprint = TeamGameView.get_fingerprint(df, TeamGameView.KEYS)
+        self._values = {}
+        self._groups = None
+
+        n = len(df)
+        data = {
+            "Game": np.repeat(np.arange(n), 2),
+            "Venue": np.tile(["Home", "Away"], n),
+            "Team": self.interleave(df["Home Team"], df["Away Team"]),
+            "Opponent": self.interleave(df["Away Team"], df["Home Team"]),
+        }
+        if "Season" in df.columns:
+            data["Season"] = np.repeat(df["Season"].to_numpy(), 2)
+        self.games = pd.DataFrame(data=data)
+
+    @classmethod
+    def of(cls, df):
+        """
+        Returns the view of the last call, if the fingerprint of df did not
+        change, otherwise builds (and caches) a new view.
+        """
+        view = cls._last
+        if view is None or view.fingerprint != cls.get_fingerprint(df, cls.KEYS):
+            view = cls(df)
+            cls._last = view
+        return view
+
+    @staticmethod
+    def get_fingerprint(df, cols):
+        """
+        Returns a hash of the index and the given columns (those present) of
+        df. Any change of values, order, length or dtypes changes the
+        fingerprint.
+        """
+        cols = [col for col in cols if col in df.columns]
+        hashes = pd.util.hash_pandas_object(df[cols], index=True).to_numpy()
+        dtypes = repr([df[col].dtype for col in cols]).encode()
+        return hashlib.blake2b(hashes.tobytes() + dtypes, digest_size=16).hexdigest()
+
+    @staticmethod
+    def interleave(home, away):
+        """
+        Interleaves values of home and away like rows of games.
+        """
+        return np.column_stack([home.to_numpy(), away.to_numpy()]).ravel()
+
+    def values(self, df, features):
+        """
+        Returns "{feature}" (of the team) and "{feature} Against" (of the
+        opponent) of "Home {feature}" and "Away {feature}" of df aligned to
+        games for all given features. Values are cached per feature as long
+        as both columns do not change.
+
+        Returns
+        -------
+        result : pandas.core.frame.DataFrame
+        """
+        data = {}
+        for feature in features:
+            cols = [f"Home {feature}", f"Away {feature}"]
+            fingerprint = TeamGameView.get_fingerprint(df, cols)
+            # a local entry, the cache may be shared by threads (see modules.scheduler)
+            entry = self._values.get(feature)
+            if entry is None or entry[0] != fingerprint:
+                home = self.interleave(df[cols[0]], df[cols[1]])
+                away = self.interleave(df[cols[1]], df[cols[0]])
+                entry = (fingerprint, home, away)
+                self._values[feature] = entry
+            _, data[feature], data[f"{feature} Against"] = entry
+        return pd.DataFrame(data=data, index=self.games.index)
+
+    def groups(self):
+        """
+        Returns the (cached) group number of each row per team and season.
+        Rows of each group are in the order of games.
+
+        Returns
+        -------
+        result : pandas.core.series.Series
+        """
+        if self._groups is None:
+            by = ["Team", "Season"] if "Season" in self.games.columns else ["Team"]
+            grouped = self.games.groupby(by=by, sort=False, dropna=False, observed=True)
+            self._groups = grouped.ngroup()
+        return self._groups
+
+
+def _introduce_Match_Key(df):
+    # sorts and deduplicates use the integer "Match Key" (see
+    # modules.helper.get_match_key()) instead of the string "Primary Key", the
+    # column is dropped again before df is returned
+    df["Match Key"] = helper.get_match_key(df)
+    return df
 
 
-@report_execution_time
+@prof.profile
 def add_Days_Since_Last_Game(df):
     """
     Adds features "Home Days Since Last Game" and "Away Days Since Last Game"
@@ -55,7 +165,6 @@ def add_Days_Since_Last_Game(df):
 
     """
     FEATURE = "Date"
-    DAY_IN_NS = 1 * 24 * 60 * 60 * 1e9
 
     cols = [
         "Primary Key",
@@ -68,65 +177,91 @@ def add_Days_Since_Last_Game(df):
 
     # raises ValueError
     df[FEATURE] = pd.to_datetime(df[FEATURE])
-    # parse to ns since epoch
-    df[FEATURE] = df[FEATURE].astype(np.int64)
 
     col_home = "Home Days Since Last Game"
     col_away = "Away Days Since Last Game"
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
+    _introduce_Match_Key(df)
+    df.sort_values(by=["Match Key"], inplace=True)
     df.reset_index(inplace=True, drop=True)
+    df.drop(columns=["Match Key"], inplace=True)
 
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        games = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-
-        values = games[FEATURE].to_frame()
-        values.reset_index(inplace=True)
-        values.rename(columns={"index": "Game"}, inplace=True)
-        values["Team"] = team
-
-        # RESTRUCTURE GAMES
-        games = (
-            games.rename_axis(index="Game", columns="Venue").stack().rename("Team").reset_index()
-        )
+    # one sort by team and date (ns since epoch) over all rows of the view,
+    # games of the same date keep the order of "Match Key"
+    view = TeamGameView.of(df)
+    teams = view.games.groupby(by="Team", sort=False, observed=True).ngroup().to_numpy()
+    dates = np.repeat(df[FEATURE].to_numpy().view(np.int64), 2)
+    order = np.lexsort((dates, teams))
 
-        # CALCULATE FEATURE
-        values[FEATURE] = (values[FEATURE] - values[FEATURE].shift(1)).fillna(-DAY_IN_NS)
+    # grouped diff, the first game of each team has no last game
+    diff = np.diff(dates[order], prepend=0).astype(float)
+    diff[np.r_[True, teams[order][1:] != teams[order][:-1]]] = -DAY_IN_NS
 
-        # BUILD RESULT
-        result = (
-            games.merge(values, on=["Game", "Team"], how="left")
-            .set_index(["Game", "Venue"])
-            .unstack()
-        )
-
-        left = result["Team"].reset_index()
-        right = (
-            result[FEATURE][["Away Team", "Home Team"]]
-            .rename(columns={"Home Team": col_home, "Away Team": col_away})
-            .reset_index(drop=True)
-        )
-        result = pd.concat([left, right], axis=1)
+    values = np.empty(len(order))
+    values[order] = diff / DAY_IN_NS
 
-        # UPDATE DF
-        df.update(
-            result.set_index("Primary Key").reindex(df.set_index("Primary Key").index).reset_index()
-        )
+    df[col_home] = values[0::2]
+    df[col_away] = values[1::2]
+    return df
 
-    # parse ns to date/days
-    df[FEATURE] = pd.to_datetime(df[FEATURE])
-    df[col_home] = df[col_home] / 1e9 / 60 / 60 / 24
-    df[col_away] = df[col_away] / 1e9 / 60 / 60 / 24
 
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+def _coach_segments(df_coach):
+    """
+    Splits the stints of df_coach per team into disjoint segments [Start, End)
+    of time, each one with the first coach in df_coach covering it. Stints are
+    closed intervals [Started, Ended], stints with missing "Team", "Started"
+    or "Ended" never match.
 
+    Parameters
+    ----------
+    df_coach : pandas.core.frame.DataFrame
+        with "Team", "Coach", "Started" and "Ended"
 
-@report_execution_time
+    Returns
+    -------
+    segments : pandas.core.frame.DataFrame
+        with "Team", "Start", "End" and "Coach" sorted by "Start"
+    """
+    stints = df_coach[["Team", "Coach", "Started", "Ended"]].reset_index(drop=True)
+    stints["Team"] = stints["Team"].astype(object)
+    stints = stints.dropna(subset=["Team", "Started", "Ended"])
+    stints = stints.loc[stints["Started"] <= stints["Ended"]]
+    stints["Order"] = stints.index
+    stints["Ended"] = stints["Ended"] + pd.Timedelta(1, unit="ns")
+
+    bounds = pd.concat(
+        [
+            stints[["Team", "Started"]].set_axis(["Team", "Start"], axis=1),
+            stints[["Team", "Ended"]].set_axis(["Team", "Start"], axis=1),
+        ]
+    )
+    bounds = bounds.drop_duplicates().sort_values(
+        by=["Team", "Start"], ignore_index=True
+    )
+    bounds["End"] = bounds.groupby(by="Team", sort=False)["Start"].shift(-1)
+
+    # each stint covers a contiguous run of segments, painting them in reverse
+    # order leaves the first covering coach on each segment
+    positions = pd.Series(
+        bounds.index, index=pd.MultiIndex.from_frame(bounds[["Team", "Start"]])
+    )
+    first = positions.reindex(
+        pd.MultiIndex.from_frame(stints[["Team", "Started"]])
+    ).to_numpy()
+    last = positions.reindex(
+        pd.MultiIndex.from_frame(stints[["Team", "Ended"]])
+    ).to_numpy()
+
+    winner = np.full(len(bounds), -1)
+    for i, j, order in zip(first[::-1], last[::-1], stints["Order"].to_numpy()[::-1]):
+        winner[i:j] = order
+
+    segments = bounds.loc[winner >= 0].copy()
+    segments["Coach"] = stints["Coach"].reindex(winner[winner >= 0]).to_numpy()
+    return segments.sort_values(by="Start", ignore_index=True)
+
+
+@prof.profile
 def add_Coach(df, df_coach):
     """
     Adds features "Home Coach" and "Away Coach" based on "Home Team", "Away
@@ -174,42 +309,36 @@ def add_Coach(df, df_coach):
     col_home = "Home Coach"
     col_away = "Away Coach"
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    def do(df, df_coach, side):
-        df.drop(columns=[f"{side} Coach"], errors="ignore", inplace=True)
-        tmp = df.copy(deep=True)
-
-        df = pd.merge(df, df_coach, how="left", left_on=f"{side} Team", right_on="Team")
-        df = df.loc[
-            (df["Started"] <= df["Date"])
-            & (df["Date"] <= df["Ended"])
-            & (df[f"{side} Team"] == df["Team"])
-        ]
-        rename_cols = {"Coach": f"{side} Coach"}
-        df.rename(columns=rename_cols, inplace=True)
-        df.drop(columns=["Team", "Started", "Ended"], inplace=True)
-
-        df = pd.merge(tmp, df[["Primary Key", f"{side} Coach"]], on="Primary Key", how="left")
-        df[f"{side} Coach"].fillna("UNKNOWN", inplace=True)
+    df = df.drop(columns=[col_home, col_away], errors="ignore")
+    _introduce_Match_Key(df)
+    df.drop_duplicates(subset=["Match Key"], keep="first", inplace=True)
+    df.sort_values(by=["Match Key"], inplace=True)
+    df.reset_index(inplace=True, drop=True)
+    df.drop(columns=["Match Key"], inplace=True)
 
-        return df
+    segments = _coach_segments(df_coach)
 
-    df = do(df, df_coach, "Home")
-    df = do(df, df_coach, "Away")
+    for col, side in [(col_home, "Home"), (col_away, "Away")]:
+        games = pd.DataFrame(
+            data={"Team": df[f"{side} Team"].astype(object), "Date": df["Date"]}
+        )
+        games = games.dropna().sort_values(by="Date", kind="stable")
 
-    df.drop_duplicates(subset=["Primary Key"], keep="first", inplace=True)
+        games = pd.merge_asof(
+            games.reset_index(), segments, left_on="Date", right_on="Start", by="Team"
+        )
+        games = games.loc[games["Date"] < games["End"]]
 
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
+        values = np.full(len(df), "UNKNOWN", dtype=object)
+        values[games["index"].to_numpy()] = games["Coach"].fillna("UNKNOWN").to_numpy()
+        df[col] = values
 
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
+    coaches = sorted(df_coach["Coach"].dropna().unique()) + ["UNKNOWN"]
+    helper.set_categories(df, [col_home, col_away], coaches)
     return df
 
 
-@report_execution_time
+@prof.profile
 def add_Coach_Substituted_Within_Last_OFFSET_Games(df, offset):
     """
     Adds features "Home Coach Substituted Within Last OFFSET Games" and "Away
@@ -250,59 +379,24 @@ def add_Coach_Substituted_Within_Last_OFFSET_Games(df, offset):
     col_home = f"Home Coach Substituted Within Last {offset} Games"
     col_away = f"Away Coach Substituted Within Last {offset} Games"
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
+    _introduce_Match_Key(df)
+    df.sort_values(by=["Match Key"], inplace=True)
     df.reset_index(inplace=True, drop=True)
+    df.drop(columns=["Match Key"], inplace=True)
 
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, FEATURE, team, False)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
-
-            # CALCULATE FEATURE
-            values[FEATURE] = values[FEATURE] != values[FEATURE].shift(offset)
-            values.at[: offset - 1, FEATURE] = False
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
-
-            left = result["Team"].reset_index()
-            right = (
-                result[FEATURE][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            df.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
+    # one grouped shift over all teams and seasons, the first offset games of
+    # each team and season are not substituted
+    view = TeamGameView.of(df)
+    coaches = view.values(df, [FEATURE])[FEATURE]
+    grouped = coaches.groupby(view.groups())
+    substituted = (coaches != grouped.shift(offset)) & (grouped.cumcount() >= offset)
 
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
+    df[col_home] = substituted.to_numpy()[0::2]
+    df[col_away] = substituted.to_numpy()[1::2]
     return df
 
 
-@report_execution_time
+@prof.profile
 def add_Points(df):
     """
     Adds features "Home Points" and "Away Points" based on "Result" of a given
@@ -327,41 +421,23 @@ def add_Points(df):
     col_home = "Home Points"
     col_away = "Away Points"
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    for index, row in df.iterrows():
-        result = row["Result"]
+    points = {"H": (3, 0), "D": (1, 1), "A": (0, 3), "": (-1, -1)}
 
-        # checks string against NaN. wtf!
-        if result != result:
-            result = ""
-
-        if result not in ["H", "D", "A", ""]:
-            raise ValueError
+    # NaN is treated as ""
+    result = df["Result"].astype(object).fillna("")
+    if not result.isin(points.keys()).all():
+        raise ValueError
 
-        if result == "H":
-            df.at[index, col_home] = 3
-            df.at[index, col_away] = 0
-        elif result == "D":
-            df.at[index, col_home] = 1
-            df.at[index, col_away] = 1
-        elif result == "A":
-            df.at[index, col_home] = 0
-            df.at[index, col_away] = 3
-        elif result == "":
-            df.at[index, col_home] = -1
-            df.at[index, col_away] = -1
-
-    df[col_home] = df[col_home].astype(int)
-    df[col_away] = df[col_away].astype(int)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
+    df[col_home] = result.map({key: value[0] for key, value in points.items()}).astype(
+        int
+    )
+    df[col_away] = result.map({key: value[1] for key, value in points.items()}).astype(
+        int
+    )
     return df
 
 
-@report_execution_time
+@prof.profile
 def add_Promoted_Last_Year(df, df_promotions):
     """
     Adds features "Home Promoted Last Year" and "Away Promoted Last Year"
@@ -409,35 +485,26 @@ def add_Promoted_Last_Year(df, df_promotions):
     col_home = "Home Promoted Last Year"
     col_away = "Away Promoted Last Year"
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    for index, row in df.iterrows():
-        observed_season = row["Season"]
-        helper = df_promotions.loc[(df_promotions["Is Promoted"] == observed_season)]
-
-        observed_team = row["Home Team"]
-        if helper.empty:
-            df.at[index, col_home] = "UNKNOWN"
-        elif observed_team in list(helper["Team"]):
-            df.at[index, col_home] = True
-        else:
-            df.at[index, col_home] = False
-
-        observed_team = row["Away Team"]
-        if helper.empty:
-            df.at[index, col_away] = "UNKNOWN"
-        elif observed_team in list(helper["Team"]):
-            df.at[index, col_away] = True
-        else:
-            df.at[index, col_away] = False
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
+    # "Is Promoted" is the first season after the promotion, so it is matched
+    # against the season of the game, not the previous one
+    seasons = df["Season"].astype(object)
+    promotions = pd.MultiIndex.from_arrays(
+        [
+            df_promotions["Is Promoted"].astype(object),
+            df_promotions["Team"].astype(object),
+        ]
+    )
+    known = seasons.isin(promotions.get_level_values(0)).to_numpy()
+
+    for col, team in [(col_home, "Home Team"), (col_away, "Away Team")]:
+        games = pd.MultiIndex.from_arrays([seasons, df[team].astype(object)])
+        values = pd.Series(games.isin(promotions), index=df.index, dtype=object)
+        values[~known] = "UNKNOWN"
+        df[col] = values
     return df
 
 
-@report_execution_time
+@prof.profile
 def add_Kick_Off_Before_17_00(df):
     """
     Adds feature "Kick Off Before 17:00" based on "Kick Off" of a given
@@ -468,23 +535,80 @@ def add_Kick_Off_Before_17_00(df):
         raise ValueError
 
     col = "Kick Off Before 17:00"
-
-    df[col] = ERR_MSG
     border = 17
 
-    for index, row in df.iterrows():
-        kick_off = row["Kick Off"]
-        if int(kick_off[:2]) < border:
-            df.at[index, col] = True
-        else:
-            df.at[index, col] = False
-
-    if (df[col] == ERR_MSG).any():
-        raise BrokenAlgorithmException
+    df[col] = df["Kick Off"].astype(object).str[:2].astype(int) < border
     return df
 
 
-@report_execution_time
+def _standings(games):
+    """
+    Computes the league table of one competition and season after each
+    matchweek from cumulative points, goals and goals against per team. Teams
+    are ranked by "Points", goal difference and "Goals" (descending), ties are
+    broken by the name of the team. Teams without a game are not ranked.
+
+    Parameters
+    ----------
+    games : pandas.core.frame.DataFrame
+        rows of TeamGameView.games (or sums of them per team and matchweek)
+        with "Matchweek", "Points", "Goals", "Goals Against" and "Games"
+
+    Returns
+    -------
+    rounds : numpy.ndarray
+        matchweeks in ascending order
+    teams : pandas.core.indexes.base.Index
+    positions : numpy.ndarray
+        position of each team (columns) after each matchweek (rows), 0 if
+        the team has not played yet
+    """
+    grouped = games.groupby(by=["Matchweek", "Team"], observed=True)
+    table = grouped[["Points", "Goals", "Goals Against", "Games"]].sum()
+    table = table.unstack("Team", fill_value=0).cumsum()
+
+    rounds = table.index.to_numpy()
+    teams = table["Points"].columns
+    points = table["Points"].to_numpy()
+    goals = table["Goals"].to_numpy()
+    diff = goals - table["Goals Against"].to_numpy()
+    played = table["Games"].to_numpy() > 0
+
+    order = np.arange(len(teams))
+    positions = np.zeros(points.shape, dtype=int)
+    for i in range(len(rounds)):
+        ranking = np.lexsort((order, -goals[i], -diff[i], -points[i]))
+        ranking = ranking[played[i, ranking]]
+        positions[i, ranking] = np.arange(1, len(ranking) + 1)
+
+    return rounds, teams, positions
+
+
+def _lookup_positions(standings, matchweeks, teams):
+    # position of each team before the given matchweeks (snapshot of the last
+    # matchweek before) or "UNKNOWN", see _standings()
+    rounds, ranked, positions = standings
+    snapshot = np.searchsorted(rounds, matchweeks, side="left") - 1
+    team = ranked.get_indexer(teams)
+    valid = (snapshot >= 0) & (team >= 0)
+
+    position = np.zeros(len(matchweeks), dtype=int)
+    position[valid] = positions[snapshot[valid], team[valid]]
+    valid &= position > 0
+
+    values = np.full(len(matchweeks), "UNKNOWN", dtype=object)
+    values[valid] = position[valid]
+    return values
+
+
+def _fill_Points_Goals(df):
+    # raises ValueError
+    for col in ["Home Points", "Away Points", "Home Goals", "Away Goals"]:
+        df[col].fillna(-1, inplace=True)
+        df[col] = df[col].astype(int)
+
+
+@prof.profile
 def add_Current_Position_Before_Matchday(df, offset):
     """
     Adds features "Home Current Position Before Matchday" and "Away Current
@@ -492,7 +616,10 @@ def add_Current_Position_Before_Matchday(df, offset):
     Points", "Away Points", "Home Goals", "Away Goals", "Season" and
     "Competition" of a given dataframe. Values of new features are integers or
     -1, if Matchweek is less or equal than offset or "UNKNOWN", if feature
-    could not have been calculated.
+    could not have been calculated (e.g. the team has no game in an earlier
+    matchweek). The table of each competition and season is computed once per
+    matchweek (see _standings()), ties are broken by "Points", goal
+    difference, "Goals" and the name of the team.
 
     Parameters
     ----------
@@ -526,78 +653,480 @@ def add_Current_Position_Before_Matchday(df, offset):
         raise KeyError
 
     # raises ValueError
-    df["Home Points"].fillna(-1, inplace=True)
-    df["Home Points"] = df["Home Points"].astype(int)
-    df["Away Points"].fillna(-1, inplace=True)
-    df["Away Points"] = df["Away Points"].astype(int)
-    df["Home Goals"].fillna(-1, inplace=True)
-    df["Home Goals"] = df["Home Goals"].astype(int)
-    df["Away Goals"].fillna(-1, inplace=True)
-    df["Away Goals"] = df["Away Goals"].astype(int)
+    _fill_Points_Goals(df)
 
     home = "Home Current Position Before Matchday"
     away = "Away Current Position Before Matchday"
 
-    cols = [home, away]
+    view = TeamGameView.of(df)
+    matchweeks = np.repeat(df["Matchweek"].to_numpy(dtype=float), 2)
+    games = view.games.assign(
+        Competition=np.repeat(df["Competition"].to_numpy(), 2),
+        Matchweek=matchweeks,
+        Games=1,
+        **view.values(df, ["Points", "Goals"]),
+    )
+
+    values = np.full(len(games), "UNKNOWN", dtype=object)
+    for _, part in games.groupby(
+        by=["Competition", "Season"], sort=False, observed=True
+    ):
+        # snapshot of the last matchweek before the matchweek of each game
+        values[part.index] = _lookup_positions(
+            _standings(part), part["Matchweek"].to_numpy(), part["Team"]
+        )
 
-    df[cols] = ERR_MSG
+    values[matchweeks <= offset] = -1
 
-    for index, row in df.iterrows():
-        matchweek = row["Matchweek"]
-        if matchweek <= offset:
-            for col in cols:
-                df.at[index, col] = -1
-            continue
+    df[home] = values[0::2]
+    df[away] = values[1::2]
+    return df
 
-        home_team = row["Home Team"]
-        away_team = row["Away Team"]
-        season = row["Season"]
-        league = row["Competition"]
 
-        matches_played = df.loc[
-            (df["Season"] == season) & (df["Matchweek"] < matchweek) & (df["Competition"] == league)
-        ]
+AGGREGATORS = ["MA", "EWMA", "MAX", "MIN"]
+
+
+MA_KEYS = ["nobs", "total"]
+
+
+def _ma_state(shape):
+    # state of a rolling mean without any value
+    return {key: np.zeros(shape) for key in MA_KEYS}
+
+
+def _ma_step(state, value, removed):
+    # rolling mean advanced by one position: removes (NaN if none) and adds
+    # one value to a plain running sum of the non NaN values, returns the
+    # mean. It is not bit for bit the same as Rolling.mean(), which uses
+    # private compensated sums, but the same for _ma() and FeatureState.
+    for sign, x in [(-1, removed), (1, value)]:
+        observed = x == x
+        state["total"] = state["total"] + sign * np.where(observed, x, 0.0)
+        state["nobs"] = state["nobs"] + sign * observed
+
+    nobs = state["nobs"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = state["total"] / nobs
+    return np.where(nobs > 0, mean, np.nan)
+
+
+def _ma(x, steps, offset):
+    # _ma_step() over the positions within groups for all groups at once, so
+    # rounding is the same as of FeatureState
+    states = {key: np.zeros(x.shape) for key in MA_KEYS}
+    result = np.full(x.shape, np.nan)
+
+    for p, rows in enumerate(steps):
+        if p == 0:
+            state = _ma_state(x[rows].shape)
+        else:
+            state = {key: states[key][rows - 1] for key in MA_KEYS}
+
+        removed = x[rows - offset] if p >= offset else np.full(x[rows].shape, np.nan)
+        result[rows] = _ma_step(state, x[rows], removed)
+
+        for key in MA_KEYS:
+            states[key][rows] = state[key]
+    return result
+
+
+def _ewma_step(state, current, factor):
+    # pandas' exponentially weighted mean (adjust=True, ignore_na=False)
+    # advanced by one value, returns the mean
+    previous, old = state["weighted"], state["weight"]
+    has_previous = previous == previous
+    observed = current == current
+
+    old = np.where(has_previous, old * factor, old)
+    update = has_previous & observed & (previous != current)
+    result = np.where(update, (old * previous + current) / (old + 1.0), previous)
+    state["weighted"] = np.where(~has_previous & observed, current, result)
+    state["weight"] = np.where(has_previous & observed, old + 1.0, old)
+    return state["weighted"]
+
+
+def _ewma(x, steps, offset):
+    # _ewma_step() over the positions within groups for all groups at once
+    factor = 1.0 - 2.0 / (offset + 1.0)
+    weighted = x.copy()
+    weight = np.ones(x.shape)
+
+    for rows in steps[1:]:
+        state = {"weighted": weighted[rows - 1], "weight": weight[rows - 1]}
+        weighted[rows] = _ewma_step(state, x[rows], factor)
+        weight[rows] = state["weight"]
+    return weighted
+
+
+def _sweep(values, groups, windows):
+    """
+    Aggregates the last offset values (excluding the current one) of each
+    group for all requested aggregators and offsets in one sweep over values
+    sorted once by group. "MA" (a running sum of the window) and "EWMA" (the
+    recurrence of pandas' exponentially weighted mean) are stepped over the
+    positions within groups, "MAX" and "MIN" reduce sliding windows of
+    shifted values.
+    NaN values are skipped, windows without values result in NaN. The number
+    of steps is the length of the longest group (e.g. games of a team per
+    season), not the number of groups or rows.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        2d array of floats, rows in order of games
+    groups : numpy.ndarray
+        group number of each row
+    windows : dictionary
+        (aggregator, offset) -> list of the columns of values to aggregate
+
+    Returns
+    -------
+    results : dictionary
+        (aggregator, offset) -> 2d array of floats aligned to values with the
+        requested columns
+    """
+    order = np.argsort(groups, kind="stable")
+    codes = groups[order]
+    n = len(order)
+
+    index = np.arange(n)
+    start = np.ones(n, dtype=bool)
+    start[1:] = codes[1:] != codes[:-1]
+    position = index - np.maximum.accumulate(np.where(start, index, 0))
+    steps = [
+        np.flatnonzero(position == p) for p in range(position.max() + 1 if n else 0)
+    ]
+
+    # exclude the current game by shifting within groups
+    x = np.empty(values.shape)
+    x[1:] = values[order][:-1]
+    x[start] = np.nan
+
+    results = {}
+    for (aggregator, offset), columns in windows.items():
+        x_window = x[:, columns]
+        if aggregator == "MA":
+            result = _ma(x_window, steps, offset)
+        elif aggregator == "EWMA":
+            result = _ewma(x_window, steps, offset)
+        elif aggregator in ["MAX", "MIN"]:
+            reduce = np.fmax if aggregator == "MAX" else np.fmin
+            result = x_window.copy()
+            for k in range(1, offset):
+                rows = np.flatnonzero(position >= k)
+                result[rows] = reduce(result[rows], x_window[rows - k])
+        else:
+            raise ValueError
+
+        unsorted = np.empty(result.shape)
+        unsorted[order] = result
+        results[(aggregator, offset)] = unsorted
+    return results
+
+
+def _sweep_task(directory, windows, start):
+    # runs _sweep() in a worker of _sweep_parallel() on the memory-mapped
+    # values and groups and writes into the memory-mapped results from start
+    values = np.load(f"{directory}/values.npy", mmap_mode="r")
+    groups = np.load(f"{directory}/groups.npy", mmap_mode="r")
+    results = np.load(f"{directory}/results.npy", mmap_mode="r+")
+    for result in _sweep(values, groups, windows).values():
+        results[:, start : start + result.shape[1]] = result
+        start += result.shape[1]
+    results.flush()
+
+
+def _sweep_parallel(values, groups, windows, workers):
+    """
+    Like _sweep(), but the columns of each window are spread across a pool
+    of processes. values, groups and the results are memory-mapped from a
+    temporary directory instead of being pickled to each worker.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+    groups : numpy.ndarray
+    windows : dictionary
+    workers : integer
+
+    Returns
+    -------
+    results : dictionary
+        see _sweep()
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        np.save(f"{directory}/values.npy", values)
+        np.save(f"{directory}/groups.npy", groups)
+        results = np.lib.format.open_memmap(
+            f"{directory}/results.npy",
+            mode="w+",
+            shape=(len(values), sum(len(columns) for columns in windows.values())),
+        )
+
+        # each window gets a block of columns, each task a part of a block
+        tasks, blocks, start = [], {}, 0
+        for window, columns in windows.items():
+            blocks[window] = start
+            for part in np.array_split(np.array(columns), min(workers, len(columns))):
+                tasks.append(({window: list(part)}, start))
+                start += len(part)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_sweep_task, directory, *task) for task in tasks]
+            for future in futures:
+                future.result()
+
+        return {
+            window: np.array(results[:, blocks[window] : blocks[window] + len(columns)])
+            for window, columns in windows.items()
+        }
+
+
+def _plan_windows(plan):
+    # features (stats) of the plan, values to aggregate ((stat, against) of
+    # the team) and columns of values per (aggregator, offset)
+    features = list(dict.fromkeys(stat for _, _, stat, _, _ in plan))
+    values = list(dict.fromkeys((stat, against) for _, _, stat, against, _ in plan))
+    windows = {}
+    for _, aggregator, stat, against, offset in plan:
+        columns = windows.setdefault((aggregator, offset), [])
+        if values.index((stat, against)) not in columns:
+            columns.append(values.index((stat, against)))
+    return features, values, windows
+
+
+def _prepare_Planned_FEATs(df, plan):
+    # validates df and sorts it like _add_Planned_FEATs() does
+    features, _, _ = _plan_windows(plan)
+
+    cols = ["Season", "Home Team", "Away Team", "Primary Key"]
+    cols += [f"{venue} {feature}" for feature in features for venue in ["Home", "Away"]]
+    if not set(cols).issubset(df.columns):
+        raise KeyError
+    if not set(aggregator for _, aggregator, _, _, _ in plan).issubset(AGGREGATORS):
+        raise ValueError
+
+    # raises ValueError
+    for feature in features:
+        df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
+        df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
 
-        if matches_played.empty:
-            for col in cols:
-                df.at[index, col] = "UNKNOWN"
-            continue
-
-        # position in home table
-        home_cols = ["Home Team", "Home Points", "Home Goals", "Away Goals"]
-        home_table = matches_played[home_cols].groupby(by="Home Team").sum()
-        home_table.rename(columns={"Away Goals": "Home Goals Against"}, inplace=True)
-
-        # position in away table
-        away_cols = ["Away Team", "Away Points", "Away Goals", "Home Goals"]
-        away_table = matches_played[away_cols].groupby(by="Away Team").sum()
-        away_table.rename(columns={"Home Goals": "Away Goals Against"}, inplace=True)
-
-        # table
-        table = home_table.append(away_table)
-
-        table.fillna(0, inplace=True)
-        table["Points"] = table["Home Points"] + table["Away Points"]
-        table.drop(columns=["Home Points", "Away Points"], inplace=True)
-        table["Goals"] = table["Home Goals"] + table["Away Goals"]
-        table.drop(columns=["Home Goals", "Away Goals"], inplace=True)
-        table["Goals Against"] = table["Home Goals Against"] + table["Away Goals Against"]
-        table.drop(columns=["Home Goals Against", "Away Goals Against"], inplace=True)
-
-        table["diff"] = table["Goals"] - table["Goals Against"]
-        table = table.groupby(table.index).sum()
-        table = table.sort_values(by=["Points", "diff", "Goals"], ascending=False)
-
-        df.at[index, home] = table.index.get_loc(home_team) + 1
-        df.at[index, away] = table.index.get_loc(away_team) + 1
-
-    for col in cols:
-        if (df[col] == ERR_MSG).any():
-            raise BrokenAlgorithmException
+    _introduce_Match_Key(df)
+    df.sort_values(by=["Match Key"], inplace=True)
+    df.reset_index(inplace=True, drop=True)
+    df.drop(columns=["Match Key"], inplace=True)
     return df
 
 
-@report_execution_time
+def _compute_Planned_FEATs(df, plan, workers=1):
+    # new features of a prepared df, columns in order of plan
+    features, values, windows = _plan_windows(plan)
+
+    # only the values and windows of the plan are aggregated
+    view = TeamGameView.of(df)
+    cols = [f"{stat} Against" if against else stat for stat, against in values]
+    # each team's games per season in chronological order
+    args = [
+        view.values(df, features)[cols].to_numpy(dtype=float),
+        view.groups().to_numpy(),
+    ]
+    if workers > 1:
+        results = _sweep_parallel(*args, windows, workers)
+    else:
+        results = _sweep(*args, windows)
+
+    new_feat = {}
+    for (aggregator, offset), result in results.items():
+        result = np.nan_to_num(result.round(2), nan=-1.0)
+        for i, value in enumerate(windows[(aggregator, offset)]):
+            stat, against = values[value]
+            for venue, rows in [("Home", result[0::2, i]), ("Away", result[1::2, i])]:
+                new_feat[
+                    feat.rolling_feature(venue, aggregator, stat, against, offset)
+                ] = rows
+
+    return pd.DataFrame(data=new_feat, index=df.index)[
+        [feat.rolling_feature(*spec) for spec in plan]
+    ]
+
+
+def _attach_Planned_FEATs(df, new_feat):
+    existing = [col for col in new_feat.columns if col in df.columns]
+    df[existing] = new_feat[existing]
+    return pd.concat([df, new_feat.drop(columns=existing)], axis=1)
+
+
+def _add_Planned_FEATs(df, plan, workers=1):
+    # plan as of modules.features.rolling_plan(), columns are added in order
+    df = _prepare_Planned_FEATs(df, plan)
+    return _attach_Planned_FEATs(df, _compute_Planned_FEATs(df, plan, workers))
+
+
+def _add_Stored_FEATs(df, plan, workers=1):
+    # like _add_Planned_FEATs(), but each family (aggregator, feature and offset,
+    # e.g. "MA xG 3") of each season is loaded from modules.storekeeper, if its
+    # input columns did not change
+    df = _prepare_Planned_FEATs(df, plan)
+
+    families = {}
+    for spec in plan:
+        _, aggregator, feature, _, offset = spec
+        families.setdefault((aggregator, feature, offset), []).append(spec)
+    positions = {spec: i for i, spec in enumerate(plan)}
+    shared = ["Season", "Home Team", "Away Team", "Primary Key"]
+    inputs = shared + [
+        f"{venue} {feature}" for _, feature, _ in families for venue in ["Home", "Away"]
+    ]
+
+    new_feat = np.empty((len(df), len(plan)))
+    # values of a team only depend on its games of the same season
+    seasons = df.groupby("Season", sort=False, dropna=False).indices
+    for season, rows in seasons.items():
+        part = df.iloc[rows].reset_index(drop=True)
+        # one entry per family and season, older ones are removed by the store
+        names = {
+            family: f"{' '.join(map(str, family))} {season}" for family in families
+        }
+
+        # each input column is hashed once per season
+        digests = {col: store.get_digest(part[col]) for col in dict.fromkeys(inputs)}
+
+        keys, missing = {}, []
+        for family, specs in families.items():
+            _, feature, _ = family
+            cols = shared + [f"Home {feature}", f"Away {feature}"]
+            keys[family] = store.get_key(
+                [digests[col] for col in cols], (VERSION, specs)
+            )
+            values = store.load(names[family], keys[family])
+            if values is None:
+                missing += specs
+            else:
+                new_feat[np.ix_(rows, [positions[spec] for spec in specs])] = values
+
+        if missing:
+            result = _compute_Planned_FEATs(part, missing, workers)
+            for family, specs in families.items():
+                if specs[0] not in missing:
+                    continue
+                values = result[
+                    [feat.rolling_feature(*spec) for spec in specs]
+                ].to_numpy()
+                store.save(names[family], keys[family], values)
+                new_feat[np.ix_(rows, [positions[spec] for spec in specs])] = values
+
+    new_feat = pd.DataFrame(
+        data=new_feat,
+        index=df.index,
+        columns=[feat.rolling_feature(*spec) for spec in plan],
+    )
+    return _attach_Planned_FEATs(df, new_feat)
+
+
+def _add_Rolling_FEATs(df, features, offsets, aggregators, againsts):
+    # order of columns as of calling the single functions feature by feature
+    plan = [
+        (venue, aggregator, feature, against, offset)
+        for feature in features
+        for offset in offsets
+        for aggregator in aggregators
+        for against in againsts
+        for venue in ["Home", "Away"]
+    ]
+    return _add_Planned_FEATs(df, plan)
+
+
+@prof.profile
+def add_Rolling_FEATs_Before_Matchday(
+    df, features, offsets, aggregators=AGGREGATORS, againsts=[False, True]
+):
+    """
+    Adds features "Home {aggregator} {feature} Last {offset} Games Before
+    Matchday" and "Away {aggregator} {feature} Last {offset} Games Before
+    Matchday" (and "... {feature} Against Last ...") for every combination of
+    the given features, offsets, aggregators and againsts in one pass. Games
+    are restructured once into one row per team and game (see TeamGameView),
+    sorted once by team and season and all offsets (e.g. [3, 5, 10, 38]) and
+    aggregators are computed for all features from that sorted array (see
+    _sweep()), so additional offsets add no grouping or merging.
+
+    Values are the same as of add_MA_FEAT_Last_OFFSET_Games_Before_Matchday()
+    and its siblings (which use this function): floats (rounded to 2
+    decimals), uncalculable values are set to -1.0 and there are no overlaps
+    between seasons.
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+    features : list of strings
+    offsets : list of integers
+        window sizes (number of games)
+    aggregators : list of strings, default AGGREGATORS
+        "MA" (moving average), "EWMA" (exponentially weighted moving
+        average), "MAX" or "MIN"
+    againsts : list of booleans, default [False, True]
+        False for the values of the team, True for the values of its opponent
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+
+    Raises
+    ------
+    KeyError
+        when "Primary Key", "Home Team", "Away Team", "Season" or "Home
+        {feature}", "Away {feature}" of one of the features are not present
+    ValueError:
+        when "Home {feature}" or "Away {feature}" is not type float or an
+        aggregator is not in AGGREGATORS
+    """
+    return _add_Rolling_FEATs(df, features, offsets, aggregators, againsts)
+
+
+@prof.profile
+def add_Rolling_FEATs_By_Name(df, identifiers, stored=False, workers=1):
+    """
+    Adds the rolling features of the given feature identifiers (e.g.
+    modules.features.num_features()), which are parsed into a plan of side,
+    aggregator, feature, against and offset (see
+    modules.features.rolling_plan()). Exactly the planned features are
+    computed, identifiers of other features are skipped. Values are the same
+    as of add_Rolling_FEATs_Before_Matchday().
+
+    If stored, each family of aggregator, feature and offset (e.g. "MA xG
+    3") of each season is loaded from the store (see modules.storekeeper),
+    if its input columns did not change. Only the other families are
+    computed and stored.
+
+    With more than one worker, the families are computed by a pool of
+    processes (see _sweep_parallel()).
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+    identifiers : list of strings
+    stored : boolean
+    workers : integer
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+
+    Raises
+    ------
+    KeyError
+        when "Primary Key", "Home Team", "Away Team", "Season" or "Home
+        {feature}", "Away {feature}" of one of the planned features are not
+        present
+    ValueError:
+        when "Home {feature}" or "Away {feature}" is not type float
+    """
+    if stored:
+        return _add_Stored_FEATs(df, feat.rolling_plan(identifiers), workers)
+    return _add_Planned_FEATs(df, feat.rolling_plan(identifiers), workers)
+
+
+@prof.profile
 def add_MA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     MA = moving average
@@ -627,81 +1156,10 @@ def add_MA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
-
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
-
-    col_home = f"Home MA {feature} Last {offset} Games Before Matchday"
-    col_away = f"Away MA {feature} Last {offset} Games Before Matchday"
+    return _add_Rolling_FEATs(df, [feature], [offset], ["MA"], [False])
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
 
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, False)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
-
-            # AGGREGATE FEATURE
-            values[feature] = (
-                values[feature].rolling(offset, min_periods=1).mean().shift(1).round(2).fillna(-1)
-            )
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
-
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
-
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
-
-
-@report_execution_time
+@prof.profile
 def add_MA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     MA = moving average
@@ -732,81 +1190,10 @@ def add_MA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
-
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
+    return _add_Rolling_FEATs(df, [feature], [offset], ["MA"], [True])
 
-    col_home = f"Home MA {feature} Against Last {offset} Games Before Matchday"
-    col_away = f"Away MA {feature} Against Last {offset} Games Before Matchday"
-
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
-
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, True)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
-
-            # AGGREGATE FEATURE
-            values[feature] = (
-                values[feature].rolling(offset, min_periods=1).mean().shift(1).round(2).fillna(-1)
-            )
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
 
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
-
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
-
-
-@report_execution_time
+@prof.profile
 def add_EWMA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     EWMA = exponentially weighted moving average
@@ -837,79 +1224,10 @@ def add_EWMA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
-
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
-
-    col_home = f"Home EWMA {feature} Last {offset} Games Before Matchday"
-    col_away = f"Away EWMA {feature} Last {offset} Games Before Matchday"
-
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
-
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, False)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
-
-            # AGGREGATE FEATURE
-            values[feature] = values[feature].ewm(span=offset).mean().shift(1).round(2).fillna(-1)
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
-
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
-
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    return _add_Rolling_FEATs(df, [feature], [offset], ["EWMA"], [False])
 
 
-@report_execution_time
+@prof.profile
 def add_EWMA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     EWMA = exponentially weighted moving average
@@ -940,79 +1258,10 @@ def add_EWMA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
+    return _add_Rolling_FEATs(df, [feature], [offset], ["EWMA"], [True])
 
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
-
-    col_home = f"Home EWMA {feature} Against Last {offset} Games Before Matchday"
-    col_away = f"Away EWMA {feature} Against Last {offset} Games Before Matchday"
-
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
 
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, True)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
-
-            # AGGREGATE FEATURE
-            values[feature] = values[feature].ewm(span=offset).mean().shift(1).round(2).fillna(-1)
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
-
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
-
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
-
-
-@report_execution_time
+@prof.profile
 def add_MAX_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     Adds features "Home MAX {feature} Last {offset} Games Before Matchday" and
@@ -1040,81 +1289,10 @@ def add_MAX_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
-
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
+    return _add_Rolling_FEATs(df, [feature], [offset], ["MAX"], [False])
 
-    col_home = f"Home MAX {feature} Last {offset} Games Before Matchday"
-    col_away = f"Away MAX {feature} Last {offset} Games Before Matchday"
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
-
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, False)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
-
-            # AGGREGATE FEATURE
-            values[feature] = (
-                values[feature].rolling(offset, min_periods=1).max().shift(1).round(2).fillna(-1)
-            )
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
-
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
-
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
-
-
-@report_execution_time
+@prof.profile
 def add_MAX_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     Adds features "Home MAX {feature} Against Last {offset} Games Before
@@ -1143,81 +1321,10 @@ def add_MAX_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
-
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
-
-    col_home = f"Home MAX {feature} Against Last {offset} Games Before Matchday"
-    col_away = f"Away MAX {feature} Against Last {offset} Games Before Matchday"
-
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
-
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, True)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
-
-            # AGGREGATE FEATURE
-            values[feature] = (
-                values[feature].rolling(offset, min_periods=1).max().shift(1).round(2).fillna(-1)
-            )
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
-
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
-
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+    return _add_Rolling_FEATs(df, [feature], [offset], ["MAX"], [True])
 
 
-@report_execution_time
+@prof.profile
 def add_MIN_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     Adds features "Home MIN {feature} Last {offset} Games Before Matchday" and
@@ -1245,81 +1352,10 @@ def add_MIN_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
-
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
-
-    col_home = f"Home MIN {feature} Last {offset} Games Before Matchday"
-    col_away = f"Away MIN {feature} Last {offset} Games Before Matchday"
-
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
-
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
-
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, False)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
-            )
+    return _add_Rolling_FEATs(df, [feature], [offset], ["MIN"], [False])
 
-            # AGGREGATE FEATURE
-            values[feature] = (
-                values[feature].rolling(offset, min_periods=1).min().shift(1).round(2).fillna(-1)
-            )
-
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
-
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
-            )
-            result = pd.concat([left, right], axis=1)
-
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
-            )
 
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
-
-
-@report_execution_time
+@prof.profile
 def add_MIN_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     """
     Adds features "Home MIN {feature} Against Last {offset} Games Before
@@ -1348,78 +1384,298 @@ def add_MIN_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset):
     ValueError:
         when "Home {feature}" or "Away {feature}" is not type float
     """
-    cols = [
-        "Season",
-        "Home Team",
-        "Away Team",
-        f"Home {feature}",
-        f"Away {feature}",
-        "Primary Key",
-    ]
-    if not set(cols).issubset(df.columns):
-        raise KeyError
+    return _add_Rolling_FEATs(df, [feature], [offset], ["MIN"], [True])
 
-    df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
-    df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
 
-    col_home = f"Home MIN {feature} Against Last {offset} Games Before Matchday"
-    col_away = f"Away MIN {feature} Against Last {offset} Games Before Matchday"
+class FeatureState:
+    """
+    State of the features, which depend on earlier games of the team ("Days
+    Since Last Game", "Coach Substituted Within Last OFFSET Games", "Current
+    Position Before Matchday" and the rolling features of a plan), after all
+    games passed to update(). It is built once from the production data and
+    then updated with new games (e.g. the next matchday), whose features are
+    computed from the state in O(new games) instead of rebuilding all games
+    of the season. Values are the same as of add_Days_Since_Last_Game(),
+    add_Coach_Substituted_Within_Last_OFFSET_Games(),
+    add_Current_Position_Before_Matchday() and add_Rolling_FEATs_By_Name()
+    on all games of the season (like steps.step_07 does).
+
+    The state of each team and season holds the date and coaches of its last
+    games, the last values of each stat and the accumulators of the rolling
+    means (see _ma_step() and _ewma_step()). The standings hold the sums of
+    points, goals and games per team and matchweek of each competition and
+    season.
+
+    Attributes
+    ----------
+    plan : list
+        see modules.features.rolling_plan()
+    offset : integer
+        of add_Coach_Substituted_Within_Last_OFFSET_Games() and
+        add_Current_Position_Before_Matchday()
+    index : pandas.core.indexes.multi.MultiIndex
+        "Team" and "Season" of each state
+    table : pandas.core.frame.DataFrame
+        "Points", "Goals", "Goals Against" and "Games" per "Competition",
+        "Season", "Matchweek" and "Team"
+    """
 
-    df[col_home] = ERR_MSG
-    df[col_away] = ERR_MSG
+    KEYS = ["Competition", "Season", "Matchweek", "Team"]
+    SUMS = ["Points", "Goals", "Goals Against", "Games"]
+
+    def __init__(self, identifiers, offset):
+        self.plan = feat.rolling_plan(identifiers)
+        self.offset = offset
+        self.features, self.values, self.windows = _plan_windows(self.plan)
+        width = max([window for _, window in self.windows] + [0]) + 1
+
+        self.index = pd.MultiIndex.from_arrays([[], []], names=["Team", "Season"])
+        self.count = np.zeros(0, dtype=int)
+        self.date = np.zeros(0, dtype=np.int64)
+        self.coaches = np.empty((0, offset), dtype=object)
+        self.buffer = np.empty((0, len(self.values), width))
+        self.accumulators = {}
+        for (aggregator, window), columns in self.windows.items():
+            if aggregator == "MA":
+                self.accumulators[(aggregator, window)] = _ma_state((0, len(columns)))
+            elif aggregator == "EWMA":
+                self.accumulators[(aggregator, window)] = {
+                    "weighted": np.empty((0, len(columns))),
+                    "weight": np.empty((0, len(columns))),
+                }
+
+        self.table = pd.DataFrame(
+            data={
+                **{key: pd.Series(dtype=object) for key in FeatureState.KEYS},
+                **{col: pd.Series(dtype=int) for col in FeatureState.SUMS},
+            }
+        ).astype({"Matchweek": float})
+
+    def groups(self, teams, seasons):
+        """
+        Returns the state of each team and season, new states are added for
+        unknown teams and seasons.
+
+        Returns
+        -------
+        result : numpy.ndarray
+        """
+        keys = pd.MultiIndex.from_arrays([teams, seasons], names=self.index.names)
+        new = keys.unique().difference(self.index)
+        if len(new):
+            self.index = self.index.append(new)
+
+            def grow(array, fill):
+                missing = np.full(
+                    (len(new),) + array.shape[1:], fill, dtype=array.dtype
+                )
+                return np.concatenate([array, missing])
+
+            self.count = grow(self.count, 0)
+            self.date = grow(self.date, 0)
+            self.coaches = grow(self.coaches, np.nan)
+            self.buffer = grow(self.buffer, np.nan)
+            for accumulator in self.accumulators.values():
+                empty = {"previous": np.nan, "weighted": np.nan, "weight": 1.0}
+                for key, array in accumulator.items():
+                    accumulator[key] = grow(array, empty.get(key, 0.0))
+        return self.index.get_indexer(keys)
+
+    def update(self, df):
+        """
+        Adds the games of df (in order of "Match Key") to the state and adds
+        features "Home Days Since Last Game", "Home Coach Substituted Within
+        Last {offset} Games", "Home Current Position Before Matchday", the
+        rolling features of the plan and their "Away ..." counterparts to df.
+        Stats (and "Home Goals", "Away Goals") of games, which are not played
+        yet, may be missing. Unlike add_Days_Since_Last_Game() the days are
+        counted within seasons.
+
+        Parameters
+        ----------
+        df : pandas.core.frame.DataFrame
+
+        Returns
+        -------
+        df : pandas.core.frame.DataFrame
+
+        Raises
+        ------
+        KeyError
+            when "Primary Key", "Home Team", "Away Team", "Season",
+            "Competition", "Matchweek", "Date", "Home Coach", "Away Coach",
+            "Home Points" or "Away Points" are not present
+        ValueError
+            when a game is not after the last game of its teams in the state
+            or stats are not type float
+        """
+        cols = [
+            "Primary Key",
+            "Home Team",
+            "Away Team",
+            "Season",
+            "Competition",
+            "Matchweek",
+            "Date",
+            "Home Coach",
+            "Away Coach",
+            "Home Points",
+            "Away Points",
+        ]
+        if not set(cols).issubset(df.columns):
+            raise KeyError
+
+        for feature in self.features + ["Goals"]:
+            for venue in ["Home", "Away"]:
+                if f"{venue} {feature}" not in df.columns:
+                    df[f"{venue} {feature}"] = np.nan
+
+        # raises ValueError
+        _fill_Points_Goals(df)
+        for feature in self.features:
+            df[f"Home {feature}"] = df[f"Home {feature}"].astype(float)
+            df[f"Away {feature}"] = df[f"Away {feature}"].astype(float)
+        df["Date"] = pd.to_datetime(df["Date"])
+
+        _introduce_Match_Key(df)
+        df.sort_values(by=["Match Key"], inplace=True)
+        df.reset_index(inplace=True, drop=True)
+        df.drop(columns=["Match Key"], inplace=True)
+
+        view = TeamGameView(df)
+        groups = self.groups(view.games["Team"], view.games["Season"])
+        dates = np.repeat(df["Date"].to_numpy().view(np.int64), 2)
+        if ((self.count[groups] > 0) & (dates <= self.date[groups])).any():
+            raise ValueError
 
-    df.sort_values(by=["Primary Key"], inplace=True)
-    df.reset_index(inplace=True, drop=True)
+        positions = self._positions(df, view)
+        values = [
+            f"{stat} Against" if against else stat for stat, against in self.values
+        ]
+        days, substituted, results = self._advance(
+            groups,
+            dates,
+            view.values(df, ["Coach"])["Coach"].to_numpy(),
+            view.values(df, self.features)[values].to_numpy(dtype=float),
+        )
 
-    new_feat = df[[col_home, col_away]].copy(deep=True)
-
-    for team in np.unique(df[["Home Team", "Away Team"]]):
-        tmp = df.loc[((df["Home Team"] == team) | (df["Away Team"] == team))][cols]
-        for season in tmp["Season"].unique():
-            # GET DATA
-            games = tmp.loc[tmp["Season"] == season]
-            values = helper.extract_feature_per_team(games, feature, team, True)
-
-            # RESTRUCTURE GAMES
-            games = (
-                games.rename_axis(index="Game", columns="Venue")
-                .stack()
-                .rename("Team")
-                .reset_index()
+        new_feat = {
+            "Home Days Since Last Game": days[0::2],
+            "Away Days Since Last Game": days[1::2],
+            f"Home Coach Substituted Within Last {self.offset} Games": substituted[
+                0::2
+            ],
+            f"Away Coach Substituted Within Last {self.offset} Games": substituted[
+                1::2
+            ],
+            "Home Current Position Before Matchday": positions[0::2],
+            "Away Current Position Before Matchday": positions[1::2],
+        }
+        for side, aggregator, stat, against, offset in self.plan:
+            column = self.windows[(aggregator, offset)].index(
+                self.values.index((stat, against))
             )
-
-            # AGGREGATE FEATURE
-            values[feature] = (
-                values[feature].rolling(offset, min_periods=1).min().shift(1).round(2).fillna(-1)
+            rows = results[(aggregator, offset)][
+                0 if side == "Home" else 1 :: 2, column
+            ]
+            new_feat[feat.rolling_feature(side, aggregator, stat, against, offset)] = (
+                rows
             )
 
-            # BUILD RESULT
-            result = (
-                games.merge(values, on=["Game", "Team"], how="left")
-                .set_index(["Game", "Venue"])
-                .unstack()
-            )
+        new_feat = pd.DataFrame(data=new_feat, index=df.index)
+        existing = [col for col in new_feat.columns if col in df.columns]
+        df[existing] = new_feat[existing]
+        return pd.concat([df, new_feat.drop(columns=existing)], axis=1)
+
+    def _positions(self, df, view):
+        # adds the games to the standings, positions are looked up in the
+        # standings of all games of the competitions and seasons
+        games = view.games.assign(
+            Competition=np.repeat(df["Competition"].to_numpy(), 2),
+            Matchweek=np.repeat(df["Matchweek"].to_numpy(dtype=float), 2),
+            Games=1,
+            **view.values(df, ["Points", "Goals"]),
+        )
+        self.table = (
+            pd.concat([self.table, games[FeatureState.KEYS + FeatureState.SUMS]])
+            .groupby(by=FeatureState.KEYS, sort=False)
+            .sum()
+            .reset_index()
+        )
 
-            left = result["Team"].reset_index()
-            right = (
-                result[feature][["Away Team", "Home Team"]]
-                .rename(columns={"Home Team": col_home, "Away Team": col_away})
-                .reset_index(drop=True)
+        values = np.full(len(games), "UNKNOWN", dtype=object)
+        for (competition, season), part in games.groupby(
+            by=["Competition", "Season"], sort=False
+        ):
+            table = self.table.loc[
+                (self.table["Competition"] == competition)
+                & (self.table["Season"] == season)
+            ]
+            values[part.index] = _lookup_positions(
+                _standings(table), part["Matchweek"].to_numpy(), part["Team"]
             )
-            result = pd.concat([left, right], axis=1)
 
-            # UPDATE DF
-            new_feat.update(
-                result.set_index("Primary Key")
-                .reindex(df.set_index("Primary Key").index)
-                .reset_index()
+        values[games["Matchweek"].to_numpy() <= self.offset] = -1
+        return values
+
+    def _advance(self, groups, dates, coaches, values):
+        # advances the states game by game of each team and season, all
+        # states at once, returns days, substitutions and rolling features
+        days = np.empty(len(groups))
+        substituted = np.zeros(len(groups), dtype=bool)
+        results = {
+            window: np.empty((len(groups), len(columns)))
+            for window, columns in self.windows.items()
+        }
+
+        layers = pd.Series(groups).groupby(groups).cumcount().to_numpy()
+        for layer in range(layers.max() + 1 if len(layers) else 0):
+            rows = np.flatnonzero(layers == layer)
+            group = groups[rows]
+            played = self.count[group]
+
+            diff = (dates[rows] - self.date[group]).astype(float)
+            days[rows] = np.where(played > 0, diff, -DAY_IN_NS) / DAY_IN_NS
+
+            previous = self.coaches[group, 0] if self.offset else coaches[rows]
+            substituted[rows] = (played >= self.offset) & (coaches[rows] != previous)
+
+            # values of the current game are aggregated by the next games
+            buffer = self.buffer[group]
+            for (aggregator, window), columns in self.windows.items():
+                added = buffer[:, columns, -1]
+                if aggregator == "MA":
+                    accumulator = self.accumulators[(aggregator, window)]
+                    state = {key: accumulator[key][group] for key in MA_KEYS}
+                    result = _ma_step(state, added, buffer[:, columns, -1 - window])
+                elif aggregator == "EWMA":
+                    accumulator = self.accumulators[(aggregator, window)]
+                    state = {key: accumulator[key][group] for key in accumulator}
+                    result = _ewma_step(state, added, 1.0 - 2.0 / (window + 1.0))
+                elif aggregator in ["MAX", "MIN"]:
+                    reduce = np.fmax if aggregator == "MAX" else np.fmin
+                    result = reduce.reduce(buffer[:, columns, -window:], axis=-1)
+                else:
+                    raise ValueError
+
+                if aggregator in ["MA", "EWMA"]:
+                    for key in state:
+                        accumulator[key][group] = state[key]
+                results[(aggregator, window)][rows] = np.nan_to_num(
+                    result.round(2), nan=-1.0
+                )
+
+            self.buffer[group] = np.concatenate(
+                [buffer[:, :, 1:], values[rows, :, None]], axis=2
             )
-
-    df.update(new_feat)
-
-    if (df[col_home] == ERR_MSG).any() or (df[col_away] == ERR_MSG).any():
-        raise BrokenAlgorithmException
-    return df
+            if self.offset:
+                self.coaches[group] = np.column_stack(
+                    [self.coaches[group, 1:], coaches[rows]]
+                )
+            self.count[group] += 1
+            self.date[group] = dates[rows]
+
+        return days, substituted, results
 
 
 def set_maximum(df, feature, threshold):
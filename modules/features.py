@@ -1,3 +1,5 @@
+import re
+
 _num_features = [
     "Home Odds",
     "Deuce Odds",
@@ -338,6 +340,52 @@ def num_features():
     return _num_features
 
 
+_rolling_feature = re.compile(
+    r"^(Home|Away) (MA|EWMA|MAX|MIN) (.+?)( Against)? Last (\d+) Games Before Matchday$"
+)
+
+
+def rolling_feature(side, aggregator, stat, against, window):
+    """
+    provides the identifier of a rolling feature, e.g. ("Home", "MIN", "Red
+    Cards", True, 5) -> "Home MIN Red Cards Against Last 5 Games Before
+    Matchday"
+
+    returns: string - feature identifier
+    """
+    suffix = " Against" if against else ""
+    return f"{side} {aggregator} {stat}{suffix} Last {window} Games Before Matchday"
+
+
+def parse_rolling_feature(feature):
+    """
+    provides side ("Home" or "Away"), aggregator ("MA", "EWMA", "MAX" or
+    "MIN"), stat (e.g. "Red Cards"), against (boolean) and window (number of
+    games) of a rolling feature identifier, see rolling_feature()
+
+    returns: tuple - (side, aggregator, stat, against, window) or None, if
+    feature is no rolling feature
+    """
+    match = _rolling_feature.match(feature)
+    if match is None:
+        return None
+
+    side, aggregator, stat, against, window = match.groups()
+    return side, aggregator, stat, against is not None, int(window)
+
+
+def rolling_plan(features):
+    """
+    provides the rolling features (see parse_rolling_feature()) of the given
+    feature identifiers without duplicates and in order, other identifiers
+    are skipped
+
+    returns: list - tuples (side, aggregator, stat, against, window)
+    """
+    plan = [parse_rolling_feature(feature) for feature in features]
+    return list(dict.fromkeys(spec for spec in plan if spec is not None))
+
+
 _cat_features = [
     "Home Team",
     "Away Team",
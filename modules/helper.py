@@ -4,6 +4,19 @@ import numpy as np
 import pandas as pd
 from sklearn.preprocessing import OneHotEncoder
 
+import modules.translator as trans
+
+MATCH_KEY_TEAM_BITS = 20
+
+# categories of modules.translator.categories() to columns sharing them
+SCHEMA_COLUMNS = {
+    "Team": ["Home Team", "Away Team"],
+    "Competition": ["Competition"],
+    "Season": ["Season"],
+    "Day": ["Day"],
+    "Kick Off": ["Kick Off"],
+}
+
 
 def invert_dictionary(dictionary):
     """
@@ -139,3 +152,140 @@ def get_periods(start, time_delta, no_of_iterations):
         last = date
 
     return periods
+
+
+def get_match_key(df):
+    """
+    Encodes a game as integer "Match Key": the days since epoch of "Primary
+    Key" (date formatted as yyyy-mm-dd followed by home team and away team)
+    are stored in the upper bits, the codes of "Home Team" and "Away Team" in
+    the categories of modules.translator.categories() (see set_categories())
+    in the lower 2 * MATCH_KEY_TEAM_BITS bits. Different games of the same
+    frame always get different match keys. Codes of teams which are not part
+    of the categories depend on the teams present, so match keys are only
+    compared within a frame. Sorting by match key sorts by date, games of the
+    same date are ordered by the codes of home team and away team.
+
+    >>> df = pd.DataFrame(
+    ...     data={
+    ...         "Primary Key": ["2017-08-19VfL WolfsburgBorussia Dortmund"],
+    ...         "Home Team": ["VfL Wolfsburg"],
+    ...         "Away Team": ["Borussia Dortmund"],
+    ...     }
+    ... )
+    >>> helper.get_match_key(df) // 2 ** (2 * helper.MATCH_KEY_TEAM_BITS)
+    0    17397
+    Name: Match Key, dtype: int64
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+
+    Returns
+    -------
+    result : pandas.core.series.Series
+
+    Raises
+    ------
+    KeyError
+        when "Primary Key", "Home Team" or "Away Team" are not present
+    ValueError
+        when "Primary Key" does not start with a date formatted as yyyy-mm-dd
+        or there are more than 2**MATCH_KEY_TEAM_BITS teams
+    """
+    if not {"Primary Key", "Home Team", "Away Team"}.issubset(df.columns):
+        raise KeyError
+
+    # raises ValueError
+    dates = pd.to_datetime(df["Primary Key"].astype(str).str[:10], format="%Y-%m-%d")
+    days = dates.values.astype("datetime64[D]").astype(np.int64)
+
+    teams = pd.DataFrame(
+        data={
+            col: df[col].astype(object).fillna("UNKNOWN").to_numpy()
+            for col in ["Home Team", "Away Team"]
+        }
+    )
+    set_categories(teams, ["Home Team", "Away Team"], trans.categories()["Team"])
+    if len(teams["Home Team"].cat.categories) > 2**MATCH_KEY_TEAM_BITS:
+        raise ValueError
+    home = teams["Home Team"].cat.codes.to_numpy().astype(np.int64)
+    away = teams["Away Team"].cat.codes.to_numpy().astype(np.int64)
+
+    return pd.Series(
+        (days << (2 * MATCH_KEY_TEAM_BITS)) | (home << MATCH_KEY_TEAM_BITS) | away,
+        index=df.index,
+        name="Match Key",
+    )
+
+
+def set_categories(df, cols, categories):
+    """
+    Converts cols of a given dataframe to one shared categorical dtype. The
+    categories are the given categories followed by values of cols, which are
+    not part of them, in alphabetical order. So codes of the given categories
+    stay the same, no matter which values are present. Modifies df in place.
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+    cols : list
+    categories : list
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+
+    Raises
+    ------
+    KeyError
+        when one of cols is not present
+    """
+    if not set(cols).issubset(df.columns):
+        raise KeyError
+
+    values = set()
+    for col in cols:
+        values.update(df[col].dropna().unique())
+    additional = sorted(values - set(categories), key=str)
+
+    dtype = pd.CategoricalDtype(list(categories) + additional)
+    for col in cols:
+        df[col] = df[col].astype(dtype)
+    return df
+
+
+def apply_schema(df):
+    """
+    Applies the schema (version modules.translator.SCHEMA_VERSION) to a given
+    dataframe. Columns of SCHEMA_COLUMNS are converted to categoricals with
+    the categories of modules.translator.categories(), "Home Coach" and "Away
+    Coach" to categoricals with the coaches present. Numeric columns are
+    downcast without loss: integers and floats without decimals to the
+    smallest integer dtype. Other floats stay untouched. Modifies df in place.
+
+    Parameters
+    ----------
+    df : pandas.core.frame.DataFrame
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+    """
+    categories = trans.categories()
+    for feature, cols in SCHEMA_COLUMNS.items():
+        cols = [col for col in cols if col in df.columns]
+        if cols:
+            set_categories(df, cols, categories[feature])
+
+    cols = [col for col in ["Home Coach", "Away Coach"] if col in df.columns]
+    if cols:
+        set_categories(df, cols, [])
+
+    for col in df.select_dtypes(include=["number"]).columns:
+        values = df[col]
+        if pd.api.types.is_float_dtype(values):
+            if values.isnull().any() or not (values == np.round(values)).all():
+                continue
+        df[col] = pd.to_numeric(values, downcast="integer")
+    return df
@@ -0,0 +1,257 @@
+import contextlib
+import datetime as dt
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Stage", "Parent", "Start", "Wall", "CPU", "Memory", "Rows", "Cols"]
+
+# records of all profiled stages of this process since start() (see report())
+RECORDS = []
+
+_recording = False
+_local = threading.local()
+# open stages of all threads by id, see stage()
+_open = {}
+_lock = threading.Lock()
+
+
+def start(memory=True):
+    """
+    Clears the records and starts recording stages and tracing memory (see
+    tracemalloc), if memory. Without tracing, "Memory" is not recorded,
+    because tracing slows down allocations.
+    """
+    global _recording
+    clear()
+    _recording = True
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop():
+    """
+    Stops recording stages and tracing memory, the records are kept.
+    """
+    global _recording
+    _recording = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def clear():
+    """
+    Clears the records.
+    """
+    RECORDS.clear()
+
+
+@contextlib.contextmanager
+def stage(name, rows=None):
+    """
+    Context manager recording wall time and CPU time (of the thread,
+    seconds), the increase of peak memory (bytes, if traced) and rows of the
+    input of the stage. "Cols" of the output can be set on the yielded
+    record. Stages may be nested, "Parent" is the enclosing stage of the same
+    thread. Records are only kept between start() and stop().
+
+    The peak of tracemalloc is shared by all threads. Stages of other
+    threads (e.g. nodes of modules.scheduler) count as nested in the open
+    stage of the main thread, but "Memory" is NaN for stages overlapping
+    with stages of further threads (e.g. workers > 1). CPU time of other
+    threads and processes (e.g. of modules.engineer._sweep_parallel()) is
+    not included.
+
+    Parameters
+    ----------
+    name : string
+    rows : integer
+
+    Yields
+    ------
+    record : dictionary
+    """
+    stack = _local.__dict__.setdefault("stack", [])
+    record = {
+        "Stage": name,
+        "Parent": stack[-1]["Stage"] if stack else None,
+        "Start": dt.datetime.now().isoformat(),
+        "Wall": np.nan,
+        "CPU": np.nan,
+        "Memory": np.nan,
+        "Rows": rows,
+        "Cols": None,
+    }
+
+    tracing = tracemalloc.is_tracing()
+    thread = threading.get_ident()
+    main = threading.main_thread().ident
+    with _lock:
+        enclosing = stack[-1] if stack else None
+        if enclosing is None and thread != main:
+            enclosing = next(
+                (x for x in reversed(_open.values()) if x["_thread"] == main), None
+            )
+        # resetting the peak would falsify the peaks of other threads' stages
+        others = [x for x in _open.values() if x["_thread"] != thread]
+        if thread != main:
+            others = [x for x in others if x["_thread"] != main]
+        if others:
+            for x in list(_open.values()) + [record]:
+                x["_shared"] = True
+        record["_thread"] = thread
+        _open[id(record)] = record
+
+        if tracing and not others:
+            current, peak = tracemalloc.get_traced_memory()
+            # the peak so far belongs to the enclosing stage
+            if enclosing is not None:
+                enclosing["_peak"] = max(enclosing.get("_peak", 0), peak)
+            tracemalloc.reset_peak()
+            record["_base"] = current
+    stack.append(record)
+
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield record
+    finally:
+        record["Wall"] = time.perf_counter() - wall
+        record["CPU"] = time.thread_time() - cpu
+        stack.pop()
+
+        with _lock:
+            del _open[id(record)]
+            del record["_thread"]
+            shared = record.pop("_shared", False)
+            base = record.pop("_base", None)
+            peak = record.pop("_peak", 0)
+            if tracing and not shared and base is not None and tracemalloc.is_tracing():
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                record["Memory"] = peak - base
+                if enclosing is not None:
+                    enclosing["_peak"] = max(enclosing.get("_peak", 0), peak)
+        if _recording:
+            RECORDS.append(record)
+
+
+def profile(func):
+    """
+    Decorator recording each call of func as a stage (see stage()) and
+    reporting the execution time. "Rows" is the length of the first frame
+    of the arguments, "Cols" the number of columns of a returned frame.
+    """
+
+    @functools.wraps(func)
+    def wrap(*args, **kwargs):
+        frames = [
+            arg
+            for arg in list(args) + list(kwargs.values())
+            if isinstance(arg, pd.DataFrame)
+        ]
+        rows = len(frames[0]) if frames else None
+
+        with stage(func.__qualname__, rows) as record:
+            result = func(*args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                record["Cols"] = len(result.columns)
+
+        print(f"{func.__name__: <60} -> {dt.timedelta(seconds=record['Wall'])}")
+        return result
+
+    return wrap
+
+
+def report(records=None):
+    """
+    Returns records (default all records of this process) as frame, one row
+    per call of a stage.
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+    """
+    records = RECORDS if records is None else records
+    return pd.DataFrame(data=list(records), columns=COLUMNS)
+
+
+def dump(path, records=None):
+    """
+    Saves report() as JSON (path ends with ".json") or CSV.
+    """
+    df = report(records)
+    if path.endswith(".json"):
+        with open(path, "w") as file:
+            json.dump(json.loads(df.to_json(orient="records")), file, indent=2)
+    else:
+        df.to_csv(path, index=False)
+
+
+def load(path):
+    """
+    Loads a report saved by dump().
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+    """
+    if path.endswith(".json"):
+        with open(path) as file:
+            return report(json.load(file))
+    return pd.read_csv(path)
+
+
+def summary(df):
+    """
+    Returns calls, sums of "Wall", "CPU" and "Rows" and maxima of "Memory"
+    and "Cols" of a report per stage.
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+    """
+    df = df.assign(Calls=1)
+    for col in ["Wall", "CPU", "Memory", "Rows", "Cols"]:
+        df[col] = pd.to_numeric(df[col])
+    return df.groupby(by="Stage", sort=False).agg(
+        {
+            "Calls": "sum",
+            "Wall": "sum",
+            "CPU": "sum",
+            "Memory": "max",
+            "Rows": "sum",
+            "Cols": "max",
+        }
+    )
+
+
+def diff(before, after):
+    """
+    Compares two reports (e.g. of dump() and load()) per stage. For each
+    column of summary() the values before, after and the change (after -
+    before) are returned, stages of only one report are NaN on the other
+    side.
+
+    Parameters
+    ----------
+    before : pandas.core.frame.DataFrame
+    after : pandas.core.frame.DataFrame
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+    """
+    before, after = summary(before), summary(after)
+    stages = list(dict.fromkeys(list(before.index) + list(after.index)))
+    before, after = before.reindex(stages), after.reindex(stages)
+
+    data = {}
+    for col in before.columns:
+        data[f"{col} Before"] = before[col]
+        data[f"{col} After"] = after[col]
+        data[f"{col} Change"] = after[col] - before[col]
+    return pd.DataFrame(data=data, index=pd.Index(stages, name="Stage"))
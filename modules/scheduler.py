@@ -0,0 +1,255 @@
+import concurrent.futures
+import time
+
+import pandas as pd
+
+import modules.engineer as eng
+import modules.storekeeper as store
+
+KEY = "Primary Key"
+
+
+class Node:
+    """
+    A step of the engineering pipeline. func(df, *args, **kwargs) returns df
+    with the outputs computed from the inputs, rows are identified by
+    "Primary Key". Columns, which are modified (e.g. by set_maximum()), are
+    inputs and outputs.
+
+    Attributes
+    ----------
+    name : string
+    func : function
+    inputs : list of strings
+    outputs : list of strings
+    args : tuple
+        further arguments of func
+    kwargs : dictionary
+        further keyword arguments of func
+    stored : boolean
+        if outputs may be loaded from the store (see modules.storekeeper)
+    """
+
+    def __init__(self, name, func, inputs, outputs, args=(), kwargs=None, stored=True):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.stored = stored
+
+    def get_key(self, df):
+        """
+        Returns the key of the outputs of df (see modules.storekeeper),
+        frames of args and kwargs are hashed by their values. The key changes
+        with modules.engineer.VERSION.
+        """
+        digests = [store.get_digest(df[col]) for col in df.columns]
+        names = sorted(self.kwargs)
+        params = [eng.VERSION, self.name, self.func.__name__, names]
+        for arg in list(self.args) + [self.kwargs[name] for name in names]:
+            if isinstance(arg, pd.DataFrame):
+                params.append([store.get_digest(arg[col]) for col in arg.columns])
+            else:
+                params.append(repr(arg))
+        return store.get_key(digests, params)
+
+    def run(self, df, stored=False):
+        """
+        Returns "Primary Key" and the outputs of df, computed or loaded from
+        the store, and the duration in seconds.
+        """
+        start = time.perf_counter()
+        cols = [KEY] + self.outputs
+        if stored and self.stored:
+            key = self.get_key(df)
+            result = store.load_frame(self.name, key)
+            if result is None:
+                result = self.func(df, *self.args, **self.kwargs)
+                result = result[cols].reset_index(drop=True)
+                store.save_frame(self.name, key, result)
+        else:
+            result = self.func(df, *self.args, **self.kwargs)[cols]
+        return result, time.perf_counter() - start
+
+
+class Scheduler:
+    """
+    Runs nodes in an order derived from their inputs and outputs. For each
+    column, nodes creating it (outputs only) run before nodes modifying it
+    (inputs and outputs), which run before nodes reading it (inputs only).
+    Only between nodes of the same kind the order of nodes decides.
+    Independent nodes run concurrently.
+
+    Attributes
+    ----------
+    nodes : dictionary
+        name -> Node
+    dependencies : dictionary
+        name -> set of names of the nodes, which have to run before
+    order : list of strings
+        names of nodes in topological order
+    durations : dictionary
+        name -> seconds of the last run (see get_critical_path())
+    """
+
+    def __init__(self, nodes):
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError
+
+        self.dependencies = Scheduler.get_dependencies(nodes)
+        self.order = Scheduler.get_order(nodes, self.dependencies)
+        self.durations = {}
+
+    @staticmethod
+    def get_dependencies(nodes):
+        """
+        Returns the names of the nodes each node depends on.
+        """
+        dependencies = {node.name: set() for node in nodes}
+        cols = dict.fromkeys(
+            col for node in nodes for col in node.inputs + node.outputs
+        )
+        for col in cols:
+            creators = [
+                node.name
+                for node in nodes
+                if col in node.outputs and col not in node.inputs
+            ]
+            modifiers = [
+                node.name
+                for node in nodes
+                if col in node.outputs and col in node.inputs
+            ]
+            readers = [
+                node.name
+                for node in nodes
+                if col in node.inputs and col not in node.outputs
+            ]
+
+            for i, name in enumerate(creators):
+                dependencies[name].update(creators[:i])
+            for i, name in enumerate(modifiers):
+                dependencies[name].update(creators + modifiers[:i])
+            for name in readers:
+                dependencies[name].update(creators + modifiers)
+        return dependencies
+
+    @staticmethod
+    def get_order(nodes, dependencies):
+        """
+        Returns the names of nodes in topological order, ties are broken by
+        the order of nodes.
+
+        Raises
+        ------
+        ValueError
+            when dependencies are cyclic
+        """
+        order = []
+        while len(order) < len(nodes):
+            ready = [
+                node.name
+                for node in nodes
+                if node.name not in order and dependencies[node.name].issubset(order)
+            ]
+            if not ready:
+                raise ValueError
+            order.append(ready[0])
+        return order
+
+    def run(self, df, workers=1, stored=False):
+        """
+        Runs all nodes on df, each one on a copy of its inputs (and existing
+        outputs). Outputs are taken over by "Primary Key", the rows of df
+        are kept. If stored, outputs of nodes are loaded from the store, if
+        their inputs did not change.
+
+        Parameters
+        ----------
+        df : pandas.core.frame.DataFrame
+        workers : integer
+            threads running independent nodes concurrently, which only speeds
+            up nodes releasing the GIL
+        stored : boolean
+
+        Returns
+        -------
+        df : pandas.core.frame.DataFrame
+
+        Raises
+        ------
+        KeyError
+            when "Primary Key" or inputs, which are no outputs of any node,
+            are not present or "Primary Key" is not unique
+        """
+        outputs = set(col for node in self.nodes.values() for col in node.outputs)
+        inputs = set(col for node in self.nodes.values() for col in node.inputs)
+        if not (inputs - outputs | set([KEY])).issubset(df.columns):
+            raise KeyError
+        if df[KEY].duplicated().any():
+            raise KeyError
+
+        df = df.copy()
+        # new columns in order of nodes, whichever node finishes first
+        cols = list(df.columns) + [
+            col for name in self.order for col in self.nodes[name].outputs
+        ]
+        self.durations = {}
+        running = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            while len(self.durations) < len(self.nodes):
+                for name in self.order:
+                    if name in self.durations or name in running:
+                        continue
+                    if not self.dependencies[name].issubset(self.durations):
+                        continue
+                    node = self.nodes[name]
+                    copy = [KEY] + [
+                        col for col in node.inputs + node.outputs if col in df.columns
+                    ]
+                    copy = df[list(dict.fromkeys(copy))].copy()
+                    running[name] = executor.submit(node.run, copy, stored)
+
+                finished, _ = concurrent.futures.wait(
+                    running.values(), return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for name, future in list(running.items()):
+                    if future in finished:
+                        result, self.durations[name] = future.result()
+                        df = Scheduler.take_over(df, result, self.nodes[name].outputs)
+                        del running[name]
+
+        return df[list(dict.fromkeys(cols))]
+
+    @staticmethod
+    def take_over(df, result, cols):
+        """
+        Returns df with cols of result aligned by "Primary Key".
+        """
+        result = result.set_index(KEY)[cols].reindex(df[KEY]).set_axis(df.index)
+        existing = [col for col in cols if col in df.columns]
+        for col in existing:
+            df[col] = result[col]
+        return pd.concat([df, result.drop(columns=existing)], axis=1)
+
+    def get_critical_path(self):
+        """
+        Returns the names of the nodes on the longest chain of dependencies
+        of the last run and its duration in seconds.
+        """
+        finish, before = {}, {}
+        for name in self.order:
+            dependencies = self.dependencies[name]
+            before[name] = max(dependencies, key=finish.get, default=None)
+            finish[name] = self.durations[name] + finish.get(before[name], 0.0)
+
+        names = []
+        name = max(finish, key=finish.get, default=None)
+        seconds = finish.get(name, 0.0)
+        while name is not None:
+            names.insert(0, name)
+            name = before[name]
+        return names, seconds
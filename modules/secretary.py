@@ -1,7 +1,14 @@
+import csv
+import heapq
 import pandas as pd
 import datetime as dt
+import pickle
+import tempfile
 from pandas.errors import EmptyDataError
 
+import modules.engineer as eng
+import modules.helper as helper
+
 DIRECTORY = "./sources/data"
 
 PRODUCTION = f"{DIRECTORY}/production.csv"
@@ -14,6 +21,15 @@ PROMOTIONS = f"{DIRECTORY}/promotions.csv"
 MODEL = f"{DIRECTORY}/model.csv"
 GAMES = f"{DIRECTORY}/games.csv"
 PREDICTION = f"{DIRECTORY}/prediction.csv"
+FEATURE_STATE = f"{DIRECTORY}/feature_state.sav"
+
+
+def _deduplicate(df):
+    # the last row of each game wins, games of the same date keep a stable order
+    df.drop_duplicates(subset=["Primary Key"], keep="last", inplace=True)
+    df.sort_values(by=["Date", "Primary Key"], inplace=True)
+    df.reset_index(inplace=True, drop=True)
+    return df
 
 
 def save_base_update(df, update):
@@ -24,18 +40,138 @@ def save_base_update(df, update):
         except (EmptyDataError, FileNotFoundError):
             pass
 
-        df_new = df_old.append(df)
-        df_new.drop_duplicates(subset=["Primary Key"], keep="last", inplace=True)
-        df_new.sort_values(by=["Primary Key"], inplace=True)
-        df_new.reset_index(inplace=True, drop=True)
+        df_new = _deduplicate(df_old.append(df))
 
         df_new.to_csv(path_or_buf=BASE_UPDATE)
     else:
         df.to_csv(path_or_buf=BASE_UPDATE)
 
 
+def _new_rows(df, columns, seen):
+    # rows, whose "Primary Key" has not been seen
+    keys = df["Primary Key"]
+    keep = ~(keys.map(seen.__contains__) | keys.duplicated())
+    seen.update(keys[keep])
+    return df.loc[keep.to_numpy()].reindex(columns=columns)
+
+
+def _write_run(frames, directory, runs):
+    # writes frames sorted like _deduplicate() as one run without header
+    path = f"{directory}/{len(runs)}.csv"
+    df = pd.concat(frames).sort_values(by=["Date", "Primary Key"], kind="stable")
+    df.to_csv(path_or_buf=path, index=False, header=False)
+    runs.append(path)
+
+
+def _read_run(path):
+    with open(path, newline="") as file:
+        yield from csv.reader(file)
+
+
+def save_base_update_chunks(chunks, update, chunksize=10000):
+    # streams normalized chunks to BASE_UPDATE, peak memory is bounded by the
+    # chunk size. New games win over games of base.csv like in
+    # save_base_update(). Rows are collected in sorted runs of chunksize
+    # rows, which are merged row by row, so BASE_UPDATE is sorted like in
+    # save_base_update().
+    seen = set()
+    columns = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        runs, frames, no_of_rows = [], [], 0
+
+        def add(chunk):
+            nonlocal columns, frames, no_of_rows
+            columns = list(chunk.columns) if columns is None else columns
+            frames.append(_new_rows(chunk, columns, seen))
+            no_of_rows += len(frames[-1])
+            if no_of_rows >= chunksize:
+                _write_run(frames, directory, runs)
+                frames, no_of_rows = [], 0
+
+        for chunk in chunks:
+            add(chunk)
+
+        if update:
+            try:
+                for chunk in pd.read_csv(
+                    BASE, index_col=0, parse_dates=["Date"], chunksize=chunksize
+                ):
+                    add(chunk)
+            except (EmptyDataError, FileNotFoundError):
+                pass
+
+        if columns is None:
+            pd.DataFrame().to_csv(path_or_buf=BASE_UPDATE)
+            return
+        if no_of_rows:
+            _write_run(frames, directory, runs)
+
+        date, key = columns.index("Date"), columns.index("Primary Key")
+        rows = heapq.merge(
+            *[_read_run(path) for path in runs], key=lambda x: (x[date], x[key])
+        )
+        with open(BASE_UPDATE, "w", newline="") as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow([""] + columns)
+            for i, row in enumerate(rows):
+                writer.writerow([i] + row)
+
+
+def load_settled_games(cols):
+    # cols of games in base_update.csv with known result, base_update.csv is
+    # the store of incremental updates (see append_base_update())
+    try:
+        df = pd.read_csv(BASE_UPDATE, usecols=cols)
+    except (EmptyDataError, FileNotFoundError):
+        return pd.DataFrame(columns=cols)
+    return df.loc[df["Result"] != "UNKNOWN"]
+
+
+def append_base_update(df):
+    # updates base_update.csv in place by the games of df (e.g. new and
+    # changed games, see modules.collector.select_new_fbref_rows()). Games,
+    # which are not settled or are part of df, are replaced. Rows stay sorted
+    # like in save_base_update(), so only the rows from the first replaced or
+    # inserted game on are rewritten, settled games before stay untouched.
+    # Each row of base_update.csv is expected to be a single line.
+    df = _deduplicate(df.copy())
+    try:
+        stored = pd.read_csv(BASE_UPDATE, usecols=["Primary Key", "Result"])
+    except (EmptyDataError, FileNotFoundError):
+        df.to_csv(path_or_buf=BASE_UPDATE)
+        return
+
+    # rows are sorted by "Date" and "Primary Key", which starts with the date
+    replaced = (stored["Result"] == "UNKNOWN") | stored["Primary Key"].isin(
+        df["Primary Key"]
+    )
+    first = int(replaced.to_numpy().argmax()) if replaced.any() else len(stored)
+    if len(df):
+        inserted = stored["Primary Key"].searchsorted(df["Primary Key"].min())
+        first = min(first, int(inserted))
+
+    tail = pd.read_csv(
+        BASE_UPDATE, index_col=0, parse_dates=["Date"], skiprows=range(1, first + 1)
+    )
+    columns = list(tail.columns)
+    tail = tail.loc[
+        (tail["Result"] != "UNKNOWN") & ~tail["Primary Key"].isin(df["Primary Key"])
+    ]
+    tail = _deduplicate(pd.concat([tail, df])).reindex(columns=columns)
+    tail.index = pd.RangeIndex(first, first + len(tail))
+
+    # the header and the rows before first are kept
+    with open(BASE_UPDATE, "rb+") as file:
+        for _ in range(first + 1):
+            file.readline()
+        file.truncate(file.tell())
+    tail.to_csv(path_or_buf=BASE_UPDATE, mode="a", header=False)
+
+
 def load_base_update():
-    return pd.read_csv(BASE_UPDATE, index_col=0, parse_dates=["Date"])
+    df = pd.read_csv(BASE_UPDATE, index_col=0, parse_dates=["Date"])
+    return helper.apply_schema(df)
 
 
 def save_additional(df):
@@ -64,7 +200,8 @@ def load_promotions():
 
 
 def load_production_update():
-    return pd.read_csv(PRODUCTION_UPDATE, index_col=0, parse_dates=["Date"])
+    df = pd.read_csv(PRODUCTION_UPDATE, index_col=0, parse_dates=["Date"])
+    return helper.apply_schema(df)
 
 
 def save_production_update(df, update):
@@ -74,16 +211,31 @@ def save_production_update(df, update):
             df_old = pd.read_csv(PRODUCTION, index_col=0, parse_dates=["Date"])
         except (EmptyDataError, FileNotFoundError):
             pass
-        df_new = df_old.append(df)
-        df_new.drop_duplicates(subset=["Primary Key"], keep="last", inplace=True)
-        df_new.sort_values(by=["Primary Key"], inplace=True)
-        df_new.reset_index(inplace=True, drop=True)
+        df_new = _deduplicate(df_old.append(df))
 
         df_new.to_csv(path_or_buf=PRODUCTION_UPDATE)
     else:
         df.to_csv(path_or_buf=PRODUCTION_UPDATE)
 
 
+def save_feature_state(state):
+    # modules.engineer.FeatureState after the games of production_update.csv,
+    # saved together with modules.engineer.VERSION
+    with open(FEATURE_STATE, "wb") as file:
+        pickle.dump((eng.VERSION, state), file)
+
+
+def load_feature_state():
+    # a state saved by another modules.engineer.VERSION (or without version)
+    # would give wrong features, it is refused and has to be rebuilt by
+    # steps.step_03
+    with open(FEATURE_STATE, "rb") as file:
+        saved = pickle.load(file)
+    if not isinstance(saved, tuple) or saved[0] != eng.VERSION:
+        raise ValueError
+    return saved[1]
+
+
 def load_model():
     return pd.read_csv(MODEL, index_col=0)
 
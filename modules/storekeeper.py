@@ -0,0 +1,98 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+DIRECTORY = "./sources/store"
+
+
+def get_digest(series):
+    """
+    Returns a hash of the values of series. Any change of values, order,
+    length or dtype changes the digest, the index is ignored.
+    """
+    hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    dtype = str(series.dtype).encode()
+    return hashlib.blake2b(hashes.tobytes() + dtype, digest_size=16).hexdigest()
+
+
+def get_key(digests, params):
+    """
+    Returns a hash of the digests of the input columns (see get_digest())
+    and repr(params).
+    """
+    return hashlib.blake2b(
+        repr((list(digests), params)).encode(), digest_size=16
+    ).hexdigest()
+
+
+def _path(name, key, extension="npy"):
+    return f"{DIRECTORY}/{name} {key}.{extension}"
+
+
+def _evict(name, key, extension):
+    # only the latest entry of each name is kept, older keys are never used again
+    for file in os.listdir(DIRECTORY):
+        stem, _, other = file.rpartition(".")
+        if other == extension and stem.rsplit(" ", 1)[0] == name:
+            if stem != f"{name} {key}":
+                os.remove(f"{DIRECTORY}/{file}")
+
+
+def load(name, key):
+    """
+    Returns the values (rows x columns) stored for name and key or None,
+    if there are none.
+    """
+    path = _path(name, key)
+    if not os.path.exists(path):
+        return None
+    return np.load(path)
+
+
+def save(name, key, values):
+    """
+    Stores values (rows x columns) for name and key column by column and
+    removes the values of other keys of name.
+    """
+    os.makedirs(DIRECTORY, exist_ok=True)
+    # write to a temporary file first, so an interrupted run leaves no broken entry
+    path = _path(name, key)
+    with open(f"{path}.tmp", "wb") as file:
+        np.save(file, np.asfortranarray(values))
+    os.replace(f"{path}.tmp", path)
+    _evict(name, key, "npy")
+
+
+def load_frame(name, key):
+    """
+    Returns the frame stored for name and key or None, if there is none.
+    """
+    path = _path(name, key, "pkl")
+    if not os.path.exists(path):
+        return None
+    return pd.read_pickle(path)
+
+
+def save_frame(name, key, df):
+    """
+    Stores df for name and key and removes the frames of other keys of
+    name. Frames keep their dtypes (e.g. categories), which arrays of values
+    do not.
+    """
+    os.makedirs(DIRECTORY, exist_ok=True)
+    path = _path(name, key, "pkl")
+    df.to_pickle(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    _evict(name, key, "pkl")
+
+
+def clear():
+    """
+    Removes all stored values.
+    """
+    if os.path.isdir(DIRECTORY):
+        for file in os.listdir(DIRECTORY):
+            if file.endswith((".npy", ".pkl")):
+                os.remove(f"{DIRECTORY}/{file}")
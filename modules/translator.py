@@ -1,3 +1,4 @@
+import functools
 import os.path
 import re
 
@@ -5,6 +6,9 @@ import pandas as pd
 
 this_directory = os.path.abspath(os.path.dirname(__file__))
 
+# has to be increased, whenever categories() changes
+SCHEMA_VERSION = 1
+
 
 def fbref_com_translations():
     """
@@ -234,6 +238,39 @@ def competitions():
     return competitions
 
 
+def teams():
+    """
+    provides official team names
+
+    returns: list - official team names in alphabetical order
+    """
+    data = pd.read_excel(f"{this_directory}/translator_data.ods")
+    return sorted(data["Team"].dropna().unique())
+
+
+def categories():
+    """
+    provides the categories of categorical features (schema version
+    SCHEMA_VERSION), "UNKNOWN" is always the last category
+
+    returns: dictionary - feature identifier to categories
+    """
+    return {k: list(v) for k, v in _categories().items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _categories():
+    # translator_data.ods is read once per process, categories() returns copies
+    categories = {
+        "Team": teams(),
+        "Competition": competitions(),
+        "Season": [f"{x}-{x + 1}" for x in range(1950, 2050)],
+        "Day": list(day_ger_str_to_eng_str().values()),
+        "Kick Off": [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)],
+    }
+    return {k: v + ["UNKNOWN"] for k, v in categories.items()}
+
+
 def month_eng_str_to_int():
     """
     translates month
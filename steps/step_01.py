@@ -6,6 +6,7 @@ import time
 import bs4
 import modules.collector as coll
 import modules.helper as helper
+import modules.profiler as prof
 import modules.secretary as secr
 import modules.translator as trans
 import pandas as pd
@@ -22,12 +23,32 @@ from selenium.webdriver.common.by import By
 
 
 class DataScraper:
-    def __init__(self, teams, no_of_seasons, no_of_recursions):
+    def __init__(
+        self, teams, no_of_seasons, no_of_recursions, incremental=False, chunked=False
+    ):
         self.teams = teams
         self.no_of_seasons = no_of_seasons
         self.no_of_recursions = no_of_recursions
+        # only normalize games, which are not settled in base_update.csv yet
+        self.incremental = incremental
+        # normalize and save one team-season page at a time
+        self.chunked = chunked
 
     def scrape_base(self, teams, no_of_seasons, no_of_recursions):
+        df = pd.concat(self.scrape_base_pages(teams, no_of_seasons, no_of_recursions))
+
+        df.drop_duplicates(inplace=True)
+
+        df.sort_values(by=["Datum"], inplace=True)
+
+        df.reset_index(inplace=True, drop=True)
+
+        return df
+
+    def scrape_base_pages(self, teams, no_of_seasons, no_of_recursions):
+        # yields the match log of each team-season page, as soon as it is
+        # scraped
+
         # add adblock plus
         path_to_extension = "/home/andreas/.config/chromium/Default/Extensions/cfhdojbkjhnklbpkdaibdccddilifddb/3.14_0"
         options = Options()
@@ -49,8 +70,6 @@ class DataScraper:
 
         defective_urls = []
 
-        df = pd.DataFrame()
-
         for team, link in teams:
             url = f"https://fbref.com/de/mannschaften/{link}"
 
@@ -103,7 +122,7 @@ class DataScraper:
                         tmp["Mannschaft"] = team
                         season = soup.h1.contents[1].string[-9:]
                         tmp["Saison"] = season
-                        df = df.append(tmp)
+                        yield tmp
                         time.sleep(SLEEPY_TIME)
 
                         print(f"Scraped {driver.current_url} !")
@@ -153,21 +172,15 @@ class DataScraper:
                 print(
                     f"- Retry {len(retry)} team(s): {retry} . {no_of_recursions - 1} recursions left !"
                 )
-                df = df.append(self.scrape_base(retry, no_of_seasons, (no_of_recursions - 1)))
+                yield from self.scrape_base_pages(
+                    retry, no_of_seasons, (no_of_recursions - 1)
+                )
             else:
                 print("- Error, you should not be here. Call your admin !")
 
         print(f"- Close driver !")
         driver.quit()
 
-        df.drop_duplicates(inplace=True)
-
-        df.sort_values(by=["Datum"], inplace=True)
-
-        df.reset_index(inplace=True, drop=True)
-
-        return df
-
     def scrape_additional(self):
         base = "https://www.football-data.co.uk"
 
@@ -190,7 +203,9 @@ class DataScraper:
 
             def relevant_links(href):
                 season = "17|18|19|2|3|4|5"  # 2017-2059
-                return href and re.compile(f"^mmz4281/({season}).*{regex}.*$").search(href)
+                return href and re.compile(f"^mmz4281/({season}).*{regex}.*$").search(
+                    href
+                )
 
             links += soup.find_all(href=relevant_links)
 
@@ -227,9 +242,7 @@ class DataScraper:
                 if coach == "Trainer":
                     continue
 
-                date_format = (
-                    "(0[1-9]|[12]\d|3[01]).(0[1-9]|1[0-2]).(?!0{4})\d{4}"  # 01.01.0001 - 31.12.9999
-                )
+                date_format = "(0[1-9]|[12]\d|3[01]).(0[1-9]|1[0-2]).(?!0{4})\d{4}"  # 01.01.0001 - 31.12.9999
                 if not re.compile(f"{date_format} - {date_format}").search(date):
                     continue
 
@@ -243,40 +256,32 @@ class DataScraper:
 
         return df
 
+    @prof.profile
     def do(self):
         print("Scrape base.csv".center(40, "-"))
         print(f"{dt.datetime.now()}")
 
-        df = self.scrape_base(self.teams, self.no_of_seasons, self.no_of_recursions)
-
-        df = coll.prepare_Kick_Off(df)
-        df = coll.prepare_Result(df)
-        df = coll.prepare_Teams(df)
-        df = coll.prepare_Possesions(df)
-        df = coll.prepare_xGs(df)
-        df = coll.prepare_Goals(df)
-        df = coll.prepare_Date(df, "Datum")
-        df = coll.prepare_Matchweek(df, "Runde", "Wett")
-        df = coll.prepare_Day(df, "Tag")
-        df = coll.prepare_Season(df, "Saison")
-        df = coll.prepare_Competition(df, "Wett")
-        df = coll.prepare_Notes(df, "Hinweise")
-
-        df["Home Team"].replace(
-            helper.invert_dictionary(trans.fbref_com_translations()), inplace=True
-        )
-        df["Away Team"].replace(
-            helper.invert_dictionary(trans.fbref_com_translations()), inplace=True
-        )
-        df = coll.introduce_Primary_Key(df, "Date", "Home Team", "Away Team")
-
-        df.drop_duplicates(subset=["Primary Key"], inplace=True)
-        df.sort_values(by=["Date"], inplace=True)
-        df.reset_index(inplace=True, drop=True)
-
-        df = df[trans.fbref_com_features().keys()]
-
-        secr.save_base_update(df, True)
+        if self.incremental:
+            df = self.scrape_base(self.teams, self.no_of_seasons, self.no_of_recursions)
+
+            no_of_rows = len(df)
+            settled = secr.load_settled_games(coll.SETTLED_COLUMNS)
+            df = coll.select_new_fbref_rows(df, settled)
+            print(f"- Normalize {len(df)} of {no_of_rows} scraped rows !")
+
+            # only new and changed games are normalized and written
+            df = coll.normalize_fbref_frame(df)
+            secr.append_base_update(df)
+        elif self.chunked:
+            # pages are normalized and saved while scraping
+            pages = self.scrape_base_pages(
+                self.teams, self.no_of_seasons, self.no_of_recursions
+            )
+            secr.save_base_update_chunks(coll.normalize_fbref_chunks(pages), True)
+        else:
+            df = self.scrape_base(self.teams, self.no_of_seasons, self.no_of_recursions)
+            df = coll.normalize_fbref_frame(df)
+            secr.save_base_update(df, True)
 
         print(f"{dt.datetime.now()}")
         print("Scrape base.csv".center(40, "-"))
@@ -2,6 +2,7 @@ import pandas as pd
 import datetime as dt
 import random
 
+import modules.profiler as prof
 import modules.secretary as secr
 import modules.translator as trans
 import modules.visualizer as vis
@@ -11,6 +12,7 @@ class DataMonitor:
     def __init__(self):
         pass
 
+    @prof.profile
     def do(self):
         base = secr.load_base_update()
         additional = secr.load_additional()
@@ -1,15 +1,109 @@
 import datetime as dt
 
 import modules.engineer as eng
+import modules.features as feat
+import modules.profiler as prof
+import modules.scheduler as sched
 import modules.secretary as secr
 import modules.translator as trans
 
 
 class ProductionMaker:
-    def __init__(self, starting_season):
+    def __init__(self, starting_season, workers=1, offset=3):
         self.starting_season = starting_season
-        pass
+        # processes computing the rolling features, nodes run in one thread,
+        # because threads do not speed up the nodes holding the GIL
+        self.workers = workers
+        # of add_Coach_Substituted_Within_Last_OFFSET_Games() and
+        # add_Current_Position_Before_Matchday() (see modules.engineer)
+        self.offset = offset
 
+    def nodes_all_competitions(self):
+        days = ["Home Days Since Last Game", "Away Days Since Last Game"]
+        return [
+            sched.Node(
+                "Days Since Last Game",
+                eng.add_Days_Since_Last_Game,
+                ["Home Team", "Away Team", "Date"],
+                days + ["Date"],
+            ),
+            sched.Node(
+                "Maximum Days Since Last Game",
+                eng.set_maximum,
+                days,
+                days,
+                args=("Days Since Last Game", 21),
+            ),
+        ]
+
+    def nodes(self, coaches, promotions):
+        teams = ["Home Team", "Away Team"]
+        coach = ["Home Coach", "Away Coach"]
+        points_goals = ["Home Points", "Away Points", "Home Goals", "Away Goals"]
+        stats = dict.fromkeys(
+            stat for _, _, stat, _, _ in feat.rolling_plan(feat.num_features())
+        )
+        stats = [f"{venue} {stat}" for stat in stats for venue in ["Home", "Away"]]
+        rolling = [
+            feature
+            for feature in feat.num_features()
+            if feat.parse_rolling_feature(feature)
+        ]
+        return [
+            sched.Node(
+                "Coach", eng.add_Coach, teams + ["Date"], coach, args=(coaches,)
+            ),
+            sched.Node(
+                "Coach Substituted",
+                eng.add_Coach_Substituted_Within_Last_OFFSET_Games,
+                teams + coach + ["Season"],
+                [
+                    f"{venue} Coach Substituted Within Last {self.offset} Games"
+                    for venue in ["Home", "Away"]
+                ],
+                args=(self.offset,),
+            ),
+            sched.Node(
+                "Points", eng.add_Points, ["Result"], ["Home Points", "Away Points"]
+            ),
+            sched.Node(
+                "Promoted",
+                eng.add_Promoted_Last_Year,
+                teams + ["Season"],
+                ["Home Promoted Last Year", "Away Promoted Last Year"],
+                args=(promotions,),
+            ),
+            sched.Node(
+                "Kick Off",
+                eng.add_Kick_Off_Before_17_00,
+                ["Kick Off"],
+                ["Kick Off Before 17:00"],
+            ),
+            sched.Node(
+                "Current Position",
+                eng.add_Current_Position_Before_Matchday,
+                teams + points_goals + ["Season", "Competition", "Matchweek"],
+                points_goals
+                + [
+                    f"{venue} Current Position Before Matchday"
+                    for venue in ["Home", "Away"]
+                ],
+                args=(self.offset,),
+            ),
+            # rolling families are stored by the engineer itself (see
+            # modules.storekeeper)
+            sched.Node(
+                "Rolling",
+                eng.add_Rolling_FEATs_By_Name,
+                teams + ["Season"] + stats,
+                stats + list(dict.fromkeys(rolling)),
+                args=(feat.num_features(),),
+                kwargs={"stored": True, "workers": self.workers},
+                stored=False,
+            ),
+        ]
+
+    @prof.profile
     def do(self):
         print(f"Start: {dt.datetime.now()}")
 
@@ -24,54 +118,30 @@ class ProductionMaker:
         df = df.loc[df["Season"].isin(seasons)]
         df = df.loc[df["Result"] != "UNKNOWN"]
 
+        # nodes identify games by "Primary Key" (see modules.scheduler)
+        df = df.drop_duplicates(subset=["Primary Key"], keep="first")
         df.sort_values(by=["Primary Key"], inplace=True)
         df.reset_index(inplace=True, drop=True)
 
-        df = eng.add_Days_Since_Last_Game(df)
-        df = eng.set_maximum(df, "Days Since Last Game", 21)
+        # rest days count games of all competitions
+        schedulers = [sched.Scheduler(self.nodes_all_competitions())]
+        df = schedulers[0].run(df, stored=True)
         df = df.loc[df["Competition"].isin(trans.competitions())]
         df.reset_index(inplace=True, drop=True)
-        df = eng.add_Coach(df, coaches)
-        df = eng.add_Coach_Substituted_Within_Last_OFFSET_Games(df, 3)
-        df = eng.add_Points(df)
-        df = eng.add_Promoted_Last_Year(df, promotions)
-        df = eng.add_Kick_Off_Before_17_00(df)
-        df = eng.add_Current_Position_Before_Matchday(df, 3)
+        schedulers.append(sched.Scheduler(self.nodes(coaches, promotions)))
+        df = schedulers[1].run(df, stored=True)
 
-        features = [
-            "xG",
-            "Possesion",
-            "Goals",
-            "Shots",
-            "Shots on Target",
-            "Fouls Committed",
-            "Corners",
-            "Yellow Cards",
-            "Red Cards",
-            "Points",
-        ]
-
-        for feature in features:
-            offset = 3
-            df = eng.add_MA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_EWMA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_EWMA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MAX_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MAX_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MIN_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MIN_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-
-            offset = 5
-            df = eng.add_MA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_EWMA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_EWMA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MAX_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MAX_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MIN_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
-            df = eng.add_MIN_FEAT_Against_Last_OFFSET_Games_Before_Matchday(df, feature, offset)
+        # the longest chains of nodes bound the duration of the runs
+        critical_paths = [scheduler.get_critical_path() for scheduler in schedulers]
+        for names, seconds in critical_paths:
+            print(f"Critical path: {' -> '.join(names)} ({seconds:.2f}s)")
 
         secr.save_production_update(df, True)
 
+        # state after the games of the seasons for predictions (see step_07)
+        state = eng.FeatureState(feat.num_features(), self.offset)
+        state.update(df.copy())
+        secr.save_feature_state(state)
+
         print(f"Stop: {dt.datetime.now()}")
+        return critical_paths
@@ -1,3 +1,4 @@
+import modules.profiler as prof
 import modules.secretary as secr
 import modules.visualizer as vis
 import modules.engineer as eng
@@ -7,6 +8,7 @@ class ProductionMonitor:
     def __init__(self):
         pass
 
+    @prof.profile
     def do(self):
         production = secr.load_production_update()
 
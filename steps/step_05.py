@@ -3,6 +3,7 @@ import pickle
 
 import modules.features as feat
 import modules.helper as helper
+import modules.profiler as prof
 from sklearn.compose import ColumnTransformer
 from sklearn.metrics import classification_report, make_scorer
 from sklearn.model_selection import GridSearchCV
@@ -19,6 +20,7 @@ class ModelMaker:
         self.models = models
         self.testrun = testrun
 
+    @prof.profile
     def do(self):
         print(f"Start: {dt.datetime.now()}")
         print()
@@ -1,9 +1,9 @@
 import datetime as dt
-import re
 
 import bs4
 import modules.collector as coll
 import modules.helper as helper
+import modules.profiler as prof
 import modules.secretary as secr
 import modules.translator as trans
 import pandas as pd
@@ -55,7 +55,7 @@ class GamesScraper:
                         if game.find("span", text="postponed"):
                             continue
 
-                        if not re.compile(r"^\d{2}:\d{2}$").search(
+                        if not coll.REGEX_KICK_OFF.search(
                             game.find("span", {"class": "time"}).string
                         ):
                             continue
@@ -147,6 +147,7 @@ class GamesScraper:
 
         return df
 
+    @prof.profile
     def do(self):
         df = self.scrape_games(self.matchweeks, self.season, self.year)
 
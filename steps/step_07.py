@@ -1,6 +1,10 @@
 import datetime as dt
 
+import numpy as np
+
 import modules.engineer as eng
+import modules.profiler as prof
+import modules.scheduler as sched
 import modules.secretary as secr
 import modules.translator as trans
 
@@ -9,56 +13,61 @@ class PredictionMaker:
     def __init__(self, current_season):
         self.current_season = current_season
 
+    def nodes(self, coaches, promotions):
+        teams = ["Home Team", "Away Team"]
+        return [
+            sched.Node(
+                "Coach",
+                eng.add_Coach,
+                teams + ["Date"],
+                ["Home Coach", "Away Coach"],
+                args=(coaches,),
+            ),
+            sched.Node(
+                "Points", eng.add_Points, ["Result"], ["Home Points", "Away Points"]
+            ),
+            sched.Node(
+                "Promoted",
+                eng.add_Promoted_Last_Year,
+                teams + ["Season"],
+                ["Home Promoted Last Year", "Away Promoted Last Year"],
+                args=(promotions,),
+            ),
+            sched.Node(
+                "Kick Off",
+                eng.add_Kick_Off_Before_17_00,
+                ["Kick Off"],
+                ["Kick Off Before 17:00"],
+            ),
+        ]
+
+    @prof.profile
     def do(self):
         print(f"Start: {dt.datetime.now()}")
 
-        production = secr.load_production_update()
         games = secr.load_games()
         coaches = secr.load_coaches()
         promotions = secr.load_promotions()
+        state = secr.load_feature_state()
 
-        df = production.append(games)
-        df.reset_index(inplace=True, drop=True)
-
-        df = df.loc[df["Season"] == self.current_season]
+        df = games.loc[games["Season"] == self.current_season]
+        df = df.loc[df["Competition"].isin(trans.competitions())]
+        df = df.assign(Result=np.nan)
 
+        # nodes identify games by "Primary Key" (see modules.scheduler)
+        df = df.drop_duplicates(subset=["Primary Key"], keep="first")
         df.sort_values(by=["Primary Key"], inplace=True)
         df.reset_index(inplace=True, drop=True)
 
-        df = eng.add_Days_Since_Last_Game(df)
+        df = sched.Scheduler(self.nodes(coaches, promotions)).run(df)
+        # features of earlier games from the state of the production data
+        # instead of rebuilding the season, the state is not saved, because
+        # the games are not played yet
+        df = state.update(df)
         df = eng.set_maximum(df, "Days Since Last Game", 21)
-        df = df.loc[df["Competition"].isin(trans.competitions())]
-        df.reset_index(inplace=True, drop=True)
-        df = eng.add_Coach(df, coaches)
-        df = eng.add_Coach_Substituted_Within_Last_OFFSET_Games(df, 3)
-        df = eng.add_Points(df)
-        df = eng.add_Promoted_Last_Year(df, promotions)
-        df = eng.add_Kick_Off_Before_17_00(df)
-        df = eng.add_Current_Position_Before_Matchday(df, 3)
-        features = [
-            "xG",
-            "Possesion",
-            "Goals",
-            "Shots",
-            "Shots on Target",
-            "Fouls Committed",
-            "Corners",
-            "Yellow Cards",
-            "Red Cards",
-            "Points",
-        ]
-        for feature in features:
-            df = eng.add_MA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, 3)
-            df = eng.add_MA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(
-                df, feature, 3
-            )
-            df = eng.add_EWMA_FEAT_Last_OFFSET_Games_Before_Matchday(df, feature, 3)
-            df = eng.add_EWMA_FEAT_Against_Last_OFFSET_Games_Before_Matchday(
-                df, feature, 3
-            )
 
-        df = df.loc[df["Result"].isnull()]
-        df = eng.prepare_for_model(df)
+        # same offset as the production data (see step_03)
+        df = eng.prepare_for_model(df, state.offset)
         df.reset_index(inplace=True, drop=True)
         df.drop(columns=["Result"], inplace=True, errors="ignore")
 
@@ -1,5 +1,6 @@
 import datetime as dt
 
+import modules.profiler as prof
 import modules.secretary as secr
 
 
@@ -7,6 +8,7 @@ class PredictionMonitor:
     def __init__(self):
         pass
 
+    @prof.profile
     def do(self):
         print(f"Stop: {dt.datetime.now()}")
 
@@ -1,6 +1,7 @@
 import datetime as dt
 
 import modules.features as feat
+import modules.profiler as prof
 import modules.secretary as secr
 
 
@@ -9,6 +10,7 @@ class PredictionMaker:
         self.models = models
         pass
 
+    @prof.profile
     def do(self):
         print(f"Start: {dt.datetime.now()}")
 
@@ -22,9 +24,9 @@ class PredictionMaker:
 
         for key, model in self.models.items():
             df[key] = model.predict(df)
-            df[
-                [f"{key}_proba_a", f"{key}_proba_d", f"{key}_proba_h"]
-            ] = model.predict_proba(df)
+            df[[f"{key}_proba_a", f"{key}_proba_d", f"{key}_proba_h"]] = (
+                model.predict_proba(df)
+            )
             df[[f"{key}_proba_a", f"{key}_proba_d", f"{key}_proba_h"]] = df[
                 [f"{key}_proba_a", f"{key}_proba_d", f"{key}_proba_h"]
             ].round(6)
@@ -0,0 +1,95 @@
+"""
+Throughput benchmark of modules/collector.py on synthetic raw match logs of
+tests/benchmarks/generator.py. For each prepare_* function and for the full
+normalization chain of steps.step_01.DataScraper.do() rows/sec (best of
+--repeat runs) and peak memory (separate run traced by tracemalloc) are
+reported, so regressions become visible.
+
+Usage (from the repository root):
+
+    python -m tests.benchmarks.bench_collector
+    python -m tests.benchmarks.bench_collector --rows 1000 100000 --repeat 5
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import modules.collector as coll
+from tests.benchmarks.generator import fbref_match_log
+
+ROWS = [1000, 10000, 100000, 1000000]
+
+BENCHMARKS = {
+    "prepare_Kick_Off": lambda df: coll.prepare_Kick_Off(df),
+    "prepare_Result": lambda df: coll.prepare_Result(df),
+    "prepare_Teams": lambda df: coll.prepare_Teams(df),
+    "prepare_Possesions": lambda df: coll.prepare_Possesions(df),
+    "prepare_xGs": lambda df: coll.prepare_xGs(df),
+    "prepare_Goals": lambda df: coll.prepare_Goals(df),
+    "prepare_Date": lambda df: coll.prepare_Date(df, "Datum"),
+    "prepare_Matchweek": lambda df: coll.prepare_Matchweek(df, "Runde", "Wett"),
+    "prepare_Day": lambda df: coll.prepare_Day(df, "Tag"),
+    "prepare_Season": lambda df: coll.prepare_Season(df, "Saison"),
+    "prepare_Competition": lambda df: coll.prepare_Competition(df, "Wett"),
+    "prepare_Notes": lambda df: coll.prepare_Notes(df, "Hinweise"),
+    "normalize_fbref_frame": lambda df: coll.normalize_fbref_frame(df),
+}
+
+
+def measure(func, df, repeat):
+    """
+    Measures func on a copy of df for each run, because most of the prepare_*
+    functions work inplace.
+
+    Returns
+    -------
+    rows_per_sec : float
+        best of repeat runs
+    peak : integer
+        peak memory in bytes traced by tracemalloc
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        data = df.copy()
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+
+    data = df.copy()
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(df) / best, peak
+
+
+def run(rows, repeat, names):
+    results = []
+    for no_of_rows in rows:
+        df = fbref_match_log(no_of_rows)
+        for name in names:
+            rows_per_sec, peak = measure(BENCHMARKS[name], df, repeat)
+            results.append((name, no_of_rows, rows_per_sec, peak))
+            print(
+                f"{name:<24}{no_of_rows:>10}{rows_per_sec:>16,.0f}{peak / 2**20:>14.1f}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks modules/collector.py.")
+    parser.add_argument("--rows", type=int, nargs="+", default=ROWS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--only", nargs="+", choices=BENCHMARKS.keys(), default=BENCHMARKS.keys()
+    )
+    args = parser.parse_args()
+
+    print(f"{'Function':<24}{'Rows':>10}{'Rows/sec':>16}{'Peak (MiB)':>14}")
+    run(args.rows, args.repeat, list(args.only))
+
+
+if __name__ == "__main__":
+    main()
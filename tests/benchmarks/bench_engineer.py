@@ -0,0 +1,77 @@
+"""
+Scaling benchmark of modules/engineer.py on synthetic league seasons of
+tests/benchmarks/generator.py. For the per-team features rows/sec (best of
+--repeat runs) are reported for a growing number of seasons. The runtime
+should grow linearly with the rows, so rows/sec stays about the same,
+while it drops for an algorithm quadratic in the rows.
+
+Usage (from the repository root):
+
+    python -m tests.benchmarks.bench_engineer
+    python -m tests.benchmarks.bench_engineer --seasons 2 8 --repeat 5
+"""
+
+import argparse
+import functools
+import time
+
+import modules.engineer as eng
+from tests.benchmarks.generator import league_seasons
+
+SEASONS = [2, 8, 32]
+
+BENCHMARKS = {
+    "add_Days_Since_Last_Game": lambda df: eng.add_Days_Since_Last_Game(df),
+    "add_Coach_Substituted": functools.partial(
+        eng.add_Coach_Substituted_Within_Last_OFFSET_Games, offset=3
+    ),
+    "add_Rolling_FEATs": lambda df: eng.add_Rolling_FEATs_Before_Matchday(
+        df, ["Test"], [3, 5]
+    ),
+}
+
+
+def measure(func, df, repeat):
+    """
+    Measures func on a copy of df for each run.
+
+    Returns
+    -------
+    rows_per_sec : float
+        best of repeat runs
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        data = df.copy()
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return len(df) / best
+
+
+def run(seasons, repeat, names):
+    results = []
+    for no_of_seasons in seasons:
+        df = league_seasons(no_of_seasons)
+        for name in names:
+            rows_per_sec = measure(BENCHMARKS[name], df, repeat)
+            results.append((name, no_of_seasons, len(df), rows_per_sec))
+            print(f"{name:<28}{no_of_seasons:>8}{len(df):>10}{rows_per_sec:>16,.0f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks modules/engineer.py.")
+    parser.add_argument("--seasons", type=int, nargs="+", default=SEASONS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--only", nargs="+", choices=BENCHMARKS.keys(), default=BENCHMARKS.keys()
+    )
+    args = parser.parse_args()
+
+    print(f"{'Function':<28}{'Seasons':>8}{'Rows':>10}{'Rows/sec':>16}")
+    run(args.seasons, args.repeat, list(args.only))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+import modules.translator as trans
+
+KICK_OFFS = [
+    "13:30 (14:30)",
+    "15:30",
+    "15:30",
+    "15:30",
+    "17:30",
+    "18:30 (19:30)",
+    "20:45",
+]
+CUP_ROUNDS = [
+    "1. Runde",
+    "2. Runde",
+    "Achtelfinale",
+    "Viertelfinale",
+    "Halbfinale",
+    "Finale",
+]
+NOTES = ["Spiel verschoben", "Spiel abgesagt", "Spiel abgebrochen"]
+
+
+def fbref_match_log(no_of_rows, seed=42):
+    """
+    Generates a synthetic raw match log like www.fbref.com delivers it to
+    steps.step_01.DataScraper.scrape_base(). Each game is generated once and
+    results in two consistent rows, one from the home team ("Spielort" is
+    "Heim") and one from the away team ("Auswärts"). About 5 % of the games
+    are not played yet, cup games can be decided by penalties and rows are
+    shuffled like pages of different teams and seasons.
+
+    Parameters
+    ----------
+    no_of_rows : integer
+    seed : integer
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    n = (no_of_rows + 1) // 2
+
+    translations = trans.fbref_com_translations()
+    teams = np.array(list(translations.keys()), dtype=object)
+    identifiers = np.array(list(translations.values()), dtype=object)
+
+    home = rng.integers(0, len(teams), n)
+    away = (home + rng.integers(1, len(teams), n)) % len(teams)
+
+    year = rng.integers(2000, 2023, n)
+    day_of_season = rng.integers(0, 280, n)
+    dates = pd.to_datetime(pd.Series(year).astype(str) + "-08-01") + pd.to_timedelta(
+        day_of_season, unit="D"
+    )
+
+    competitions = np.array(
+        trans.competitions() + ["DFB-Pokal", "Champions Lg"], dtype=object
+    )
+    competition = competitions[
+        rng.choice(len(competitions), n, p=[0.18] * 5 + [0.05, 0.05])
+    ]
+    league = np.isin(competition, trans.competitions())
+    matchweek = np.minimum(day_of_season // 7 + 1, 38)
+    cup_round = np.array(CUP_ROUNDS, dtype=object)[rng.integers(0, len(CUP_ROUNDS), n)]
+    rounds = np.where(
+        league, "Spielwoche " + pd.Series(matchweek).astype(str), cup_round
+    )
+
+    played = rng.random(n) > 0.05
+    goals_home = rng.poisson(1.5, n)
+    goals_away = rng.poisson(1.2, n)
+    penalties = ~league & (goals_home == goals_away) & (rng.random(n) < 0.5)
+    penalties_home = rng.integers(2, 6, n)
+    penalties_away = np.where(penalties_home == 5, 3, 5)
+    xg_home = np.round(rng.gamma(2.0, 0.75, n), 1)
+    xg_away = np.round(rng.gamma(2.0, 0.6, n), 1)
+    possesion_home = rng.integers(25, 76, n).astype(float)
+
+    result_home = np.where(
+        goals_home > goals_away, "S", np.where(goals_home < goals_away, "N", "U")
+    ).astype(object)
+    result_home[penalties] = np.where(penalties_home > penalties_away, "S", "N")[
+        penalties
+    ]
+    result_away = pd.Series(result_home).map({"S": "N", "U": "U", "N": "S"}).to_numpy()
+
+    def goals(goals, penalties_goals):
+        result = goals.astype(object)
+        result[penalties] = [
+            f"{g} ({p})" for g, p in zip(goals[penalties], penalties_goals)
+        ]
+        return result
+
+    tf_home = goals(goals_home, penalties_home[penalties])
+    tf_away = goals(goals_away, penalties_away[penalties])
+
+    notes = np.full(n, np.nan, dtype=object)
+    noted = rng.random(n) < 0.01
+    notes[noted] = np.array(NOTES, dtype=object)[
+        rng.integers(0, len(NOTES), noted.sum())
+    ]
+
+    def nullify(values):
+        values = values.astype(object)
+        values[~played] = np.nan
+        return values
+
+    common = {
+        "Datum": dates.dt.strftime("%d.%m.%Y").to_numpy(),
+        "Uhrzeit": np.array(KICK_OFFS, dtype=object)[
+            rng.integers(0, len(KICK_OFFS), n)
+        ],
+        "Wett": competition,
+        "Runde": rounds,
+        "Tag": dates.dt.dayofweek.map(trans.day_int_to_ger_str()).to_numpy(),
+        "Zuschauer": rng.integers(5000, 80000, n),
+        "Schiedsrichter": "Felix Brych",
+        "Spielbericht": "Spielbericht",
+        "Hinweise": notes,
+        "Saison": pd.Series(year).astype(str) + "-" + pd.Series(year + 1).astype(str),
+    }
+    rows_home = pd.DataFrame(
+        data={
+            **common,
+            "Spielort": "Heim",
+            "Ergebnis": nullify(result_home),
+            "Tf": nullify(tf_home),
+            "Tk": nullify(tf_away),
+            "Gegner": identifiers[away],
+            "xG": nullify(xg_home),
+            "xGA": nullify(xg_away),
+            "Besitz": nullify(possesion_home),
+            "Mannschaft": teams[home],
+        }
+    )
+    rows_away = pd.DataFrame(
+        data={
+            **common,
+            "Spielort": "Auswärts",
+            "Ergebnis": nullify(result_away),
+            "Tf": nullify(tf_away),
+            "Tk": nullify(tf_home),
+            "Gegner": identifiers[home],
+            "xG": nullify(xg_away),
+            "xGA": nullify(xg_home),
+            "Besitz": nullify(100 - possesion_home),
+            "Mannschaft": teams[away],
+        }
+    )
+
+    df = pd.concat([rows_home, rows_away], ignore_index=True).iloc[:no_of_rows]
+    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return df
+
+
+def league_seasons(no_of_seasons, no_of_teams=18, seed=42):
+    """
+    Generates complete synthetic league seasons as modules/engineer.py
+    expects them, every team plays once per matchweek. Coaches ("A", "B" or
+    "C") and "Test" values are random per team and game.
+
+    Parameters
+    ----------
+    no_of_seasons : integer
+    no_of_teams : integer
+    seed : integer
+
+    Returns
+    -------
+    df : pandas.core.frame.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    teams = np.array([f"Team {x}" for x in range(no_of_teams)], dtype=object)
+    rows = []
+    for season in range(no_of_seasons):
+        for matchweek in range(2 * (no_of_teams - 1)):
+            date = dt.datetime(2000 + season, 8, 1) + dt.timedelta(days=7 * matchweek)
+            pairs = rng.permutation(no_of_teams).reshape(-1, 2)
+            for home, away in teams[pairs]:
+                rows.append((date, home, away, f"{2000 + season}-{2001 + season}"))
+
+    df = pd.DataFrame(data=rows, columns=["Date", "Home Team", "Away Team", "Season"])
+    df["Primary Key"] = (
+        df["Date"].dt.strftime("%Y-%m-%d") + df["Home Team"] + df["Away Team"]
+    )
+    for side in ["Home", "Away"]:
+        df[f"{side} Coach"] = rng.choice(["A", "B", "C"], len(df))
+        df[f"{side} Test"] = rng.random(len(df))
+    return df
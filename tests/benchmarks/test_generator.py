@@ -0,0 +1,38 @@
+import pandas as pd
+
+import modules.collector as coll
+from tests.benchmarks import bench_collector, bench_engineer
+from tests.benchmarks.generator import fbref_match_log, league_seasons
+
+
+def test_fbref_match_log():
+    df = fbref_match_log(1001)
+    assert len(df) == 1001
+    pd.testing.assert_frame_equal(df, fbref_match_log(1001))
+
+    result = coll.normalize_fbref_frame(df)
+    assert len(result) == 501
+    assert result["Primary Key"].is_unique
+    assert coll.validate_fbref_frame(df).empty
+
+
+def test_bench_collector():
+    results = bench_collector.run([100], 1, list(bench_collector.BENCHMARKS.keys()))
+    assert len(results) == len(bench_collector.BENCHMARKS)
+    assert all(rows_per_sec > 0 and peak > 0 for _, _, rows_per_sec, peak in results)
+
+
+def test_league_seasons():
+    df = league_seasons(2, 6)
+    assert len(df) == 2 * 10 * 3
+    assert df["Primary Key"].is_unique
+    pd.testing.assert_frame_equal(df, league_seasons(2, 6))
+
+    games = df.groupby(by=["Season", "Date"]).size()
+    assert (games == 3).all()
+
+
+def test_bench_engineer():
+    results = bench_engineer.run([1], 1, list(bench_engineer.BENCHMARKS.keys()))
+    assert len(results) == len(bench_engineer.BENCHMARKS)
+    assert all(rows_per_sec > 0 for _, _, _, rows_per_sec in results)
@@ -346,6 +346,16 @@ def test_prepare_Date():
         df = pd.DataFrame(data=data)
         df = coll.prepare_Date(df, "Datum")
 
+    with pytest.raises(ValueError):
+        data = {"Datum": ["01.01.2022", " 1.01.2022"]}
+        df = pd.DataFrame(data=data)
+        df = coll.prepare_Date(df, "Datum")
+
+    with pytest.raises(ValueError):
+        data = {"Datum": ["31.02.2022"]}
+        df = pd.DataFrame(data=data)
+        df = coll.prepare_Date(df, "Datum")
+
     data = {"Datum": ["01.01.2022", "01/01/2022", "01/01/22", np.nan]}
     df = pd.DataFrame(data=data)
     result = [
@@ -572,3 +582,224 @@ def test_introduce_Primary_Key():
     ]
     for value, result in zip(df["Primary Key"], result):
         assert value == result
+
+
+def test_normalize_fbref_frame():
+    data = {
+        "Datum": ["19.08.2017", "19.08.2017"],
+        "Uhrzeit": ["15:30", "15:30"],
+        "Runde": ["Spielwoche 1", "Spielwoche 1"],
+        "Wett": ["Bundesliga", "Bundesliga"],
+        "Tag": ["Sa.", "Sa."],
+        "Spielort": ["Heim", "Auswärts"],
+        "Ergebnis": ["N", "S"],
+        "Tf": [0, 3],
+        "Tk": [3, 0],
+        "Gegner": ["Borussia Dortmund", "VfL Wolfsburg"],
+        "xG": [0.5, 2.1],
+        "xGA": [2.1, 0.5],
+        "Besitz": [40, 60],
+        "Hinweise": [np.nan, np.nan],
+        "Mannschaft": ["VfL Wolfsburg", "Borussia Dortmund"],
+        "Saison": ["2017-2018", "2017-2018"],
+    }
+
+    with pytest.raises(KeyError):
+        df = pd.DataFrame(data=data).drop(columns=["Tag"])
+        df = coll.normalize_fbref_frame(df)
+
+    with pytest.raises(ValueError):
+        df = pd.DataFrame(data=data)
+        df.at[1, "Spielort"] = "XXX"
+        df = coll.normalize_fbref_frame(df)
+
+    df = pd.DataFrame(data=data)
+    result = coll.normalize_fbref_frame(df)
+
+    assert len(df.columns) == 16
+    assert len(result) == 1
+
+    game = result.iloc[0]
+    assert game["Primary Key"] == "2017-08-19VfL WolfsburgBorussia Dortmund"
+    assert game["Result"] == "A"
+    assert game["Home Goals"] == 0.0
+    assert game["Away Goals"] == 3.0
+    assert game["Home Possesion"] == 40.0
+    assert game["Away Possesion"] == 60.0
+    assert game["Matchweek"] == 1.0
+    assert game["Day"] == "SA"
+    assert game["Notes"] == "UNKNOWN"
+
+
+def test_mirror_venue():
+    data = {
+        "Team": ["Borussia Dortmund", "VfL Wolfsburg", "SC Freiburg"],
+        "Opponent": ["VfL Wolfsburg", "FC Bayern München", "Borussia Dortmund"],
+        "Tf": [1.0, 2.0, 0.0],
+        "Tk": [0.0, 3.0, 4.0],
+    }
+    df = pd.DataFrame(data=data)
+    home = pd.Series([True, False, True])
+
+    with pytest.raises(KeyError):
+        coll.mirror_venue(df, home, {"Goals": ("Tf", "col")})
+
+    pairs = {"Team": ("Team", "Opponent"), "Goals": ("Tf", "Tk")}
+    result = coll.mirror_venue(df, home, pairs)
+
+    assert list(result.columns) == [
+        "Home Team",
+        "Away Team",
+        "Home Goals",
+        "Away Goals",
+    ]
+    assert list(result["Home Team"]) == [
+        "Borussia Dortmund",
+        "FC Bayern München",
+        "SC Freiburg",
+    ]
+    assert list(result["Away Team"]) == [
+        "VfL Wolfsburg",
+        "VfL Wolfsburg",
+        "Borussia Dortmund",
+    ]
+    assert list(result["Home Goals"]) == [1.0, 3.0, 0.0]
+    assert list(result["Away Goals"]) == [0.0, 2.0, 4.0]
+
+
+def test_prepare_Goals_errors_collect():
+    data = {
+        "Tf": [1, "x", 2, 0],
+        "Tk": [0, 1, "1 (4)", 3],
+        "Spielort": ["Heim", "Auswärts", "XXX", "Auswärts"],
+    }
+
+    with pytest.raises(ValueError):
+        df = pd.DataFrame(data=data)
+        df = coll.prepare_Goals(df, errors="XXX")
+
+    with pytest.raises(ValueError):
+        df = pd.DataFrame(data=data)
+        df = coll.prepare_Goals(df)
+
+    df = pd.DataFrame(data=data)
+    df, report = coll.prepare_Goals(df, errors="collect")
+
+    assert list(report.columns) == coll.REPORT_COLUMNS
+    assert list(report["Row"]) == [2, 1]
+    assert list(report["Column"]) == ["Spielort", "Tf"]
+    assert list(report["Value"]) == ["XXX", "x"]
+
+    assert list(df["Home Goals"]) == [1.0, 1.0, -1.0, 3.0]
+    assert list(df["Away Goals"]) == [0.0, -1.0, -1.0, 0.0]
+
+
+def test_validate_fbref_frame():
+    data = {
+        "Datum": ["19.08.2017", "31.02.2017", "19/08/17"],
+        "Uhrzeit": ["15:30", "15:30", "3 pm"],
+        "Runde": ["Spielwoche 1", "Spielwoche 1", "Achtelfinale"],
+        "Wett": ["Bundesliga", "Bundesliga", "Bundesliga"],
+        "Tag": ["Sa.", "Sa.", "Sa."],
+        "Spielort": ["Heim", "Auswärts", "Heim"],
+        "Ergebnis": ["N", "S", "X"],
+        "Tf": [0, 3, 1],
+        "Tk": [3, 0, 1],
+        "Gegner": ["Borussia Dortmund", "VfL Wolfsburg", "SC Freiburg"],
+        "xG": [0.5, 2.1, 1.0],
+        "xGA": [2.1, 0.5, 1.0],
+        "Besitz": [40, 60, 50],
+        "Hinweise": [np.nan, np.nan, np.nan],
+        "Mannschaft": ["VfL Wolfsburg", "Borussia Dortmund", "FC Augsburg"],
+        "Saison": ["2017-2018", "2017-2018", "2017-2019"],
+    }
+
+    with pytest.raises(KeyError):
+        df = pd.DataFrame(data=data).drop(columns=["Wett"])
+        coll.validate_fbref_frame(df)
+
+    df = pd.DataFrame(data=data)
+    report = coll.validate_fbref_frame(df)
+
+    assert len(report) == 5
+    assert list(report["Row"]) == [2, 2, 1, 2, 2]
+    assert list(report["Column"]) == ["Uhrzeit", "Ergebnis", "Datum", "Runde", "Saison"]
+
+    assert coll.validate_fbref_frame(df.loc[[0]]).empty
+
+    with pytest.raises(ValueError):
+        coll.normalize_fbref_frame(df)
+
+    result, report = coll.normalize_fbref_frame(df, errors="collect")
+    assert len(report) == 5
+    assert list(result["Primary Key"]) == ["2017-08-19VfL WolfsburgBorussia Dortmund"]
+
+    # a game without date has no "Primary Key", rows may share labels
+    df = pd.concat([df.loc[[0]], df.loc[[0]].assign(Datum=np.nan)])
+    report = coll.validate_fbref_frame(df)
+    assert list(report["Column"]) == ["Datum"]
+    assert list(report["Row"]) == [0]
+
+    with pytest.raises(ValueError):
+        coll.normalize_fbref_frame(df)
+
+    result, report = coll.normalize_fbref_frame(df, errors="collect")
+    assert len(report) == 1
+    assert list(result["Primary Key"]) == ["2017-08-19VfL WolfsburgBorussia Dortmund"]
+
+
+def test_select_new_fbref_rows():
+    data = {
+        "Datum": ["19.08.2017", "19.08.2017", "26.08.2017"],
+        "Spielort": ["Heim", "Auswärts", "Auswärts"],
+        "Gegner": ["Borussia Dortmund", "VfL Wolfsburg", "Hertha BSC"],
+        "Mannschaft": ["VfL Wolfsburg", "Borussia Dortmund", "Borussia Dortmund"],
+        "Ergebnis": ["N", "S", np.nan],
+        "Tf": [0, 3, np.nan],
+        "Tk": [3, 0, np.nan],
+        "xG": [0.5, 2.1, np.nan],
+        "xGA": [2.1, 0.5, np.nan],
+        "Uhrzeit": ["15:30", "15:30", "15:30"],
+        "Besitz": [40, 60, np.nan],
+        "Runde": ["Spielwoche 1", "Spielwoche 1", "Spielwoche 2"],
+        "Wett": ["Bundesliga", "Bundesliga", "Bundesliga"],
+        "Tag": ["Sa.", "Sa.", "Sa."],
+        "Hinweise": [np.nan, np.nan, np.nan],
+        "Saison": ["2017-2018", "2017-2018", "2017-2018"],
+    }
+    settled = pd.DataFrame(columns=coll.SETTLED_COLUMNS)
+
+    with pytest.raises(KeyError):
+        df = pd.DataFrame(data=data).drop(columns=["Datum"])
+        coll.select_new_fbref_rows(df, settled)
+
+    with pytest.raises(KeyError):
+        df = pd.DataFrame(data=data).drop(columns=["xGA"])
+        coll.select_new_fbref_rows(df, settled)
+
+    df = pd.DataFrame(data=data)
+    keys = coll.fbref_primary_keys(df)
+    assert list(keys) == [
+        "2017-08-19VfL WolfsburgBorussia Dortmund",
+        "2017-08-19VfL WolfsburgBorussia Dortmund",
+        "2017-08-26Hertha BSCBorussia Dortmund",
+    ]
+
+    result = coll.select_new_fbref_rows(df, settled)
+    assert len(result) == 3
+
+    # the stored game is the normalized one
+    stored = coll.normalize_fbref_frame(df.iloc[:2])
+    settled = stored[coll.SETTLED_COLUMNS]
+    result = coll.select_new_fbref_rows(df, settled)
+    assert list(result.index) == [2]
+
+    # values changed upstream, both rows of the game are normalized again
+    settled = settled.assign(**{"Away xG": 2.0})
+    result = coll.select_new_fbref_rows(df, settled)
+    assert list(result.index) == [0, 1, 2]
+
+    # invalid values are left to the normalization
+    df.loc[1, "Tf"] = "X"
+    result = coll.select_new_fbref_rows(df, stored[coll.SETTLED_COLUMNS])
+    assert list(result.index) == [1, 2]
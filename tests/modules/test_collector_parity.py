@@ -0,0 +1,330 @@
+import datetime as dt
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import modules.collector as coll
+import modules.helper as helper
+import modules.translator as trans
+
+# Row-wise reference implementations. They follow the former df.iterrows()
+# versions of modules.collector line by line and are used to prove, that the
+# vectorized versions produce the same values.
+
+
+def _row_Kick_Off(time):
+    if pd.isnull(time):
+        return coll.UNKNOWN_STRING
+    if re.compile(r"^\d{2}:\d{2}$").match(time):
+        return time
+    if not re.compile(r"^\d{2}:\d{2}$").match(time[:5]):
+        raise ValueError
+    return time[:5]
+
+
+def _row_Result(venue, result):
+    translation = {
+        "Heim": {"S": "H", "U": "D", "N": "A"},
+        "Neutral": {"S": "H", "U": "D", "N": "A"},
+        "Auswärts": {"S": "A", "U": "D", "N": "H"},
+    }
+    if venue not in translation:
+        raise ValueError
+    if pd.isnull(result):
+        return coll.UNKNOWN_STRING
+    if result not in translation[venue]:
+        raise ValueError
+    return translation[venue][result]
+
+
+def _row_mirror(venue, value_for, value_against, unknown):
+    value_for = unknown if pd.isnull(value_for) else value_for
+    value_against = unknown if pd.isnull(value_against) else value_against
+    if venue == "Heim" or venue == "Neutral":
+        return value_for, value_against
+    elif venue == "Auswärts":
+        return value_against, value_for
+    raise ValueError
+
+
+def _row_Possesion(venue, possesion):
+    if pd.isnull(possesion):
+        return coll.UNKNOWN_FLOAT, coll.UNKNOWN_FLOAT
+    return _row_mirror(venue, possesion, 100 - int(possesion), coll.UNKNOWN_FLOAT)
+
+
+def _row_Goals(venue, tF, tK):
+    goals = []
+    for value in [str(tF), str(tK)]:
+        if re.compile(r"^(\d{0,2} \(\d{1,2}\))$").match(value):
+            value = value[value.find("(") + 1 : value.find(")")]
+        if value == "nan":
+            goals.append(coll.UNKNOWN_FLOAT)
+        elif not re.compile(r"^\d{1,2}(\.\d)?$").match(value):
+            raise ValueError
+        else:
+            goals.append(float(value))
+    return _row_mirror(venue, goals[0], goals[1], coll.UNKNOWN_FLOAT)
+
+
+def _row_Date(date):
+    if pd.isnull(date):
+        return coll.UNKNOWN_STRING
+    elif re.compile(r"^\d{2}\.\d{2}\.\d{4}$").search(date):
+        return dt.datetime.strptime(date, "%d.%m.%Y")
+    elif re.compile(r"^\d{2}\/\d{2}\/\d{4}$").search(date):
+        return dt.datetime.strptime(date, "%d/%m/%Y")
+    elif re.compile(r"^\d{2}\/\d{2}\/\d{2}$").search(date):
+        return dt.datetime.strptime(date, "%d/%m/%y")
+    raise ValueError
+
+
+def _row_Matchweek(matchweek, competition):
+    if competition not in trans.competitions():
+        return coll.UNKNOWN_FLOAT
+    if not re.compile(r"^Spielwoche [1-9]{1}\d{0,1}$").search(str(matchweek)):
+        raise ValueError
+    return float(matchweek[len("Spielwoche ") :])
+
+
+def _row_Day(day):
+    if pd.isnull(day):
+        return coll.UNKNOWN_STRING
+    result = trans.day_ger_str_to_eng_str().get(day)
+    if result is None:
+        raise ValueError
+    return result
+
+
+def _row_Season(season):
+    if pd.isnull(season):
+        return coll.UNKNOWN_STRING
+    if not re.compile(r"^\d{4}-\d{4}$").search(season):
+        raise ValueError
+    if not int(season[:4]) == int(season[5:]) - 1:
+        raise ValueError
+    return season
+
+
+def _row_Competition(competition):
+    if pd.isnull(competition) or competition not in trans.competitions():
+        return coll.UNKNOWN_STRING
+    return competition
+
+
+def _row_Notes(notes):
+    return coll.UNKNOWN_STRING if pd.isnull(notes) else notes
+
+
+def _raw_frame(no_of_rows, seed=42):
+    rng = np.random.default_rng(seed)
+
+    def pick(values, p_null=0.0):
+        result = np.array(values, dtype=object)[
+            rng.integers(0, len(values), no_of_rows)
+        ]
+        result[rng.random(no_of_rows) < p_null] = np.nan
+        return result
+
+    teams = ["Borussia Dortmund", "VfL Wolfsburg", "FC Bayern München", "SC Freiburg"]
+    competitions = trans.competitions() + ["DFB-Pokal", "Champions Lg"]
+    data = {
+        "Datum": pick(["01.08.2020", "17/09/2021", "28/02/22", "31.12.2019"], 0.1),
+        "Uhrzeit": pick(["15:30", "18:30 (19:30)", "20:45"], 0.1),
+        "Wett": pick(competitions, 0.05),
+        "Tag": pick(list(trans.day_ger_str_to_eng_str().keys()), 0.1),
+        "Spielort": pick(["Heim", "Neutral", "Auswärts"]),
+        "Ergebnis": pick(["S", "U", "N"], 0.1),
+        "Tf": pick([0, 1, 2, 3, "1 (4)", "0 (5)"], 0.1),
+        "Tk": pick([0, 1, 2, 5, "2 (3)"], 0.1),
+        "Gegner": pick(teams, 0.05),
+        "xG": pick([0.3, 1.2, 2.7, 0.0], 0.1),
+        "xGA": pick([0.8, 1.1, 3.4], 0.1),
+        "Besitz": pick([34, 50, 61, 72.0], 0.1),
+        "Hinweise": pick(["Spiel verschoben", "Spiel abgesagt"], 0.8),
+        "Mannschaft": pick(teams, 0.05),
+        "Saison": pick(["2019-2020", "2020-2021", "2021-2022"], 0.05),
+    }
+    df = pd.DataFrame(data=data)
+    df["Runde"] = [
+        f"Spielwoche {x}" if c in trans.competitions() else "Achtelfinale"
+        for x, c in zip(rng.integers(1, 39, no_of_rows), df["Wett"])
+    ]
+    return df
+
+
+@pytest.fixture
+def raw():
+    return _raw_frame(500)
+
+
+def assert_parity(values, expected):
+    assert len(values) == len(expected)
+    for value, result in zip(values, expected):
+        assert value == result
+
+
+def test_parity_prepare_Kick_Off(raw):
+    expected = [_row_Kick_Off(x) for x in raw["Uhrzeit"]]
+    assert_parity(coll.prepare_Kick_Off(raw)["Kick Off"], expected)
+
+
+def test_parity_prepare_Result(raw):
+    expected = [_row_Result(v, r) for v, r in zip(raw["Spielort"], raw["Ergebnis"])]
+    assert_parity(coll.prepare_Result(raw)["Result"], expected)
+
+
+def test_parity_prepare_Teams(raw):
+    expected = [
+        _row_mirror(v, t, o, coll.UNKNOWN_STRING)
+        for v, t, o in zip(raw["Spielort"], raw["Mannschaft"], raw["Gegner"])
+    ]
+    df = coll.prepare_Teams(raw)
+    assert_parity(df["Home Team"], [x[0] for x in expected])
+    assert_parity(df["Away Team"], [x[1] for x in expected])
+
+
+def test_parity_prepare_Possesions(raw):
+    expected = [_row_Possesion(v, p) for v, p in zip(raw["Spielort"], raw["Besitz"])]
+    df = coll.prepare_Possesions(raw)
+    assert_parity(df["Home Possesion"], [x[0] for x in expected])
+    assert_parity(df["Away Possesion"], [x[1] for x in expected])
+
+
+def test_parity_prepare_xGs(raw):
+    expected = [
+        _row_mirror(v, xG, xGA, coll.UNKNOWN_FLOAT)
+        for v, xG, xGA in zip(raw["Spielort"], raw["xG"], raw["xGA"])
+    ]
+    df = coll.prepare_xGs(raw)
+    assert_parity(df["Home xG"], [x[0] for x in expected])
+    assert_parity(df["Away xG"], [x[1] for x in expected])
+
+
+def test_parity_prepare_Goals(raw):
+    expected = [
+        _row_Goals(v, f, k) for v, f, k in zip(raw["Spielort"], raw["Tf"], raw["Tk"])
+    ]
+    df = coll.prepare_Goals(raw)
+    assert_parity(df["Home Goals"], [x[0] for x in expected])
+    assert_parity(df["Away Goals"], [x[1] for x in expected])
+
+
+def test_parity_prepare_Date(raw):
+    expected = [_row_Date(x) for x in raw["Datum"]]
+    assert_parity(coll.prepare_Date(raw, "Datum")["Date"], expected)
+
+
+def test_parity_prepare_Matchweek(raw):
+    expected = [_row_Matchweek(r, c) for r, c in zip(raw["Runde"], raw["Wett"])]
+    assert_parity(coll.prepare_Matchweek(raw, "Runde", "Wett")["Matchweek"], expected)
+
+
+def test_parity_prepare_Day(raw):
+    expected = [_row_Day(x) for x in raw["Tag"]]
+    assert_parity(coll.prepare_Day(raw, "Tag")["Day"], expected)
+
+
+def test_parity_prepare_Season(raw):
+    expected = [_row_Season(x) for x in raw["Saison"]]
+    assert_parity(coll.prepare_Season(raw, "Saison")["Season"], expected)
+
+
+def test_parity_prepare_Competition(raw):
+    expected = [_row_Competition(x) for x in raw["Wett"]]
+    assert_parity(coll.prepare_Competition(raw, "Wett")["Competition"], expected)
+
+
+def test_parity_prepare_Notes(raw):
+    expected = [_row_Notes(x) for x in raw["Hinweise"]]
+    assert_parity(coll.prepare_Notes(raw, "Hinweise")["Notes"], expected)
+
+
+def test_parity_columns(raw):
+    df = coll.prepare_Kick_Off(raw)
+    df = coll.prepare_Result(df)
+    df = coll.prepare_Teams(df)
+    df = coll.prepare_Possesions(df)
+    df = coll.prepare_xGs(df)
+    df = coll.prepare_Goals(df)
+    df = coll.prepare_Date(df, "Datum")
+    df = coll.prepare_Matchweek(df, "Runde", "Wett")
+    df = coll.prepare_Day(df, "Tag")
+    df = coll.prepare_Season(df, "Saison")
+    df = coll.prepare_Competition(df, "Wett")
+    df = coll.prepare_Notes(df, "Hinweise")
+
+    expected = [
+        "Spielort",
+        "Kick Off",
+        "Result",
+        "Home Team",
+        "Away Team",
+        "Home Possesion",
+        "Away Possesion",
+        "Home xG",
+        "Away xG",
+        "Home Goals",
+        "Away Goals",
+        "Date",
+        "Matchweek",
+        "Day",
+        "Season",
+        "Competition",
+        "Notes",
+    ]
+    assert list(df.columns) == expected
+
+
+def test_parity_normalize_fbref_frame(raw):
+    raw["Datum"] = raw["Datum"].fillna("01.08.2020")
+    result = coll.normalize_fbref_frame(raw)
+
+    df = raw.copy()
+    df = coll.prepare_Kick_Off(df)
+    df = coll.prepare_Result(df)
+    df = coll.prepare_Teams(df)
+    df = coll.prepare_Possesions(df)
+    df = coll.prepare_xGs(df)
+    df = coll.prepare_Goals(df)
+    df = coll.prepare_Date(df, "Datum")
+    df = coll.prepare_Matchweek(df, "Runde", "Wett")
+    df = coll.prepare_Day(df, "Tag")
+    df = coll.prepare_Season(df, "Saison")
+    df = coll.prepare_Competition(df, "Wett")
+    df = coll.prepare_Notes(df, "Hinweise")
+    translations = {v: k for k, v in trans.fbref_com_translations().items()}
+    df["Home Team"].replace(translations, inplace=True)
+    df["Away Team"].replace(translations, inplace=True)
+    df = coll.introduce_Primary_Key(df, "Date", "Home Team", "Away Team")
+    df.drop_duplicates(subset=["Primary Key"], inplace=True)
+    df = df[trans.fbref_com_features().keys()]
+    df = helper.apply_schema(df.copy())
+
+    assert list(result.columns) == list(trans.fbref_com_features().keys())
+    assert result["Date"].is_monotonic_increasing
+
+    expected = df.set_index("Primary Key").sort_index()
+    result = result.set_index("Primary Key").sort_index()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_parity_duplicated_index(raw):
+    raw["Datum"] = raw["Datum"].fillna("01.08.2020")
+    expected = coll.normalize_fbref_frame(raw.copy())
+
+    # pages of several teams are concatenated without resetting the index
+    raw.index = np.arange(len(raw)) // 3
+    assert coll.validate_fbref_frame(raw).empty
+
+    dates = coll.prepare_Date(raw.copy(), "Datum")["Date"]
+    assert_parity(dates, [_row_Date(x) for x in raw["Datum"]])
+
+    for errors in ["raise", "collect"]:
+        result = coll.normalize_fbref_frame(raw.copy(), errors=errors)
+        if errors == "collect":
+            result, report = result
+            assert report.empty
+        pd.testing.assert_frame_equal(result, expected)
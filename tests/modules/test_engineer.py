@@ -1,16 +1,54 @@
 import datetime as dt
+import os
 
 import numpy as np
 import pandas as pd
 import pytest
 
 import modules.engineer as eng
+import modules.helper as helper
+import modules.storekeeper as store
+from tests.benchmarks.generator import league_seasons
 
 BASE_PATH = "./tests/sources/data/test_base.csv"
 COACHES_PATH = "./tests/sources/data/test_coaches.csv"
 PROMOTIONS_PATH = "./tests/sources/data/test_promotions.csv"
 
 
+def test_TeamGameView():
+    with pytest.raises(KeyError):
+        df = pd.DataFrame(data={"Home Team": ["A"], "col": ["B"]})
+        eng.TeamGameView(df)
+
+    data = {
+        "Home Team": ["A", "C", "B"],
+        "Away Team": ["B", "A", "C"],
+        "Season": ["2017-2018", "2017-2018", "2018-2019"],
+        "Home Test": [1.0, 2.0, 3.0],
+        "Away Test": [4.0, 5.0, 6.0],
+    }
+    df = pd.DataFrame(data=data)
+
+    view = eng.TeamGameView.of(df)
+    assert view.games["Game"].tolist() == [0, 0, 1, 1, 2, 2]
+    assert view.games["Venue"].tolist() == ["Home", "Away"] * 3
+    assert view.games["Team"].tolist() == ["A", "B", "C", "A", "B", "C"]
+    assert view.games["Opponent"].tolist() == ["B", "A", "A", "C", "C", "B"]
+    assert view.groups().tolist() == [0, 1, 2, 0, 3, 4]
+
+    values = view.values(df, ["Test"])
+    assert values["Test"].tolist() == [1.0, 4.0, 2.0, 5.0, 3.0, 6.0]
+    assert values["Test Against"].tolist() == [4.0, 1.0, 5.0, 2.0, 6.0, 3.0]
+
+    # cached as long as the frame does not change
+    assert eng.TeamGameView.of(df.copy()) is view
+    df.loc[2, "Home Test"] = 7.0
+    assert eng.TeamGameView.of(df) is view
+    assert view.values(df, ["Test"])["Test"].tolist()[4] == 7.0
+    df.loc[2, "Season"] = "2017-2018"
+    assert eng.TeamGameView.of(df) is not view
+
+
 def test_add_Days_Since_Last_Game():
     with pytest.raises(KeyError):
         data = {
@@ -82,6 +120,10 @@ def test_add_Days_Since_Last_Game():
     assert df.loc[df["Primary Key"] == game_key].iloc[0][col_home] == 8
     assert df.loc[df["Primary Key"] == game_key].iloc[0][col_away] == 8
 
+    # games are ordered by "Match Key", which is not left in df
+    assert "Match Key" not in df.columns
+    assert helper.get_match_key(df).is_monotonic_increasing
+
 
 def test_add_Coach():
     with pytest.raises(KeyError):
@@ -278,6 +320,34 @@ def test_add_Coach():
     assert df.loc[df["Primary Key"] == game_key].iloc[0][col_home] == "Heiko Herrlich"
     assert df.loc[df["Primary Key"] == game_key].iloc[0][col_away] == "JOHN DOE"
 
+    data = {
+        "Primary Key": [
+            f"2017-12-{day:02d}Borussia DortmundVfL Wolfsburg" for day in [2, 9, 10]
+        ],
+        "Home Team": ["Borussia Dortmund"] * 3,
+        "Away Team": ["VfL Wolfsburg"] * 3,
+        "Date": [dt.datetime(2017, 12, day) for day in [2, 9, 10]],
+    }
+    df = pd.DataFrame(data=data)
+    data = {
+        "Team": ["Borussia Dortmund", "Borussia Dortmund", "VfL Wolfsburg"],
+        "Coach": ["Peter Stöger", "Peter Bosz", "Martin Schmidt"],
+        "Started": [
+            dt.datetime(2017, 12, 9),
+            dt.datetime(2017, 7, 1),
+            dt.datetime(2017, 9, 18),
+        ],
+        "Ended": [
+            dt.datetime(2018, 6, 30),
+            dt.datetime(2017, 12, 9),
+            dt.datetime(2017, 12, 9),
+        ],
+    }
+    df_coach = pd.DataFrame(data=data)
+    df = eng.add_Coach(df, df_coach)
+    assert list(df[col_home]) == ["Peter Bosz", "Peter Stöger", "Peter Stöger"]
+    assert list(df[col_away]) == ["Martin Schmidt", "Martin Schmidt", "UNKNOWN"]
+
 
 def test_add_Coach_Substituted_Within_Last_OFFSET_Games():
     with pytest.raises(KeyError):
@@ -588,6 +658,23 @@ def test_add_feat_Current_Position_Before_Matchday():
     assert df.loc[df["Primary Key"] == game_key].iloc[0][home] == "UNKNOWN"
     assert df.loc[df["Primary Key"] == game_key].iloc[0][away] == "UNKNOWN"
 
+    # ties by points, goal difference and goals are broken by name
+    data = {
+        "Home Team": ["B", "D", "A", "B", "E"],
+        "Away Team": ["C", "A", "E", "D", "C"],
+        "Home Points": [1, 3, 0, 0, 1],
+        "Away Points": [1, 0, 3, 3, 1],
+        "Home Goals": [1, 2, 0, 0, 0],
+        "Away Goals": [1, 1, 1, 1, 0],
+        "Matchweek": [1, 1, 2, 2, 2],
+        "Season": ["2017-2018"] * 5,
+        "Competition": ["Bundesliga"] * 5,
+    }
+    df = pd.DataFrame(data=data)
+    df = eng.add_Current_Position_Before_Matchday(df, 1)
+    assert df[home].tolist() == [-1, -1, 4, 2, "UNKNOWN"]
+    assert df[away].tolist() == [-1, -1, "UNKNOWN", 1, 3]
+
 
 def test_add_Kick_Off_Before_17_00():
     with pytest.raises(KeyError):
@@ -705,6 +792,21 @@ def test_add_Promoted_Last_Year():
     assert df.loc[df["Primary Key"] == game_key].iloc[0][col_home] == "UNKNOWN"
     assert df.loc[df["Primary Key"] == game_key].iloc[0][col_away] == "UNKNOWN"
 
+    # the promotion belongs to the season of the game, not the previous one
+    data = {
+        "Home Team": ["Hertha BSC", "Hertha BSC"],
+        "Away Team": ["VfB Stuttgart", "VfB Stuttgart"],
+        "Season": ["2017-2018", "2018-2019"],
+    }
+    df = pd.DataFrame(data=data)
+    data = {
+        "Team": ["Hannover 96", "VfB Stuttgart"],
+        "Is Promoted": ["2017-2018", "2018-2019"],
+    }
+    df = eng.add_Promoted_Last_Year(df, pd.DataFrame(data=data))
+    assert list(df[col_away]) == [False, True]
+    assert list(df[col_home]) == [False, False]
+
 
 def test_add_MA_FEAT_Last_OFFSET_Games_Before_Matchday():
     with pytest.raises(KeyError):
@@ -1622,6 +1724,223 @@ def test_add_MIN_FEAT_Against_Last_OFFSET_Games_Before_Matchday():
     assert df.loc[df["Primary Key"] == game_key].iloc[0][col_away] == 1
 
 
+def test_add_Rolling_FEATs_Before_Matchday():
+    with pytest.raises(KeyError):
+        df = pd.read_csv(BASE_PATH, index_col=0)
+        df = eng.add_Rolling_FEATs_Before_Matchday(df, ["Test", "col"], [3])
+
+    with pytest.raises(ValueError):
+        df = pd.read_csv(BASE_PATH, index_col=0)
+        df = eng.add_Rolling_FEATs_Before_Matchday(df, ["Test"], [3], ["MEDIAN"])
+
+    df = pd.read_csv(BASE_PATH, index_col=0)
+    df["Home Test 2"] = df["Home Test"] * 0.5
+    df["Away Test 2"] = np.nan
+    features = ["Test", "Test 2"]
+
+    result = eng.add_Rolling_FEATs_Before_Matchday(df.copy(), features, [3, 5])
+
+    expected = df.copy()
+    for feature in features:
+        for offset in [3, 5]:
+            for aggregator in eng.AGGREGATORS:
+                for against in ["", "Against_"]:
+                    func = f"add_{aggregator}_FEAT_{against}"
+                    func += "Last_OFFSET_Games_Before_Matchday"
+                    expected = getattr(eng, func)(expected, feature, offset)
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected)
+
+    assert not result.drop(columns=df.columns).isna().any().any()
+
+    # all windows in one sweep, compared to pandas per team and season
+    df = league_seasons(2, 6)
+    df.loc[::5, "Home Test"] = np.nan
+    offsets = [3, 5, 10, 38]
+    result = eng.add_Rolling_FEATs_Before_Matchday(
+        df, ["Test"], offsets, againsts=[False]
+    )
+
+    aggregate = {
+        "MA": lambda x, offset: x.rolling(offset, min_periods=1).mean(),
+        "EWMA": lambda x, offset: x.ewm(span=offset).mean(),
+        "MAX": lambda x, offset: x.rolling(offset, min_periods=1).max(),
+        "MIN": lambda x, offset: x.rolling(offset, min_periods=1).min(),
+    }
+    for (team, season), games in pd.concat(
+        [
+            result.assign(
+                Team=result["Home Team"], Venue="Home", Value=result["Home Test"]
+            ),
+            result.assign(
+                Team=result["Away Team"], Venue="Away", Value=result["Away Test"]
+            ),
+        ]
+    ).groupby(["Team", "Season"]):
+        games = games.sort_values(by=["Primary Key"])
+        for offset in offsets:
+            for aggregator, func in aggregate.items():
+                expected = func(games["Value"], offset).shift(1).round(2).fillna(-1)
+                col = f"{aggregator} Test Last {offset} Games Before Matchday"
+                values = [row[f"{row['Venue']} {col}"] for _, row in games.iterrows()]
+                # sums in another order than pandas' may round to the next
+                # value of 2 decimals
+                np.testing.assert_allclose(values, expected, rtol=1e-9, atol=0.01)
+
+
+def test_add_Rolling_FEATs_By_Name():
+    with pytest.raises(KeyError):
+        df = pd.read_csv(BASE_PATH, index_col=0)
+        df = eng.add_Rolling_FEATs_By_Name(
+            df, ["Home MA col Last 3 Games Before Matchday"]
+        )
+
+    df = pd.read_csv(BASE_PATH, index_col=0)
+    df["Home Test 2"] = df["Home Test"] * 0.5
+    df["Away Test 2"] = np.nan
+
+    identifiers = [
+        "Home Odds",
+        "Away EWMA Test 2 Against Last 5 Games Before Matchday",
+        "Home MA Test Last 3 Games Before Matchday",
+        "Away MA Test Last 3 Games Before Matchday",
+        "Home MIN Test Against Last 38 Games Before Matchday",
+        "Home MA Test Last 3 Games Before Matchday",
+    ]
+    result = eng.add_Rolling_FEATs_By_Name(df.copy(), identifiers)
+
+    new_cols = [col for col in result.columns if col not in df.columns]
+    assert new_cols == list(dict.fromkeys(identifiers[1:]))
+
+    expected = eng.add_Rolling_FEATs_Before_Matchday(
+        df.copy(), ["Test", "Test 2"], [3, 5, 38]
+    )
+    pd.testing.assert_frame_equal(result[new_cols], expected[new_cols])
+
+    result = eng.add_Rolling_FEATs_By_Name(df.copy(), ["Home Odds"])
+    assert list(result.columns) == list(df.columns)
+
+
+def test_add_Rolling_FEATs_By_Name_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "DIRECTORY", f"{tmp_path}/store")
+
+    df = pd.read_csv(BASE_PATH, index_col=0)
+    df["Home Test 2"] = df["Home Test"] * 0.5
+    df["Away Test 2"] = df["Away Test"] - 1
+    identifiers = [
+        "Home MA Test Last 3 Games Before Matchday",
+        "Away MA Test Against Last 3 Games Before Matchday",
+        "Home EWMA Test 2 Last 5 Games Before Matchday",
+        "Away MIN Test 2 Against Last 38 Games Before Matchday",
+    ]
+    expected = eng.add_Rolling_FEATs_By_Name(df.copy(), identifiers)
+
+    # computed and stored, then loaded
+    for _ in range(2):
+        result = eng.add_Rolling_FEATs_By_Name(
+            df.sample(frac=1, random_state=0), identifiers, True
+        )
+        pd.testing.assert_frame_equal(result, expected)
+    stored = set(os.listdir(store.DIRECTORY))
+    assert len(stored) == 3 * df["Season"].nunique()
+
+    # only the families of the changed feature of the changed season are computed
+    # again, their older entries are replaced
+    season = df["Season"].iloc[-1]
+    df.loc[df.index[-1], "Home Test 2"] = 99.0
+    expected = eng.add_Rolling_FEATs_By_Name(df.copy(), identifiers)
+    result = eng.add_Rolling_FEATs_By_Name(df.copy(), identifiers, True)
+    pd.testing.assert_frame_equal(result, expected)
+    files = set(os.listdir(store.DIRECTORY))
+    assert len(files) == len(stored)
+    assert sorted(file.rsplit(" ", 1)[0] for file in files - stored) == [
+        f"EWMA Test 2 5 {season}",
+        f"MIN Test 2 38 {season}",
+    ]
+
+    # all families are computed again with another version of the computation
+    monkeypatch.setattr(eng, "VERSION", eng.VERSION + 1)
+    result = eng.add_Rolling_FEATs_By_Name(df.copy(), identifiers, True)
+    pd.testing.assert_frame_equal(result, expected)
+    assert not set(os.listdir(store.DIRECTORY)) & files
+    assert len(os.listdir(store.DIRECTORY)) == len(files)
+
+
+def test_add_Rolling_FEATs_By_Name_workers():
+    df = pd.read_csv(BASE_PATH, index_col=0)
+    df["Home Test 2"] = df["Home Test"] * 0.5
+    df["Away Test 2"] = np.nan
+    identifiers = [
+        f"{side} {aggregator} {feature} Last {offset} Games Before Matchday"
+        for side in ["Home", "Away"]
+        for aggregator in eng.AGGREGATORS
+        for feature in ["Test", "Test Against", "Test 2"]
+        for offset in [3, 5]
+    ]
+
+    expected = eng.add_Rolling_FEATs_By_Name(df.copy(), identifiers)
+    result = eng.add_Rolling_FEATs_By_Name(df.copy(), identifiers, workers=3)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_FeatureState():
+    identifiers = [
+        "Home MA Test Last 3 Games Before Matchday",
+        "Away EWMA Test Against Last 5 Games Before Matchday",
+        "Home MAX Goals Last 5 Games Before Matchday",
+        "Away MIN Test Last 3 Games Before Matchday",
+    ]
+
+    with pytest.raises(KeyError):
+        eng.FeatureState(identifiers, 3).update(
+            league_seasons(1, 6).drop(columns=["Home Coach"])
+        )
+
+    df = league_seasons(2, 6)
+    df["Competition"] = "Bundesliga"
+    df["Matchweek"] = (
+        df["Date"] - pd.to_datetime(df["Season"].str[:4] + "-08-01")
+    ).dt.days
+    df["Matchweek"] = df["Matchweek"] // 7 + 1
+    rng = np.random.default_rng(42)
+    for side in ["Home", "Away"]:
+        df[f"{side} Goals"] = rng.integers(0, 4, len(df)).astype(float)
+    df["Result"] = np.where(df["Home Goals"] > df["Away Goals"], "H", "D")
+    df.loc[::7, "Home Test"] = np.nan
+
+    # last matchweek is not played yet
+    season = df["Season"] == "2001-2002"
+    new = season & (df["Matchweek"] == df["Matchweek"].max())
+    df.loc[new, ["Result", "Home Goals", "Away Goals", "Home Test", "Away Test"]] = (
+        np.nan
+    )
+    df = eng.add_Points(df)
+
+    expected = df.loc[season].copy()
+    expected = eng.add_Days_Since_Last_Game(expected)
+    expected = eng.add_Coach_Substituted_Within_Last_OFFSET_Games(expected, 3)
+    expected = eng.add_Current_Position_Before_Matchday(expected, 3)
+    expected = eng.add_Rolling_FEATs_By_Name(expected, identifiers)
+    cols = [col for col in expected.columns if col not in df.columns]
+
+    state = eng.FeatureState(identifiers, 3)
+    state.update(df.loc[~new].copy())
+    result = state.update(
+        df.loc[new].drop(columns=["Home Goals", "Away Goals", "Home Test"])
+    )
+
+    assert len(cols) == 10
+    expected = expected.loc[expected["Primary Key"].isin(result["Primary Key"])]
+    pd.testing.assert_frame_equal(
+        result[cols].reset_index(drop=True), expected[cols].reset_index(drop=True)
+    )
+
+    # a game before the last game of its teams
+    with pytest.raises(ValueError):
+        state.update(df.loc[season & (df["Matchweek"] == 1)].copy())
+
+
 def test_set_maximum():
     with pytest.raises(KeyError):
         data = {
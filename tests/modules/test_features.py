@@ -13,6 +13,42 @@ def test_num_features():
     assert len(feat.num_features()) == NO_OF_NUM_FEAT
 
 
+def test_parse_rolling_feature():
+    feature = "Home MIN Red Cards Against Last 5 Games Before Matchday"
+    assert feat.parse_rolling_feature(feature) == ("Home", "MIN", "Red Cards", True, 5)
+    assert feat.rolling_feature("Home", "MIN", "Red Cards", True, 5) == feature
+
+    feature = "Away EWMA Shots on Target Last 3 Games Before Matchday"
+    assert feat.parse_rolling_feature(feature) == (
+        "Away",
+        "EWMA",
+        "Shots on Target",
+        False,
+        3,
+    )
+
+    assert feat.parse_rolling_feature("Home Days Since Last Game") is None
+    assert (
+        feat.parse_rolling_feature("Home MEDIAN xG Last 3 Games Before Matchday")
+        is None
+    )
+
+
+def test_rolling_plan():
+    plan = feat.rolling_plan(feat.num_features())
+
+    NO_OF_ROLLING_FEAT = 320
+    assert len(plan) == NO_OF_ROLLING_FEAT
+    for spec in plan:
+        assert feat.rolling_feature(*spec) in feat.num_features()
+
+    features = feat.num_features()[:9] + feat.num_features()[7:9]
+    assert feat.rolling_plan(features) == [
+        ("Home", "MA", "xG", False, 3),
+        ("Away", "MA", "xG", False, 3),
+    ]
+
+
 def test_cat_features():
     unique = np.unique(feat.cat_features())
     assert len(unique) == len(feat.cat_features())
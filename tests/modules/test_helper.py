@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 import modules.helper as helper
 
@@ -11,3 +12,80 @@ def test_invert_dictionary():
     with pytest.raises(ValueError):
         test = {1: "A", 2: "A", 3: "C"}
         helper.invert_dictionary(test)
+
+
+def test_get_match_key():
+    with pytest.raises(KeyError):
+        helper.get_match_key(pd.DataFrame(data={"Primary Key": []}))
+
+    with pytest.raises(ValueError):
+        df = pd.DataFrame(
+            data={
+                "Primary Key": ["UNKNOWNVfL WolfsburgBorussia Dortmund"],
+                "Home Team": ["VfL Wolfsburg"],
+                "Away Team": ["Borussia Dortmund"],
+            }
+        )
+        helper.get_match_key(df)
+
+    df = pd.DataFrame(
+        data={
+            "Primary Key": [
+                "2017-08-19VfL WolfsburgBorussia Dortmund",
+                "2017-08-19Borussia DortmundVfL Wolfsburg",
+                "2017-08-18VfL WolfsburgBorussia Dortmund",
+                "2017-08-19VfL WolfsburgTeam A",
+                "2017-08-19Team AB",
+            ],
+            "Home Team": [
+                "VfL Wolfsburg",
+                "Borussia Dortmund",
+                "VfL Wolfsburg",
+                "VfL Wolfsburg",
+                "Team AB",
+            ],
+            "Away Team": [
+                "Borussia Dortmund",
+                "VfL Wolfsburg",
+                "Borussia Dortmund",
+                "Team A",
+                np.nan,
+            ],
+        }
+    )
+    result = helper.get_match_key(df)
+
+    assert result.dtype == "int64"
+    assert result.nunique() == 5
+    assert result[2] < result[[0, 1, 3, 4]].min()
+    days = result // 2 ** (2 * helper.MATCH_KEY_TEAM_BITS)
+    assert list(days) == [17396 + x for x in [1, 1, 0, 1, 1]]
+
+    # codes of known teams do not depend on the teams present
+    assert helper.get_match_key(df.iloc[[0]])[0] == result[0]
+
+
+def test_apply_schema():
+    data = {
+        "Home Team": ["VfL Wolfsburg", "Borussia Dortmund", "Celtic Glasgow"],
+        "Away Team": ["Borussia Dortmund", "UNKNOWN", "VfL Wolfsburg"],
+        "Season": ["2017-2018", "2017-2018", "UNKNOWN"],
+        "Home Goals": [0.0, 3.0, -1.0],
+        "Home xG": [0.5, 2.1, -1.0],
+        "Matchweek": [1, 2, -1],
+    }
+    df = helper.apply_schema(pd.DataFrame(data=data))
+
+    assert df["Home Team"].dtype == "category"
+    assert df["Home Team"].dtype == df["Away Team"].dtype
+    assert df["Home Team"].cat.categories[-1] == "Celtic Glasgow"
+    assert df["Home Team"].cat.categories[-2] == "UNKNOWN"
+    assert list(df["Away Team"]) == data["Away Team"]
+
+    assert df["Season"].dtype == "category"
+    assert list(df["Season"]) == data["Season"]
+
+    assert df["Home Goals"].dtype == "int8"
+    assert df["Matchweek"].dtype == "int8"
+    assert df["Home xG"].dtype == "float64"
+    assert list(df["Home Goals"]) == [0, 3, -1]
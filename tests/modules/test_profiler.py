@@ -0,0 +1,119 @@
+import concurrent.futures
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import modules.engineer as eng
+import modules.profiler as prof
+
+BASE_PATH = "./tests/sources/data/test_base.csv"
+
+
+@pytest.fixture
+def profiler():
+    prof.start()
+    yield
+    prof.stop()
+    prof.clear()
+
+
+@prof.profile
+def _allocate(df, size):
+    # keeps 8 * size bytes until the end of the stage
+    values = np.ones(size)
+    return df.assign(Values=values[: len(df)].sum())
+
+
+def test_profile(profiler, capsys):
+    df = pd.read_csv(BASE_PATH, index_col=0)
+
+    with prof.stage("Step", len(df)) as record:
+        _allocate(df, 10**6)
+        result = eng.add_Points(df)
+        record["Cols"] = len(result.columns)
+
+    assert "add_Points" in capsys.readouterr().out
+
+    report = prof.report()
+    assert list(report.columns) == prof.COLUMNS
+    assert list(report["Stage"]) == ["_allocate", "add_Points", "Step"]
+    assert list(report["Parent"]) == ["Step", "Step", None]
+    assert list(report["Rows"]) == [len(df)] * 3
+    assert list(report["Cols"]) == [
+        len(df.columns) + 1,
+        len(result.columns),
+        len(result.columns),
+    ]
+
+    assert (report["Wall"] >= 0).all() and (report["CPU"] >= 0).all()
+    assert report["Wall"].iloc[2] >= report["Wall"].iloc[:2].max()
+
+    # the peak of a nested stage is a peak of the enclosing stage
+    memory = report.set_index("Stage")["Memory"]
+    assert memory["_allocate"] >= 8 * 10**6
+    assert memory["Step"] >= memory["_allocate"]
+
+    # stages are not recorded after stop()
+    prof.stop()
+    prof.clear()
+    eng.add_Points(df)
+    assert prof.report().empty
+    assert "add_Points" in capsys.readouterr().out
+
+
+def test_stage_threads(profiler):
+    def allocate(name, barrier=None):
+        with prof.stage(name):
+            values = np.ones(10**6)
+            if barrier is not None:
+                barrier.wait()
+            return values.sum()
+
+    # one thread at a time counts as nested in the stage of the main thread
+    with prof.stage("Main"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            list(executor.map(allocate, ["A", "B"]))
+
+    memory = prof.report().set_index("Stage")["Memory"]
+    assert memory["A"] >= 8 * 10**6 and memory["B"] >= 8 * 10**6
+    assert memory["Main"] >= memory["A"]
+    prof.clear()
+
+    # the peaks of concurrent stages are not separable
+    barrier = threading.Barrier(2)
+    with prof.stage("Main"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(allocate, ["A", "B"], [barrier] * 2))
+
+    report = prof.report()
+    assert report["Memory"].isna().all()
+    assert (report["Wall"] >= 0).all() and (report["CPU"] >= 0).all()
+
+
+@pytest.mark.parametrize("extension", ["json", "csv"])
+def test_dump_load_diff(profiler, tmp_path, extension):
+    df = pd.read_csv(BASE_PATH, index_col=0)
+    eng.add_Points(df)
+    eng.add_Points(df)
+    path = f"{tmp_path}/before.{extension}"
+    prof.dump(path)
+
+    before = prof.load(path)
+    pd.testing.assert_frame_equal(
+        before[["Stage", "Rows", "Cols"]], prof.report()[["Stage", "Rows", "Cols"]]
+    )
+    np.testing.assert_allclose(before["Wall"], prof.report()["Wall"])
+
+    prof.clear()
+    eng.add_Points(df)
+    eng.add_Kick_Off_Before_17_00(df)
+    result = prof.diff(before, prof.report())
+
+    assert list(result.index) == ["add_Points", "add_Kick_Off_Before_17_00"]
+    assert list(result["Calls Before"].fillna(0)) == [2, 0]
+    assert list(result["Calls After"]) == [1, 1]
+    assert result.loc["add_Points", "Calls Change"] == -1
+    assert result.loc["add_Points", "Rows Change"] == -len(df)
+    assert np.isnan(result.loc["add_Kick_Off_Before_17_00", "Wall Before"])
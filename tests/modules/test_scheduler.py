@@ -0,0 +1,156 @@
+import os
+
+import pandas as pd
+import pytest
+
+import modules.engineer as eng
+import modules.scheduler as sched
+import modules.storekeeper as store
+
+BASE_PATH = "./tests/sources/data/test_base.csv"
+
+VENUES = ["Home", "Away"]
+DAYS = ["Home Days Since Last Game", "Away Days Since Last Game"]
+POINTS = ["Home Points", "Away Points"]
+GOALS = ["Home Goals", "Away Goals"]
+TEAMS = ["Home Team", "Away Team"]
+ROLLING = [
+    "Home MA Points Last 3 Games Before Matchday",
+    "Away MA Points Last 3 Games Before Matchday",
+]
+
+
+def _nodes():
+    # declared in reverse order on purpose, except for the nodes modifying points
+    return [
+        sched.Node(
+            "Current Position",
+            eng.add_Current_Position_Before_Matchday,
+            TEAMS + POINTS + GOALS + ["Season", "Competition", "Matchweek"],
+            POINTS
+            + GOALS
+            + [f"{venue} Current Position Before Matchday" for venue in VENUES],
+            args=(3,),
+        ),
+        sched.Node(
+            "Rolling",
+            eng.add_Rolling_FEATs_By_Name,
+            TEAMS + ["Season"] + POINTS,
+            POINTS + ROLLING,
+            args=(ROLLING,),
+        ),
+        sched.Node("Points", eng.add_Points, ["Result"], POINTS),
+        sched.Node(
+            "Maximum Days Since Last Game",
+            eng.set_maximum,
+            DAYS,
+            DAYS,
+            args=("Days Since Last Game",),
+            kwargs={"threshold": 7},
+        ),
+        sched.Node(
+            "Days Since Last Game", eng.add_Days_Since_Last_Game, TEAMS + ["Date"], DAYS
+        ),
+    ]
+
+
+def _expected(df):
+    df = eng.add_Days_Since_Last_Game(df)
+    df = eng.set_maximum(df, "Days Since Last Game", 7)
+    df = eng.add_Points(df)
+    df = eng.add_Current_Position_Before_Matchday(df, 3)
+    return eng.add_Rolling_FEATs_By_Name(df, ROLLING)
+
+
+def test_Scheduler_order():
+    scheduler = sched.Scheduler(_nodes())
+    assert scheduler.dependencies == {
+        "Rolling": set(["Points", "Current Position"]),
+        "Current Position": set(["Points"]),
+        "Points": set(),
+        "Maximum Days Since Last Game": set(["Days Since Last Game"]),
+        "Days Since Last Game": set(),
+    }
+    assert scheduler.order == [
+        "Points",
+        "Current Position",
+        "Rolling",
+        "Days Since Last Game",
+        "Maximum Days Since Last Game",
+    ]
+
+    with pytest.raises(ValueError):
+        sched.Scheduler(_nodes() + _nodes()[:1])
+
+    with pytest.raises(ValueError):
+        sched.Scheduler(
+            [
+                sched.Node("A", eng.add_Points, ["A", "Result"], ["B"]),
+                sched.Node("B", eng.add_Points, ["B", "Result"], ["A"]),
+            ]
+        )
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_Scheduler_run(workers, capsys):
+    df = pd.read_csv(BASE_PATH, index_col=0, parse_dates=["Date"])
+    df = df.drop(columns=POINTS)
+
+    with pytest.raises(KeyError):
+        sched.Scheduler(_nodes()).run(df.drop(columns=["Result"]))
+    with pytest.raises(KeyError):
+        sched.Scheduler(_nodes()).run(pd.concat([df, df.iloc[:1]]))
+
+    scheduler = sched.Scheduler(_nodes())
+    capsys.readouterr()
+    result = scheduler.run(df.sample(frac=1, random_state=0), workers)
+    # the critical path is only returned by get_critical_path()
+    assert "critical path" not in capsys.readouterr().out
+    expected = _expected(df.copy())
+
+    assert list(result.columns)[: len(df.columns)] == list(df.columns)
+    result = result.sort_values(by="Primary Key").reset_index(drop=True)
+    expected = expected.sort_values(by="Primary Key").reset_index(drop=True)
+    pd.testing.assert_frame_equal(result[expected.columns], expected)
+
+    names, seconds = scheduler.get_critical_path()
+    assert names in [
+        ["Points", "Current Position", "Rolling"],
+        ["Days Since Last Game", "Maximum Days Since Last Game"],
+    ]
+    assert seconds == pytest.approx(sum(scheduler.durations[name] for name in names))
+
+
+def test_Scheduler_run_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "DIRECTORY", f"{tmp_path}/store")
+    df = pd.read_csv(BASE_PATH, index_col=0, parse_dates=["Date"])
+    calls = []
+
+    def add_Points(df):
+        calls.append(len(df))
+        return eng.add_Points(df)
+
+    nodes = [sched.Node("Points", add_Points, ["Result"], POINTS)]
+    expected = sched.Scheduler(nodes).run(df, stored=True)
+    result = sched.Scheduler(nodes).run(df, stored=True)
+    pd.testing.assert_frame_equal(result, expected)
+    assert calls == [len(df)]
+
+    # other inputs are computed again
+    df.loc[df.index[0], "Result"] = "A"
+    result = sched.Scheduler(nodes).run(df, stored=True)
+    assert result.loc[result.index[0], "Away Points"] == 3
+    assert calls == [len(df)] * 2
+
+    # and so are other keyword arguments
+    keys = [
+        sched.Node("Points", add_Points, ["Result"], POINTS, kwargs=kwargs).get_key(df)
+        for kwargs in [None, {"a": 1}, {"a": 2}, {"b": 1}]
+    ]
+    assert len(set(keys)) == 4
+
+    # and so is another version of the computation, older frames are removed
+    monkeypatch.setattr(eng, "VERSION", eng.VERSION + 1)
+    sched.Scheduler(nodes).run(df, stored=True)
+    assert calls == [len(df)] * 3
+    assert len(os.listdir(store.DIRECTORY)) == 1
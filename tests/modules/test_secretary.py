@@ -0,0 +1,153 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+import modules.collector as coll
+import modules.engineer as eng
+import modules.secretary as secr
+from tests.modules.test_collector_parity import _raw_frame
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(secr, "BASE", f"{tmp_path}/base.csv")
+    monkeypatch.setattr(secr, "BASE_UPDATE", f"{tmp_path}/base_update.csv")
+
+
+def test_save_base_update_chunks(paths):
+    raw = _raw_frame(400)
+    raw["Datum"] = raw["Datum"].fillna("01.08.2020")
+    # random rows of the same game are not consistent, keep one row per game
+    raw = raw.loc[~coll.fbref_primary_keys(raw).duplicated()].reset_index(drop=True)
+
+    old = coll.normalize_fbref_frame(raw.iloc[:200])
+    old["Notes"] = "OLD"
+    secr.save_base_update(old, False)
+    old = secr.load_base_update()
+    old.to_csv(path_or_buf=secr.BASE)
+
+    chunks = (
+        chunk
+        for _, chunk in raw.iloc[100:].groupby(["Mannschaft", "Saison"], dropna=False)
+    )
+    secr.save_base_update_chunks(coll.normalize_fbref_chunks(chunks), True, chunksize=7)
+    result = secr.load_base_update()
+
+    new = coll.normalize_fbref_frame(raw.iloc[100:])
+    expected = secr._deduplicate(pd.concat([old, new]))
+
+    assert not result["Primary Key"].duplicated().any()
+    assert list(result["Primary Key"]) == list(expected["Primary Key"])
+    assert (result["Notes"] == "OLD").sum() == (expected["Notes"] == "OLD").sum()
+    pd.testing.assert_series_equal(
+        result["Home Goals"], expected["Home Goals"], check_dtype=False
+    )
+
+    # both paths write the same file
+    with open(secr.BASE_UPDATE, "rb") as file:
+        chunked = file.read()
+    secr.save_base_update(new, True)
+    with open(secr.BASE_UPDATE, "rb") as file:
+        assert file.read() == chunked
+
+
+def test_append_base_update(paths):
+    raw = _raw_frame(400)
+    raw["Datum"] = raw["Datum"].fillna("01.08.2020")
+    raw["Ergebnis"] = raw["Ergebnis"].fillna("S")
+    raw = raw.loc[~coll.fbref_primary_keys(raw).duplicated()].reset_index(drop=True)
+    old = secr._deduplicate(coll.normalize_fbref_frame(raw))
+    # the last games are not played yet
+    old.loc[old.index[-20:], "Result"] = "UNKNOWN"
+    secr.save_base_update(old, False)
+    old = secr.load_base_update()
+    with open(secr.BASE_UPDATE, "rb") as file:
+        before = file.read().splitlines(keepends=True)
+
+    new = old.iloc[-10:].copy()
+    new["Result"] = "H"
+    new["Notes"] = "NEW"
+    secr.append_base_update(new)
+    result = secr.load_base_update()
+    with open(secr.BASE_UPDATE, "rb") as file:
+        after = file.read().splitlines(keepends=True)
+
+    # settled games are not rewritten, unsettled games are replaced
+    assert after[: len(before) - 20] == before[: len(before) - 20]
+    assert len(result) == len(old) - 10
+    assert list(result["Notes"].iloc[-10:]) == ["NEW"] * 10
+    assert (result["Result"] != "UNKNOWN").all()
+    assert list(result.index) == list(range(len(result)))
+
+    # a changed settled game replaces the stored one
+    new = result.iloc[[5]].assign(Notes="CHANGED")
+    secr.append_base_update(new)
+    changed = secr.load_base_update()
+    assert len(changed) == len(result)
+    assert changed.loc[5, "Notes"] == "CHANGED"
+    assert changed["Primary Key"].equals(result["Primary Key"])
+
+
+def test_append_base_update_empty(paths):
+    df = pd.DataFrame(
+        data={
+            "Primary Key": ["2017-08-19VfL WolfsburgBorussia Dortmund"],
+            "Date": pd.to_datetime(["2017-08-19"]),
+            "Result": ["A"],
+        }
+    )
+    secr.append_base_update(df)
+    result = pd.read_csv(secr.BASE_UPDATE, index_col=0)
+    assert list(result["Primary Key"]) == list(df["Primary Key"])
+
+
+def test_deduplicate():
+    data = {
+        "Primary Key": [
+            "2017-08-19VfL WolfsburgBorussia Dortmund",
+            "2017-08-19Hertha BSCVfB Stuttgart",
+            "2017-08-18FC Bayern MünchenBayer 04 Leverkusen",
+            "2017-08-19VfL WolfsburgBorussia Dortmund",
+        ],
+        "Date": pd.to_datetime(
+            ["2017-08-19", "2017-08-19", "2017-08-18", "2017-08-19"]
+        ),
+        "Notes": ["OLD", "OLD", "OLD", "NEW"],
+    }
+    result = secr._deduplicate(pd.DataFrame(data=data))
+
+    assert list(result["Primary Key"]) == [
+        "2017-08-18FC Bayern MünchenBayer 04 Leverkusen",
+        "2017-08-19Hertha BSCVfB Stuttgart",
+        "2017-08-19VfL WolfsburgBorussia Dortmund",
+    ]
+    assert list(result["Notes"]) == ["OLD", "OLD", "NEW"]
+    assert list(result.columns) == list(data.keys())
+    assert list(result.index) == [0, 1, 2]
+
+
+def test_save_base_update_chunks_empty(paths):
+    secr.save_base_update_chunks(iter([]), True)
+    assert pd.read_csv(secr.BASE_UPDATE, index_col=0).empty
+
+
+def test_save_feature_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(secr, "FEATURE_STATE", f"{tmp_path}/feature_state.sav")
+
+    state = eng.FeatureState(["Home MA Test Last 3 Games Before Matchday"], 3)
+    secr.save_feature_state(state)
+    result = secr.load_feature_state()
+
+    assert isinstance(result, eng.FeatureState)
+    assert result.plan == state.plan
+
+    # states of other versions of the engineer are refused
+    monkeypatch.setattr(eng, "VERSION", eng.VERSION + 1)
+    with pytest.raises(ValueError):
+        secr.load_feature_state()
+
+    with open(secr.FEATURE_STATE, "wb") as file:
+        pickle.dump(state, file)
+    with pytest.raises(ValueError):
+        secr.load_feature_state()
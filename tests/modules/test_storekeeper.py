@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import modules.storekeeper as store
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "DIRECTORY", f"{tmp_path}/store")
+
+
+def test_get_key():
+    df = pd.DataFrame(data={"Team": ["A", "B", "C"], "xG": [1.0, 2.0, np.nan]})
+    key = store.get_key([store.get_digest(df[col]) for col in df.columns], ("MA", 3))
+
+    digests = [store.get_digest(df.set_index(df.index + 5)[col]) for col in df.columns]
+    assert store.get_key(digests, ("MA", 3)) == key
+
+    assert store.get_key(digests, ("MA", 5)) != key
+    assert store.get_key(digests[::-1], ("MA", 3)) != key
+
+    for changed in [
+        df.assign(xG=[1.0, 2.0, 3.0]),
+        df.assign(Team=["A", "C", "B"]),
+        df.iloc[:2],
+        df.assign(xG=df["xG"].astype("float32")),
+    ]:
+        digests = [store.get_digest(changed[col]) for col in changed.columns]
+        assert store.get_key(digests, ("MA", 3)) != key
+
+
+def test_save_load(directory):
+    values = np.arange(12, dtype=float).reshape(4, 3)
+    values[1, 2] = np.nan
+
+    assert store.load("MA xG 3", "key") is None
+    store.save("MA xG 3", "key", values)
+    np.testing.assert_array_equal(store.load("MA xG 3", "key"), values)
+    assert store.load("MA xG 5", "key") is None
+
+    # older keys of the same name are removed, other names are kept
+    store.save("MA xG 5", "key", values)
+    store.save("MA xG 3", "other", values * 2)
+    assert store.load("MA xG 3", "key") is None
+    np.testing.assert_array_equal(store.load("MA xG 3", "other"), values * 2)
+    np.testing.assert_array_equal(store.load("MA xG 5", "key"), values)
+
+    store.clear()
+    assert store.load("MA xG 3", "key") is None
+
+
+def test_save_load_frame(directory):
+    df = pd.DataFrame(data={"Coach": ["A", "B", "UNKNOWN"], "Points": [3, 0, -1]})
+    df["Coach"] = df["Coach"].astype("category")
+
+    assert store.load_frame("Coach", "key") is None
+    store.save_frame("Coach", "key", df)
+    pd.testing.assert_frame_equal(store.load_frame("Coach", "key"), df)
+
+    store.clear()
+    assert store.load_frame("Coach", "key") is None
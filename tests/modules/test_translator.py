@@ -123,3 +123,24 @@ def day_ger_str_to_eng_str():
     assert trans.day_ger_str_to_eng_str().get("Fr.") == "FR"
     assert trans.day_ger_str_to_eng_str().get("Sa.") == "SA"
     assert trans.day_ger_str_to_eng_str().get("So.") == "SU"
+
+
+def test_categories():
+    data = trans.categories()
+    for categories in data.values():
+        assert len(set(categories)) == len(categories)
+        assert categories[-1] == "UNKNOWN"
+
+    assert set(trans.fbref_com_translations().keys()).issubset(data["Team"])
+    assert set(trans.competitions()).issubset(data["Competition"])
+
+
+def test_categories_cached(monkeypatch):
+    data = trans.categories()
+    data["Team"].append("Test")
+
+    # the spreadsheet is not read again and callers get copies
+    monkeypatch.setattr(trans.pd, "read_excel", None)
+    data = trans.categories()
+    assert "Test" not in data["Team"]
+    assert data == trans.categories()
@@ -0,0 +1,73 @@
+import pandas as pd
+
+import modules.engineer as eng
+import modules.features as feat
+import modules.scheduler as sched
+import modules.secretary as secr
+import modules.storekeeper as store
+from steps.step_03 import ProductionMaker
+
+BASE_PATH = "./tests/sources/data/test_base.csv"
+COACHES_PATH = "./tests/sources/data/test_coaches.csv"
+PROMOTIONS_PATH = "./tests/sources/data/test_promotions.csv"
+
+IDENTIFIERS = [
+    "Home MA Test Last 3 Games Before Matchday",
+    "Away EWMA Test Against Last 5 Games Before Matchday",
+]
+
+
+def test_ProductionMaker_nodes():
+    nodes = {
+        node.name: node for node in ProductionMaker(2017, 2, offset=5).nodes(None, None)
+    }
+
+    assert nodes["Coach Substituted"].args == (5,)
+    assert nodes["Coach Substituted"].outputs == [
+        "Home Coach Substituted Within Last 5 Games",
+        "Away Coach Substituted Within Last 5 Games",
+    ]
+    assert nodes["Current Position"].args == (5,)
+
+    rolling = nodes["Rolling"]
+    assert rolling.func == eng.add_Rolling_FEATs_By_Name
+    assert rolling.kwargs == {"stored": True, "workers": 2}
+    assert not rolling.stored
+
+
+def test_ProductionMaker(tmp_path, monkeypatch):
+    df = pd.read_csv(BASE_PATH, index_col=0, parse_dates=["Date"])
+    coaches = pd.read_csv(COACHES_PATH, index_col=0, parse_dates=["Started", "Ended"])
+    promotions = pd.read_csv(PROMOTIONS_PATH, index_col=0)
+
+    saved = []
+    monkeypatch.setattr(store, "DIRECTORY", f"{tmp_path}/store")
+    monkeypatch.setattr(feat, "num_features", lambda: IDENTIFIERS)
+    base = df.drop(columns=["Home Test", "Away Test"])
+    monkeypatch.setattr(secr, "load_base_update", lambda: base.copy())
+    additional = df[["Primary Key", "Home Test", "Away Test"]]
+    monkeypatch.setattr(secr, "load_additional", lambda: additional.copy())
+    monkeypatch.setattr(secr, "load_coaches", lambda: coaches.copy())
+    monkeypatch.setattr(secr, "load_promotions", lambda: promotions.copy())
+    monkeypatch.setattr(secr, "save_production_update", lambda x, _: saved.append(x))
+    monkeypatch.setattr(secr, "save_feature_state", saved.append)
+
+    critical_paths = ProductionMaker(2017).do()
+
+    assert len(saved) == 2
+    assert set(IDENTIFIERS).issubset(saved[0].columns)
+    assert isinstance(saved[1], eng.FeatureState)
+
+    # the critical path of each scheduler is a chain of its dependencies
+    assert len(critical_paths) == 2
+    names, seconds = critical_paths[0]
+    assert names == ["Days Since Last Game", "Maximum Days Since Last Game"]
+    assert seconds > 0
+    names, seconds = critical_paths[1]
+    dependencies = sched.Scheduler.get_dependencies(
+        ProductionMaker(2017).nodes(coaches, promotions)
+    )
+    assert names
+    assert seconds > 0
+    for before, after in zip(names, names[1:]):
+        assert before in dependencies[after]
@@ -0,0 +1,48 @@
+import pandas as pd
+
+import modules.engineer as eng
+import modules.features as feat
+import modules.secretary as secr
+from steps.step_07 import PredictionMaker
+
+BASE_PATH = "./tests/sources/data/test_base.csv"
+COACHES_PATH = "./tests/sources/data/test_coaches.csv"
+PROMOTIONS_PATH = "./tests/sources/data/test_promotions.csv"
+
+IDENTIFIERS = [
+    "Home MA Goals Last 3 Games Before Matchday",
+    "Away EWMA Test Against Last 5 Games Before Matchday",
+]
+
+
+def test_PredictionMaker(monkeypatch):
+    df = pd.read_csv(BASE_PATH, index_col=0, parse_dates=["Date"])
+    coaches = pd.read_csv(COACHES_PATH, index_col=0, parse_dates=["Started", "Ended"])
+    promotions = pd.read_csv(PROMOTIONS_PATH, index_col=0)
+
+    # the last matchweek is not played yet
+    new = df["Matchweek"] == df["Matchweek"].max()
+    state = eng.FeatureState(IDENTIFIERS, 3)
+    state.update(df.loc[~new].copy())
+    cols = ["Home Team", "Away Team", "Date", "Kick Off", "Matchweek"]
+    games = df.loc[new, cols + ["Competition", "Primary Key", "Season"]]
+
+    predictions = []
+    monkeypatch.setattr(secr, "load_games", lambda: games.copy())
+    monkeypatch.setattr(secr, "load_coaches", lambda: coaches.copy())
+    monkeypatch.setattr(secr, "load_promotions", lambda: promotions.copy())
+    monkeypatch.setattr(secr, "load_feature_state", lambda: state)
+    monkeypatch.setattr(secr, "save_prediction", predictions.append)
+
+    PredictionMaker("2017-2018").do()
+
+    assert len(predictions) == 1
+    result = predictions[0]
+    # games of other seasons are not predicted
+    expected = games.loc[games["Season"] == "2017-2018", "Primary Key"]
+    assert 0 < len(expected) < len(games)
+    assert sorted(result["Primary Key"]) == sorted(expected)
+    assert set(IDENTIFIERS).issubset(result.columns)
+    assert not set(feat.unusable_features() + ["Result"]) & set(result.columns)
+    assert (result["Home Days Since Last Game"] <= 21).all()
+    assert (result[IDENTIFIERS[0]] >= 0).all()